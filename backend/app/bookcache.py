@@ -0,0 +1,206 @@
+"""
+Read-through cache for Google Books metadata.
+
+The persisted `BOOK#<isbn>` item *is* the cache: if it was fetched from Google within
+`BOOK_CACHE_TTL_SECONDS`, it is served as-is and Google is not called. ISBNs Google has
+no volume for are remembered under `BOOKMISS#<isbn>` for `BOOK_NEGATIVE_CACHE_TTL_SECONDS`.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .booklib import encode_volume_info
+from .config import get_env
+from .db import batch_get_items, projection
+from .keys import book_miss_sk, book_sk, pk
+from .timeutil import parse_iso
+
+# Attributes needed to rebuild a lookup result; skips the large `googleVolumeInfo` map.
+_META_ATTRS = [
+    "isbn",
+    "title",
+    "authors",
+    "publishedDate",
+    "pageCount",
+    "categories",
+    "thumbnail",
+    "googleVolumeId",
+    "googleFetchedAt",
+    "inLibrary",
+]
+
+
+def _ttl(name: str, default: int) -> timedelta:
+    return timedelta(seconds=int(get_env(name, str(default))))
+
+
+def _is_fresh(fetched_at: Any, now: str, ttl: timedelta) -> bool:
+    fetched = parse_iso(fetched_at)
+    current = parse_iso(now)
+    if fetched is None or current is None:
+        return False
+    return current - fetched < ttl
+
+
+def book_is_fresh(item: Dict[str, Any], now: str) -> bool:
+    return _is_fresh(item.get("googleFetchedAt"), now, _ttl("BOOK_CACHE_TTL_SECONDS", 30 * 24 * 3600))
+
+
+def miss_is_fresh(miss: Dict[str, Any], now: str) -> bool:
+    return _is_fresh(miss.get("checkedAt"), now, _ttl("BOOK_NEGATIVE_CACHE_TTL_SECONDS", 24 * 3600))
+
+
+def book_meta_from_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a stored BOOK item like a `google_books_lookup` result, minus `googleVolumeInfo`:
+    served metadata is never written back, so the large payload isn't read (see `_META_ATTRS`).
+    """
+    return {
+        "googleVolumeId": item.get("googleVolumeId"),
+        "title": item.get("title"),
+        "authors": item.get("authors") or [],
+        "publishedDate": item.get("publishedDate"),
+        "pageCount": item.get("pageCount"),
+        "categories": item.get("categories") or [],
+        "thumbnail": item.get("thumbnail"),
+        "inLibrary": bool(item.get("inLibrary")),
+    }
+
+
+def lookup_book(
+    table: Any,
+    isbn: str,
+    *,
+    now_iso: Any,
+    fetch: Callable[[str], Optional[Dict[str, Any]]],
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Returns `(meta, fetched)`. `fetched` is True when `meta` came from `fetch` and the
+    caller should persist it; False for a cache hit. `meta` is None when the ISBN is unknown.
+    If `fetch` raises or finds nothing, a stale stored BOOK item is served instead; without one
+    the exception propagates (or the miss is remembered).
+    """
+    now = now_iso()
+    res = table.get_item(Key={"pk": pk(), "sk": book_sk(isbn)}, **projection(_META_ATTRS))
+    item = res.get("Item")
+    if item:
+        if book_is_fresh(item, now):
+            return book_meta_from_item(item), False
+    else:
+        miss = table.get_item(Key={"pk": pk(), "sk": book_miss_sk(isbn)}).get("Item")
+        if miss and miss_is_fresh(miss, now):
+            return None, False
+
+    try:
+        meta = fetch(isbn)
+    except Exception:
+        if not item:
+            raise
+        # Google is failing (or the circuit is open): stale metadata beats an error.
+        return book_meta_from_item(item), False
+    if meta is None:
+        if item:
+            # Google no longer knows a book that is stored: keep serving what we have.
+            return book_meta_from_item(item), False
+        remember_miss(table, isbn, now=now)
+        return None, False
+    return meta, True
+
+
+def prefetch_books(table: Any, isbns: List[str], *, now: str) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+    """
+    The cache state of many ISBNs in one batched read: `(BOOK items by ISBN, ISBNs with a fresh
+    negative-cache marker)`. BOOK items are read whole, so they can be written back with a put.
+    """
+    keys = [{"pk": pk(), "sk": book_sk(isbn)} for isbn in isbns]
+    keys += [{"pk": pk(), "sk": book_miss_sk(isbn)} for isbn in isbns]
+    books: Dict[str, Dict[str, Any]] = {}
+    missing: Set[str] = set()
+    for it in batch_get_items(table, keys):
+        sk = str(it.get("sk") or "")
+        isbn = sk.split("#", 1)[-1]
+        if sk.startswith("BOOK#"):
+            books[isbn] = it
+        elif miss_is_fresh(it, now):
+            missing.add(isbn)
+    return books, missing - set(books)
+
+
+def miss_item(isbn: str, *, now: str) -> Dict[str, Any]:
+    """The `BOOKMISS#<isbn>` negative-cache marker."""
+    ttl = _ttl("BOOK_NEGATIVE_CACHE_TTL_SECONDS", 24 * 3600)
+    checked = parse_iso(now)
+    item: Dict[str, Any] = {"pk": pk(), "sk": book_miss_sk(isbn), "isbn": isbn, "checkedAt": now}
+    if checked is not None:
+        # DynamoDB TTL attribute (epoch seconds) so stale markers get swept.
+        item["expiresAt"] = int((checked + ttl).timestamp())
+    return item
+
+
+def remember_miss(table: Any, isbn: str, *, now: str) -> None:
+    table.put_item(Item=miss_item(isbn, now=now))
+
+
+def book_attributes(isbn: str, meta: Dict[str, Any], *, now: str, in_library: bool = False) -> Dict[str, Any]:
+    """The BOOK item attributes set from lookup metadata (all but the key and `createdAt`)."""
+    authors = meta.get("authors") or []
+    if not isinstance(authors, list):
+        authors = []
+    attrs: Dict[str, Any] = {
+        "isbn": isbn,
+        "authors": [str(a) for a in authors if str(a).strip()],
+        "updatedAt": now,
+        "googleFetchedAt": now,
+    }
+    if in_library:
+        attrs["inLibrary"] = True
+    for attr in ("title", "publishedDate", "thumbnail", "googleVolumeId"):
+        if meta.get(attr) is not None:
+            attrs[attr] = str(meta[attr])
+    if meta.get("pageCount") is not None:
+        attrs["pageCount"] = meta["pageCount"]
+    if meta.get("categories") is not None:
+        attrs["categories"] = meta.get("categories") or []
+    # Always persist the full Google `volumeInfo` payload when available, compressed: it is
+    # most of the item's size and therefore of the RCU cost of every BOOK# query.
+    volume_info = meta.get("googleVolumeInfo")
+    if isinstance(volume_info, dict) and volume_info:
+        attrs["googleVolumeInfoZ"] = encode_volume_info(volume_info)
+    return attrs
+
+
+def book_upsert_update(isbn: str, meta: Dict[str, Any], *, now: str, in_library: bool = False) -> Dict[str, Any]:
+    """`update_item` kwargs that upsert the persistent BOOK item (deduped by ISBN) from lookup metadata."""
+    attrs = book_attributes(isbn, meta, now=now, in_library=in_library)
+    expr_parts = [f"{attr} = :{attr}" for attr in attrs] + ["createdAt = if_not_exists(createdAt, :createdAt)"]
+    expr_vals = {f":{attr}": value for attr, value in attrs.items()}
+    expr_vals[":createdAt"] = now
+    # Items still carrying the legacy uncompressed map are migrated here, on their next upsert.
+    remove_clause = " REMOVE googleVolumeInfo" if "googleVolumeInfoZ" in attrs else ""
+    return {
+        "Key": {"pk": pk(), "sk": book_sk(isbn)},
+        "UpdateExpression": "SET " + ", ".join(expr_parts) + remove_clause,
+        "ExpressionAttributeValues": expr_vals,
+    }
+
+
+def book_item(
+    isbn: str,
+    meta: Dict[str, Any],
+    *,
+    now: str,
+    created_at: Optional[str] = None,
+    in_library: bool = False,
+) -> Dict[str, Any]:
+    """
+    The whole BOOK item for a `PutRequest`: the attributes `book_upsert_update` sets, with
+    `created_at` carried over from the item being replaced.
+    """
+    return {
+        "pk": pk(),
+        "sk": book_sk(isbn),
+        **book_attributes(isbn, meta, now=now, in_library=in_library),
+        "createdAt": created_at or now,
+    }
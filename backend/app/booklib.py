@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Dict
+import zlib
+from typing import Any, Dict, Optional
+
+from .telemetry import span
 
 
 _ISBN_RE = re.compile(r"^[0-9X]+$")
@@ -29,14 +32,12 @@ def google_books_lookup(isbn: str) -> Dict[str, Any] | None:
     """
     Returns a subset of Google Books volume fields for a given ISBN,
     plus the full `volumeInfo` payload for persistence.
+    Raises `googlebooks.GoogleBooksError` (`CircuitOpenError` while Google is failing).
     """
-    from urllib.request import Request, urlopen
+    from . import googlebooks  # http.client stays out of the cold-start imports of other routes
 
-    url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{isbn}"
-    req = Request(url, headers={"accept": "application/json", "user-agent": "yeargoals/1.0"})
-    with urlopen(req, timeout=8) as resp:  # nosec - controlled URL; used for public metadata fetch
-        raw = resp.read().decode("utf-8", errors="replace")
-    data = json.loads(raw or "{}")
+    with span("google"):
+        data = googlebooks.volumes_by_isbn(isbn)
     items = data.get("items") or []
     if not items:
         return None
@@ -71,3 +72,23 @@ def google_books_lookup(isbn: str) -> Dict[str, Any] | None:
     }
     return out
 
+
+def encode_volume_info(volume_info: Dict[str, Any]) -> bytes:
+    """zlib-compressed JSON, stored as the binary `googleVolumeInfoZ` attribute on BOOK items."""
+    raw = json.dumps(volume_info, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+    return zlib.compress(raw.encode("utf-8"), 6)
+
+
+def decode_volume_info(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Read Google's `volumeInfo` back from a BOOK item: the compressed `googleVolumeInfoZ`
+    attribute, or the legacy uncompressed `googleVolumeInfo` map on items not yet rewritten.
+    """
+    packed = item.get("googleVolumeInfoZ")
+    if packed is not None:
+        # boto3 wraps binary attributes in `boto3.dynamodb.types.Binary`.
+        raw = getattr(packed, "value", packed)
+        data = json.loads(zlib.decompress(bytes(raw)).decode("utf-8"))
+        return data if isinstance(data, dict) else None
+    legacy = item.get("googleVolumeInfo")
+    return legacy if isinstance(legacy, dict) else None
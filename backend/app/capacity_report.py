@@ -0,0 +1,103 @@
+"""
+Rank routes by DynamoDB capacity per call, from the EMF lines `app.telemetry` logs.
+
+Input is any text containing those JSON lines: a CloudWatch Logs export, `sam logs` output or
+`aws logs tail` (prefixes before the JSON are ignored).
+
+CLI:  aws logs tail /aws/lambda/year-goals-api --since 1d | python -m app.capacity_report
+      python -m app.capacity_report exported.log [--sort rcu|wcu|total|latency] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+_SORT_KEYS = {
+    "total": lambda r: r["rcuPerCall"] + r["wcuPerCall"],
+    "rcu": lambda r: r["rcuPerCall"],
+    "wcu": lambda r: r["wcuPerCall"],
+    "latency": lambda r: r["avgLatencyMs"],
+}
+
+
+def parse_records(lines: Iterable[str]) -> Iterable[Dict[str, Any]]:
+    """Yield the telemetry records (EMF objects with a `route`) found in `lines`."""
+    for line in lines:
+        start = line.find('{"_aws"')
+        if start < 0:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "route" in record:
+            yield record
+
+
+def summarize(records: Iterable[Dict[str, Any]], *, sort: str = "total") -> List[Dict[str, Any]]:
+    """Per-route totals and per-call averages, most expensive first."""
+    routes: Dict[str, Dict[str, float]] = {}
+    for rec in records:
+        r = routes.setdefault(rec["route"], {"calls": 0, "rcu": 0.0, "wcu": 0.0, "latencyMs": 0.0})
+        r["calls"] += 1
+        r["rcu"] += float(rec.get("consumedRcu") or 0)
+        r["wcu"] += float(rec.get("consumedWcu") or 0)
+        r["latencyMs"] += float(rec.get("latencyMs") or 0)
+
+    rows = []
+    for route, r in routes.items():
+        calls = int(r["calls"])
+        rows.append(
+            {
+                "route": route,
+                "calls": calls,
+                "rcu": round(r["rcu"], 3),
+                "wcu": round(r["wcu"], 3),
+                "rcuPerCall": round(r["rcu"] / calls, 3),
+                "wcuPerCall": round(r["wcu"] / calls, 3),
+                "avgLatencyMs": round(r["latencyMs"] / calls, 3),
+            }
+        )
+    rows.sort(key=_SORT_KEYS[sort], reverse=True)
+    return rows
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    header = f"{'route':<18} {'calls':>7} {'RCU':>10} {'WCU':>10} {'RCU/call':>9} {'WCU/call':>9} {'avg ms':>8}"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['route']:<18} {r['calls']:>7} {r['rcu']:>10.1f} {r['wcu']:>10.1f} "
+            f"{r['rcuPerCall']:>9.2f} {r['wcuPerCall']:>9.2f} {r['avgLatencyMs']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rank routes by DynamoDB capacity per call.")
+    parser.add_argument("files", nargs="*", help="log files (default: stdin)")
+    parser.add_argument("--sort", choices=sorted(_SORT_KEYS), default="total")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    def lines() -> Iterable[str]:
+        if not args.files:
+            yield from sys.stdin
+        for name in args.files:
+            with open(name, encoding="utf-8", errors="replace") as fh:
+                yield from fh
+
+    rows = summarize(parse_records(lines()), sort=args.sort)
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(format_table(rows))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
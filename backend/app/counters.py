@@ -0,0 +1,82 @@
+"""
+`STATS#<year>` counters: which fields an action increments and the atomic `ADD` update
+that applies them. The same counters are kept per calendar month (`STATS#<year>#M<mm>`)
+and per ISO week (`STATS#<year>#W<ww>`) of the action's timestamp, so time series are a
+single range query. Buckets belong to the action's `year` (its `ts` falls within it), so a
+year's months and weeks add up to its `STATS#<year>` row.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List
+
+from .keys import pk, stats_month_sk, stats_week_sk
+from .models import ActionType
+from .timeutil import parse_iso
+
+STAT_FIELDS = ("bjjCount", "pilatesCount", "savedCentsTotal", "readBooksTotal", "readCount")
+
+
+def action_increments(action_type: ActionType, *, amount_cents: int = 0) -> Dict[str, int]:
+    if action_type == ActionType.BJJ:
+        return {"bjjCount": 1}
+    if action_type == ActionType.PILATES:
+        return {"pilatesCount": 1}
+    if action_type == ActionType.SAVE:
+        return {"savedCentsTotal": amount_cents}
+    if action_type == ActionType.READ:
+        return {"readBooksTotal": 1, "readCount": 1}
+    return {}
+
+
+def iso_weeks(year: int) -> int:
+    """Number of ISO weeks in `year` (52 or 53)."""
+    # Dec 28 always falls in the last ISO week of its year.
+    return date(year, 12, 28).isocalendar()[1]
+
+
+def bucket_sks(year: int, ts: Any) -> List[str]:
+    """Month and ISO-week stats rows for an action of `year` at `ts` (none if `ts` isn't ISO-8601)."""
+    dt = parse_iso(ts)
+    if dt is None:
+        return []
+    # The timestamp's own calendar date (no UTC conversion), as the user logged it.
+    d = dt.date()
+    iso_year, week, _ = d.isocalendar()
+    # ISO weeks straddling New Year are folded into the year's first or last week.
+    if iso_year < year:
+        week = 1
+    elif iso_year > year:
+        week = iso_weeks(year)
+    return [stats_month_sk(year, d.month), stats_week_sk(year, week)]
+
+
+def add_increments(total: Dict[str, int], increments: Dict[str, int]) -> Dict[str, int]:
+    """Accumulate `increments` into `total` in place (and return it)."""
+    for field, n in increments.items():
+        total[field] = total.get(field, 0) + n
+    return total
+
+
+def stats_update(sk: str, increments: Dict[str, int], *, now: str) -> Dict[str, Any]:
+    """`update_item` kwargs that upsert a stats row with atomic increments."""
+    update_expr = "SET updatedAt = :u"
+    vals: Dict[str, Any] = {":u": now}
+    names: Dict[str, str] = {}
+    add_parts = []
+    for field, n in increments.items():
+        names[f"#{field}"] = field
+        vals[f":{field}"] = n
+        add_parts.append(f"#{field} :{field}")
+    if add_parts:
+        update_expr += " ADD " + ", ".join(add_parts)
+
+    kwargs: Dict[str, Any] = {
+        "Key": {"pk": pk(), "sk": sk},
+        "UpdateExpression": update_expr,
+        "ExpressionAttributeValues": vals,
+    }
+    if names:
+        kwargs["ExpressionAttributeNames"] = names
+    return kwargs
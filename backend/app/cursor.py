@@ -0,0 +1,71 @@
+"""
+Opaque continuation tokens for paginated list routes.
+
+A cursor wraps DynamoDB's `LastEvaluatedKey` together with the scope it was issued for
+(e.g. `actions:2026`) and an HMAC, so clients can't forge keys outside that scope.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import secrets
+from typing import Any, Dict, Optional
+
+from .config import get_env
+
+
+# Used when no secret is configured: cursors then only verify in the process that issued them.
+_PROCESS_KEY = secrets.token_bytes(32)
+
+
+def _secret() -> bytes:
+    secret = get_env("CURSOR_SECRET", "")
+    if secret:
+        return secret.encode("utf-8")
+    admin_token = get_env("ADMIN_TOKEN", "")
+    if admin_token:
+        # A key derived for this purpose only, rather than signing with the credential itself.
+        return hmac.new(admin_token.encode("utf-8"), b"cursor", hashlib.sha256).digest()
+    return _PROCESS_KEY
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_secret(), payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(key: Optional[Dict[str, Any]], *, scope: str) -> Optional[str]:
+    """Returns None when there is no further page (`key` is empty)."""
+    if not key:
+        return None
+    payload = json.dumps({"s": scope, "k": key}, separators=(",", ":"), sort_keys=True, default=str).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(token: str, *, scope: str) -> Optional[Dict[str, Any]]:
+    """Returns the wrapped key, or None if the token is malformed, tampered with or from another scope."""
+    try:
+        body, sig = token.split(".", 1)
+        payload = _b64decode(body)
+        if not hmac.compare_digest(_b64decode(sig), _sign(payload)):
+            return None
+        data = json.loads(payload)
+    except (ValueError, binascii.Error):
+        return None
+    if not isinstance(data, dict) or data.get("s") != scope:
+        return None
+    key = data.get("k")
+    if not isinstance(key, dict) or not key:
+        return None
+    return key
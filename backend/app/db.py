@@ -1,12 +1,245 @@
 from __future__ import annotations
 
-from typing import Any
+import contextvars
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from .config import get_env
+from .ddbclient import ClientTable
+from .telemetry import span
 
-def get_table(table_name: str) -> Any:
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# One low-level client (and therefore one urllib3 connection pool) per process, so warm Lambda
+# invocations reuse the session, resolved credentials and open TLS connections. Tables are
+# `ClientTable` wrappers over it: resource-style calls, native int/float numbers.
+_lock = threading.Lock()
+_client: Any = None
+_tables: Dict[str, Any] = {}
+_injected_table: Optional[Any] = None
+_counters: Dict[str, int] = {"clientCreated": 0, "tableCreated": 0, "tableReused": 0}
+
+
+def _client_config() -> Any:
+    from botocore.config import Config  # type: ignore
+
+    return Config(
+        connect_timeout=float(get_env("DDB_CONNECT_TIMEOUT_SECONDS", "1")),
+        read_timeout=float(get_env("DDB_READ_TIMEOUT_SECONDS", "3")),
+        max_pool_connections=int(get_env("DDB_MAX_POOL_CONNECTIONS", "10")),
+        tcp_keepalive=True,
+        retries={
+            "mode": get_env("DDB_RETRY_MODE", "standard"),
+            "max_attempts": int(get_env("DDB_MAX_ATTEMPTS", "3")),
+        },
+    )
+
+
+def _create_client() -> Any:
     # Lazy import so unit tests can run without AWS deps installed.
     import boto3  # type: ignore
 
-    ddb = boto3.resource("dynamodb")
-    return ddb.Table(table_name)
+    return boto3.client("dynamodb", config=_client_config())
+
+
+def get_client() -> Any:
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _create_client()
+                _counters["clientCreated"] += 1
+    return _client
+
+
+def get_table(table_name: str) -> Any:
+    if _injected_table is not None:
+        return _injected_table
+
+    table = _tables.get(table_name)
+    if table is not None:
+        _counters["tableReused"] += 1
+        return table
+
+    client = get_client()
+    with _lock:
+        table = _tables.get(table_name)
+        if table is None:
+            table = ClientTable(client, table_name)
+            _tables[table_name] = table
+            _counters["tableCreated"] += 1
+        else:
+            _counters["tableReused"] += 1
+    return table
+
+
+def set_table(table: Optional[Any]) -> None:
+    """
+    Make `get_table` return `table` regardless of name (tests, local runs).
+    Pass None to go back to the pooled client table.
+    """
+    global _injected_table
+    _injected_table = table
+
+
+def reset() -> None:
+    """Drop the cached client/tables and zero the counters (forces a cold path)."""
+    global _client, _injected_table
+    with _lock:
+        _client = None
+        _tables.clear()
+        _injected_table = None
+        for k in _counters:
+            _counters[k] = 0
+
+
+def pool_stats() -> Dict[str, int]:
+    return dict(_counters)
+
+
+def projection(attrs: Any) -> Dict[str, Any]:
+    """
+    Build `ProjectionExpression` kwargs for a list of top-level attribute names.
+    Every name goes through a placeholder so reserved words (year, type, ts, ...) are safe.
+    """
+    names = {f"#p{i}": a for i, a in enumerate(attrs)}
+    return {
+        "ProjectionExpression": ", ".join(names.keys()),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def batch_get_items(
+    table: Any,
+    keys: List[Dict[str, Any]],
+    *,
+    attrs: Optional[List[str]] = None,
+    max_attempts: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch many items with chunked `BatchGetItem` calls (100 keys each), retrying
+    `UnprocessedKeys` with exponential backoff. Missing items are simply absent from the result;
+    raises if keys are still unprocessed, so a throttled read can't pass for a missing item.
+    """
+    name = getattr(table, "name", "table")
+    found: List[Dict[str, Any]] = []
+    for start in range(0, len(keys), 100):
+        request: Dict[str, Any] = {"Keys": keys[start : start + 100]}
+        if attrs:
+            request.update(projection(attrs))
+        pending: Dict[str, Any] = {name: request}
+        for attempt in range(max_attempts):
+            resp = table.batch_get_item(RequestItems=pending)
+            found.extend((resp.get("Responses") or {}).get(name) or [])
+            pending = resp.get("UnprocessedKeys") or {}
+            if not pending:
+                break
+            if attempt + 1 < max_attempts:
+                with span("ddbRetryWait"):
+                    time.sleep(min(1.0, 0.05 * (2**attempt)))
+        if pending:
+            left = sum(len(v.get("Keys") or []) for v in pending.values())
+            raise RuntimeError(f"BatchGetItem left {left} unprocessed keys after {max_attempts} attempts")
+    return found
+
+
+def transact_write(table: Any, ops: List[Dict[str, Any]], *, token: Optional[str] = None) -> None:
+    """
+    Apply resource-style write ops (`{"Put": {"Item": ...}}`, `{"Update": {"Key": ..., ...}}`,
+    `{"Delete": ...}`, `{"ConditionCheck": ...}`) atomically in one `TransactWriteItems` call.
+    `token` makes retries of the same logical write idempotent.
+    """
+    name = getattr(table, "name", "table")
+    kwargs: Dict[str, Any] = {}
+    if token:
+        kwargs["ClientRequestToken"] = token
+    # `ClientTable` (and the test doubles) take resource-style values and type them itself.
+    items = [{k: dict(v, TableName=name) for k, v in op.items()} for op in ops]
+    table.transact_write_items(TransactItems=items, **kwargs)
+
+
+_write_executor_lock = threading.Lock()
+_write_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_write_executor() -> ThreadPoolExecutor:
+    global _write_executor
+    if _write_executor is None:
+        with _write_executor_lock:
+            if _write_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                _write_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ddb-write")
+    return _write_executor
+
+
+def _write_one(table: Any, op: Dict[str, Any]) -> Any:
+    ((kind, body),) = op.items()
+    if kind == "Put":
+        return table.put_item(**body)
+    if kind == "Update":
+        return table.update_item(**body)
+    if kind == "Delete":
+        return table.delete_item(**body)
+    raise ValueError(f"unsupported write op: {kind}")
+
+
+def concurrent_write(table: Any, ops: List[Dict[str, Any]]) -> None:
+    """Issue independent single-item writes in parallel (not atomic). Re-raises the first failure."""
+    if len(ops) == 1:
+        _write_one(table, ops[0])
+        return
+    # Each write runs in a copy of the caller's context so its spans land on this request.
+    futures = [_get_write_executor().submit(contextvars.copy_context().run, _write_one, table, op) for op in ops]
+    for f in futures:
+        f.result()
+
+
+def write_all(table: Any, ops: List[Dict[str, Any]], *, token: Optional[str] = None) -> None:
+    """
+    Write several items in one round trip. `MULTI_WRITE_MODE=transact` (default) is atomic;
+    `concurrent` fans the writes out in parallel instead, for when transactions are unavailable
+    or not worth their doubled WCU cost.
+    """
+    if len(ops) > 1 and get_env("MULTI_WRITE_MODE", "transact") != "concurrent":
+        transact_write(table, ops, token=token)
+    else:
+        concurrent_write(table, ops)
+
+
+def batch_write_items(table: Any, items: List[Dict[str, Any]], *, max_attempts: int = 8) -> None:
+    """
+    Put many items with chunked `BatchWriteItem` calls (25 items each), retrying
+    `UnprocessedItems` with exponential backoff. Raises if items are still unprocessed.
+    """
+    name = getattr(table, "name", "table")
+    for start in range(0, len(items), 25):
+        pending: Dict[str, Any] = {name: [{"PutRequest": {"Item": it}} for it in items[start : start + 25]]}
+        for attempt in range(max_attempts):
+            resp = table.batch_write_item(RequestItems=pending)
+            pending = resp.get("UnprocessedItems") or {}
+            if not pending:
+                break
+            if attempt + 1 < max_attempts:
+                with span("ddbRetryWait"):
+                    time.sleep(min(1.0, 0.05 * (2**attempt)))
+        if pending:
+            left = sum(len(v) for v in pending.values())
+            raise RuntimeError(f"BatchWriteItem left {left} unprocessed items after {max_attempts} attempts")
+
+
+def transaction_condition_failed(exc: BaseException, index: int) -> bool:
+    """True if `exc` is a TransactionCanceledException caused by the condition of op `index`."""
+    response = getattr(exc, "response", None) or {}
+    if (response.get("Error") or {}).get("Code") != "TransactionCanceledException":
+        return False
+    reasons = response.get("CancellationReasons") or []
+    return index < len(reasons) and reasons[index].get("Code") == "ConditionalCheckFailed"
+
 
+def is_conditional_check_failed(exc: BaseException) -> bool:
+    """True for botocore's ConditionalCheckFailedException (or a test double shaped like it)."""
+    response = getattr(exc, "response", None) or {}
+    return (response.get("Error") or {}).get("Code") == "ConditionalCheckFailedException"
@@ -0,0 +1,205 @@
+"""
+Table-shaped wrapper around the low-level DynamoDB client.
+
+The boto3 resource layer turns every number into a `Decimal`, which the routes then convert
+back with `int(...)` and `json.dumps` has to special-case. `ClientTable` speaks the same
+resource-style API the routes use (`get_item`, `query`, `update_item`, ... with plain Python
+values) but deserializes the wire format itself: integers come back as `int`, everything else
+numeric as `float`, so responses serialize with a plain `json.dumps`.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from .config import get_env
+from .telemetry import add_capacity, span
+
+# Request fields holding attribute values (typed on the wire) ...
+_VALUE_MAP_FIELDS = ("Item", "Key", "ExpressionAttributeValues", "ExclusiveStartKey")
+# ... and response fields holding them.
+_ITEM_FIELDS = ("Item", "Attributes", "LastEvaluatedKey")
+_READ_OPS = frozenset({"get_item", "query", "scan", "batch_get_item", "transact_get_items"})
+
+
+def consumed_units(consumed: Any) -> float:
+    """Total `CapacityUnits` of a `ConsumedCapacity` entry or list (batch/transact calls)."""
+    if not consumed:
+        return 0.0
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return sum(float(c.get("CapacityUnits") or 0) for c in consumed)
+
+
+def to_attr(value: Any) -> Dict[str, Any]:
+    """Python value -> DynamoDB AttributeValue."""
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, (int, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, float):
+        # repr() is the shortest round-tripping form; DynamoDB rejects inf/nan like boto3 does.
+        return {"N": repr(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": bytes(value)}
+    if isinstance(value, dict):
+        return {"M": {str(k): to_attr(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [to_attr(v) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        if all(isinstance(v, str) for v in value):
+            return {"SS": list(value)}
+        if all(isinstance(v, (bytes, bytearray)) for v in value):
+            return {"BS": [bytes(v) for v in value]}
+        return {"NS": [str(v) for v in value]}
+    # boto3's Binary wrapper.
+    raw = getattr(value, "value", None)
+    if isinstance(raw, (bytes, bytearray)):
+        return {"B": bytes(raw)}
+    raise TypeError(f"Unsupported DynamoDB value type: {type(value).__name__}")
+
+
+def _number(n: str) -> Any:
+    if "." in n or "e" in n or "E" in n:
+        f = float(n)
+        return int(f) if f.is_integer() and abs(f) < 2**53 else f
+    return int(n)
+
+
+def from_attr(attr: Dict[str, Any]) -> Any:
+    """DynamoDB AttributeValue -> Python value (numbers as int/float, never Decimal)."""
+    for tag, v in attr.items():
+        # Strings dominate real items; skip the table lookup for them.
+        if tag == "S":
+            return v
+        return _DECODERS[tag](v)
+    raise TypeError("empty AttributeValue")
+
+
+def _identity(v: Any) -> Any:
+    return v
+
+
+_DECODERS = {
+    "N": _number,
+    "M": lambda v: {k: from_attr(x) for k, x in v.items()},
+    "L": lambda v: [from_attr(x) for x in v],
+    "BOOL": _identity,
+    "NULL": lambda v: None,
+    "B": _identity,
+    "SS": set,
+    "NS": lambda v: {_number(x) for x in v},
+    "BS": set,
+}
+
+
+def to_item(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: to_attr(v) for k, v in values.items()}
+
+
+def from_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: from_attr(v) for k, v in item.items()}
+
+
+def _request(kwargs: Dict[str, Any], table_name: Optional[str] = None) -> Dict[str, Any]:
+    out = dict(kwargs)
+    if table_name is not None:
+        out["TableName"] = table_name
+    for field in _VALUE_MAP_FIELDS:
+        if field in out:
+            out[field] = to_item(out[field])
+    return out
+
+
+def _response(resp: Dict[str, Any]) -> Dict[str, Any]:
+    out = {k: v for k, v in resp.items() if k != "ResponseMetadata"}
+    for field in _ITEM_FIELDS:
+        if out.get(field) is not None:
+            out[field] = from_item(out[field])
+    if "Items" in out:
+        out["Items"] = [from_item(it) for it in out["Items"]]
+    return out
+
+
+class ClientTable:
+    """Drop-in for a boto3 `Table` on top of a low-level `dynamodb` client."""
+
+    def __init__(self, client: Any, name: str) -> None:
+        self.client = client
+        self.name = name
+
+    def _call(self, op: str, **kwargs: Any) -> Dict[str, Any]:
+        # Every call reports its capacity (TOTAL by default; INDEXES adds a per-GSI split),
+        # charged to the current request so cost can be attributed per route.
+        mode = get_env("DDB_RETURN_CONSUMED_CAPACITY", "TOTAL")
+        if mode != "NONE":
+            kwargs.setdefault("ReturnConsumedCapacity", mode)
+        with span("ddb"):
+            resp = getattr(self.client, op)(**kwargs)
+        units = consumed_units(resp.get("ConsumedCapacity"))
+        if units:
+            if op in _READ_OPS:
+                add_capacity(read=units)
+            else:
+                add_capacity(write=units)
+        return resp
+
+    def get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return _response(self._call("get_item", **_request(kwargs, self.name)))
+
+    def put_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return _response(self._call("put_item", **_request(kwargs, self.name)))
+
+    def update_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return _response(self._call("update_item", **_request(kwargs, self.name)))
+
+    def delete_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return _response(self._call("delete_item", **_request(kwargs, self.name)))
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        return _response(self._call("query", **_request(kwargs, self.name)))
+
+    def batch_get_item(self, *, RequestItems: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        req = {name: dict(spec, Keys=[to_item(k) for k in spec["Keys"]]) for name, spec in RequestItems.items()}
+        resp = self._call("batch_get_item", RequestItems=req, **kwargs)
+        responses = resp.get("Responses") or {}
+        out: Dict[str, Any] = {
+            "Responses": {name: [from_item(it) for it in items] for name, items in responses.items()},
+            # Handed back to us on retry, so keep them in the untyped form.
+            "UnprocessedKeys": {
+                name: dict(spec, Keys=[from_item(k) for k in spec["Keys"]])
+                for name, spec in (resp.get("UnprocessedKeys") or {}).items()
+            },
+        }
+        if "ConsumedCapacity" in resp:
+            out["ConsumedCapacity"] = resp["ConsumedCapacity"]
+        return out
+
+    def batch_write_item(self, *, RequestItems: Dict[str, List[Dict[str, Any]]], **kwargs: Any) -> Dict[str, Any]:
+        resp = self._call("batch_write_item", RequestItems=_convert_writes(RequestItems, to_item), **kwargs)
+        out: Dict[str, Any] = {"UnprocessedItems": _convert_writes(resp.get("UnprocessedItems") or {}, from_item)}
+        if "ConsumedCapacity" in resp:
+            out["ConsumedCapacity"] = resp["ConsumedCapacity"]
+        return out
+
+    def transact_write_items(self, *, TransactItems: List[Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        items = [{kind: _request(body) for kind, body in op.items()} for op in TransactItems]
+        return _response(self._call("transact_write_items", TransactItems=items, **kwargs))
+
+
+def _convert_writes(request_items: Dict[str, List[Dict[str, Any]]], convert: Any) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name, reqs in request_items.items():
+        converted = []
+        for req in reqs:
+            if "PutRequest" in req:
+                converted.append({"PutRequest": {"Item": convert(req["PutRequest"]["Item"])}})
+            else:
+                converted.append({"DeleteRequest": {"Key": convert(req["DeleteRequest"]["Key"])}})
+        out[name] = converted
+    return out
@@ -0,0 +1,119 @@
+"""
+Incremental export of a year's actions.
+
+Everything here is a generator: DynamoDB pages are fetched on demand, each row is encoded as
+soon as it is read, and gzip compresses chunk by chunk. A host that can stream a response
+(e.g. the local server) can forward the chunks as they are produced; API Gateway + the Python
+Lambda runtime only support buffered responses of at most 6 MB, so the route joins them with
+`read_capped`, which stops reading DynamoDB as soon as the response would be too large.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .db import projection
+from .keys import pk
+
+# Lambda's limit on a buffered response, measured after the body is encoded into it.
+LAMBDA_RESPONSE_LIMIT = 6 * 1024 * 1024
+
+EXPORT_COLUMNS = ("id", "year", "type", "ts", "amountCents", "isbn", "note", "createdAt")
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def iter_action_rows(table: Any, year: int, *, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """Yield every action of `year` in chronological order, one DynamoDB page at a time."""
+    kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": "pk = :pk AND begins_with(sk, :prefix)",
+        "ExpressionAttributeValues": {":pk": pk(), ":prefix": f"ACTION#{year}#"},
+        "ScanIndexForward": True,
+        "Limit": page_size,
+        **projection(["sk", "year", "type", "ts", "amountCents", "isbn", "note", "createdAt"]),
+    }
+    while True:
+        resp = table.query(**kwargs)
+        for it in resp.get("Items") or []:
+            amount = it.get("amountCents")
+            yield {
+                "id": str(it.get("sk", "")).rsplit("#", 1)[-1],
+                "year": int(it.get("year", year)),
+                "type": it.get("type"),
+                "ts": it.get("ts"),
+                "amountCents": int(amount) if amount is not None else None,
+                "isbn": it.get("isbn"),
+                "note": it.get("note"),
+                "createdAt": it.get("createdAt"),
+            }
+        last_key = resp.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def encode_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    for row in rows:
+        yield (json.dumps(row, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def encode_csv(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow(["" if row.get(c) is None else row.get(c) for c in EXPORT_COLUMNS])
+        # Flush the (single) buffered line so memory stays flat.
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], *, level: int = 6) -> Iterator[bytes]:
+    comp = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        out = comp.compress(chunk)
+        if out:
+            yield out
+    yield comp.flush()
+
+
+def export_actions(table: Any, year: int, fmt: str, *, gzip: bool = False) -> Optional[Iterator[bytes]]:
+    """Encoded export stream for `fmt` (ndjson|csv), or None for an unknown format."""
+    rows = iter_action_rows(table, year)
+    if fmt == "ndjson":
+        chunks = encode_ndjson(rows)
+    elif fmt == "csv":
+        chunks = encode_csv(rows)
+    else:
+        return None
+    return gzip_chunks(chunks) if gzip else chunks
+
+
+def payload_size(body: bytes, *, binary: bool) -> int:
+    """Approximate size of `body` once encoded into the response: base64, or a JSON string."""
+    if binary:
+        return 4 * -(-len(body) // 3)
+    # Quotes, backslashes and newlines are escaped with one extra byte each.
+    return len(body) + body.count(b'"') + body.count(b"\\") + body.count(b"\n")
+
+
+def read_capped(chunks: Iterable[bytes], *, limit: int, binary: bool = False) -> Optional[bytes]:
+    """Join `chunks`, or None as soon as the encoded body would exceed `limit` bytes."""
+    buf = bytearray()
+    size = 0
+    for chunk in chunks:
+        buf += chunk
+        # base64 isn't additive per chunk; JSON escaping is.
+        size = payload_size(buf, binary=True) if binary else size + payload_size(chunk, binary=False)
+        if size > limit:
+            return None
+    return bytes(buf)
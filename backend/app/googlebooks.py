@@ -0,0 +1,264 @@
+"""
+HTTP client for the Google Books API.
+
+Connections are kept alive in a small module-level pool, so warm invocations (and the workers
+of a bulk import) skip the DNS lookup and TLS handshake that a fresh `urlopen` pays per call.
+Each lookup has one overall deadline (`GOOGLE_BOOKS_DEADLINE_SECONDS`, well under the API
+function's 10 s timeout) that bounds connecting, reading and retries together. Connection
+errors, 429 and 5xx are retried with full-jitter backoff while the deadline allows; a read
+timeout is not retried, since a slow Google would only be waited on again. After
+`GOOGLE_BOOKS_BREAKER_THRESHOLD` consecutive failed lookups a circuit breaker opens and calls
+fail fast with `CircuitOpenError` for `GOOGLE_BOOKS_BREAKER_RESET_SECONDS`; then one trial call
+is let through. Callers with stored metadata fall back to it (see `bookcache.lookup_book`).
+
+`GOOGLE_BOOKS_BASE_URL` points the client elsewhere, e.g. at a local stub server in tests.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from .config import get_env
+
+DEFAULT_BASE_URL = "https://www.googleapis.com"
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_IDLE_CONNECTIONS = 8
+# Below this, an attempt can't complete: give up instead of starting one.
+_MIN_ATTEMPT_SECONDS = 0.05
+
+
+class GoogleBooksError(Exception):
+    """A lookup that failed for good (after retries, or with a non-retryable status)."""
+
+    def __init__(self, message: str, *, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(GoogleBooksError):
+    """Raised without calling Google while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. Closed: calls go through. After `threshold` failures in
+    a row it opens and `allow()` is False until `reset_seconds` have passed; then it lets a
+    single trial call through (half-open), whose outcome closes or re-opens it.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if self._clock() - self._opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_seconds or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.threshold:
+                self._opened_at = self._clock()
+            self._trial = False
+
+
+_lock = threading.Lock()
+# Idle keep-alive connections per (scheme, host, port), most recently used last.
+_idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+_breaker: Optional[CircuitBreaker] = None
+_counters = {"connectionsOpened": 0, "connectionsReused": 0, "retries": 0, "shortCircuited": 0}
+
+
+def breaker() -> CircuitBreaker:
+    global _breaker
+    if _breaker is None:
+        with _lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(
+                    int(get_env("GOOGLE_BOOKS_BREAKER_THRESHOLD", "5")),
+                    float(get_env("GOOGLE_BOOKS_BREAKER_RESET_SECONDS", "30")),
+                )
+    return _breaker
+
+
+def reset() -> None:
+    """Close pooled connections, close the breaker and zero the counters."""
+    global _breaker
+    with _lock:
+        for conns in _idle.values():
+            for conn in conns:
+                conn.close()
+        _idle.clear()
+        _breaker = None
+        for k in _counters:
+            _counters[k] = 0
+
+
+def stats() -> Dict[str, int]:
+    return dict(_counters)
+
+
+def _origin() -> Tuple[str, str, int, str]:
+    url = urlsplit(get_env("GOOGLE_BOOKS_BASE_URL", DEFAULT_BASE_URL))
+    scheme = url.scheme or "https"
+    port = url.port or (443 if scheme == "https" else 80)
+    return scheme, url.hostname or "", port, url.path.rstrip("/")
+
+
+def deadline_seconds() -> float:
+    """Upper bound on one lookup, retries included."""
+    return float(get_env("GOOGLE_BOOKS_DEADLINE_SECONDS", "4"))
+
+
+def _checkout(scheme: str, host: str, port: int, *, remaining: float) -> Tuple[http.client.HTTPConnection, bool]:
+    read_timeout = min(float(get_env("GOOGLE_BOOKS_READ_TIMEOUT_SECONDS", "3")), remaining)
+    with _lock:
+        conns = _idle.get((scheme, host, port))
+        conn = conns.pop() if conns else None
+        _counters["connectionsReused" if conn else "connectionsOpened"] += 1
+    if conn is not None:
+        if conn.sock is not None:
+            conn.sock.settimeout(read_timeout)
+        return conn, True
+    connect_timeout = min(float(get_env("GOOGLE_BOOKS_CONNECT_TIMEOUT_SECONDS", "1")), remaining)
+    cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    conn = cls(host, port, timeout=connect_timeout)
+    conn.connect()
+    # The connect timeout only bounds the handshake; reads get their own.
+    if conn.sock is not None:
+        conn.sock.settimeout(read_timeout)
+    return conn, False
+
+
+def _checkin(key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+    with _lock:
+        conns = _idle.setdefault(key, [])
+        if len(conns) < _MAX_IDLE_CONNECTIONS:
+            conns.append(conn)
+            return
+    conn.close()
+
+
+def _get_once(path: str, *, remaining: float) -> Tuple[int, bytes]:
+    scheme, host, port, base_path = _origin()
+    conn, reused = _checkout(scheme, host, port, remaining=remaining)
+    try:
+        conn.request(
+            "GET",
+            base_path + path,
+            headers={"accept": "application/json", "user-agent": "yeargoals/1.0", "connection": "keep-alive"},
+        )
+        resp = conn.getresponse()
+        body = resp.read()
+    except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+        conn.close()
+        if not reused:
+            raise
+        # The server dropped an idle keep-alive connection; that says nothing about its health.
+        return _get_once(path, remaining=remaining)
+    except BaseException:
+        conn.close()
+        raise
+    if resp.will_close:
+        conn.close()
+    else:
+        _checkin((scheme, host, port), conn)
+    return resp.status, body
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter: spreads retries from concurrent lookups instead of synchronizing them.
+    return random.uniform(0, min(1.0, 0.1 * (2**attempt)))
+
+
+def get_json(path: str, *, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    GET `path` (relative to the base URL) and decode the JSON body, with retries and the breaker.
+    `deadline` (seconds, default `deadline_seconds()`) bounds the whole call, retries included.
+    """
+    circuit = breaker()
+    if not circuit.allow():
+        with _lock:
+            _counters["shortCircuited"] += 1
+        raise CircuitOpenError("Google Books circuit is open")
+
+    give_up_at = time.monotonic() + (deadline_seconds() if deadline is None else deadline)
+    attempts = max(1, int(get_env("GOOGLE_BOOKS_MAX_ATTEMPTS", "3")))
+    error = GoogleBooksError("Google Books lookup failed")
+    settled = False
+    try:
+        for attempt in range(attempts):
+            if attempt:
+                pause = _backoff(attempt - 1)
+                if time.monotonic() + pause + _MIN_ATTEMPT_SECONDS > give_up_at:
+                    break
+                with _lock:
+                    _counters["retries"] += 1
+                time.sleep(pause)
+            remaining = give_up_at - time.monotonic()
+            if remaining < _MIN_ATTEMPT_SECONDS:
+                break
+            try:
+                status, body = _get_once(path, remaining=remaining)
+            except TimeoutError as exc:
+                # A connect or read timeout: Google (or the way to it) is slow, not flaky, and
+                # another attempt would only wait again.
+                error = GoogleBooksError(f"Google Books request timed out: {exc!r}")
+                break
+            except (OSError, http.client.HTTPException) as exc:
+                error = GoogleBooksError(f"Google Books request failed: {exc!r}")
+                continue
+            if status in _RETRY_STATUSES:
+                error = GoogleBooksError(f"Google Books returned {status}", status=status)
+                continue
+            if status >= 400:
+                # Our request is wrong; retrying won't help and Google isn't unhealthy.
+                settled = True
+                circuit.record_success()
+                raise GoogleBooksError(f"Google Books returned {status}", status=status)
+            data = json.loads(body.decode("utf-8", errors="replace") or "{}")
+            settled = True
+            circuit.record_success()
+            return data
+    except BaseException:
+        # Anything unexpected (e.g. an undecodable body) still counts as a failure, so a
+        # half-open trial can't stay taken and keep the circuit shut for good.
+        if not settled:
+            circuit.record_failure()
+        raise
+
+    circuit.record_failure()
+    raise error
+
+
+def volumes_by_isbn(isbn: str, *, deadline: Optional[float] = None) -> Dict[str, Any]:
+    return get_json(f"/books/v1/volumes?q=isbn:{quote(isbn)}", deadline=deadline)
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
+import base64
+import gzip
+import hashlib
 import json
 import os
 from decimal import Decimal
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+from .telemetry import span
+
+try:  # Optional: brotli compresses JSON ~15-20% smaller than gzip at similar CPU.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment package
+    brotli = None
+
+# Responses smaller than this are sent uncompressed (default; see COMPRESSION_MIN_BYTES).
+COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
 
 
 def origin_from_event(event: Dict[str, Any]) -> str:
@@ -31,23 +46,189 @@ def json_response(status_code: int, body: Dict[str, Any], *, origin: str) -> Dic
         "headers": {
             "content-type": "application/json; charset=utf-8",
             "access-control-allow-origin": origin,
-            "access-control-allow-headers": "content-type,x-admin-token",
+            "access-control-allow-headers": "content-type,x-admin-token,if-none-match",
             "access-control-allow-methods": "GET,POST,PATCH,DELETE,OPTIONS",
             "cache-control": "no-store",
         },
-        "body": json.dumps(body, separators=(",", ":"), ensure_ascii=False, default=_json_default),
+        "body": dumps(body),
     }
 
 
+def dumps(body: Any) -> str:
+    """
+    Compact JSON. Tables from `db.get_table` already return native numbers, so the plain
+    encoder (no per-object `default` hook) handles them; Decimals from other sources fall
+    back to `_json_default`.
+    """
+    with span("encode"):
+        try:
+            return json.dumps(body, separators=(",", ":"), ensure_ascii=False)
+        except TypeError:
+            return json.dumps(body, separators=(",", ":"), ensure_ascii=False, default=_json_default)
+
+
 def options_response(*, origin: str) -> Dict[str, Any]:
     return {
         "statusCode": 204,
         "headers": {
             "access-control-allow-origin": origin,
-            "access-control-allow-headers": "content-type,x-admin-token",
+            "access-control-allow-headers": "content-type,x-admin-token,if-none-match",
             "access-control-allow-methods": "GET,POST,PATCH,DELETE,OPTIONS",
             "cache-control": "no-store",
         },
         "body": "",
     }
 
+
+def bytes_response(
+    status_code: int,
+    body: bytes,
+    *,
+    origin: str,
+    content_type: str,
+    headers: Optional[Dict[str, str]] = None,
+    binary: bool = False,
+) -> Dict[str, Any]:
+    """
+    Non-JSON response. `binary=True` (e.g. gzip) sends the body base64-encoded with
+    `isBase64Encoded`, as API Gateway requires for arbitrary bytes.
+    """
+    resp: Dict[str, Any] = {
+        "statusCode": status_code,
+        "headers": {
+            "content-type": content_type,
+            "access-control-allow-origin": origin,
+            "access-control-allow-headers": "content-type,x-admin-token,if-none-match",
+            "access-control-allow-methods": "GET,POST,PATCH,DELETE,OPTIONS",
+            "cache-control": "no-store",
+            **(headers or {}),
+        },
+    }
+    if binary:
+        resp["body"] = base64.b64encode(body).decode("ascii")
+        resp["isBase64Encoded"] = True
+    else:
+        resp["body"] = body.decode("utf-8")
+    return resp
+
+
+def etag_for(body: str) -> str:
+    """Strong ETag: a hash of the exact response body."""
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _bare_etag(etag: str) -> str:
+    etag = etag[2:] if etag.startswith("W/") else etag
+    # Compressed representations carry `-<encoding>` (see `compress_response`).
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """`If-None-Match` uses weak comparison: `W/` prefixes are ignored, `*` matches anything."""
+    if not if_none_match:
+        return False
+    bare = _bare_etag(etag)
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if _bare_etag(candidate) == bare:
+            return True
+    return False
+
+
+def conditional_response(event: Dict[str, Any], resp: Dict[str, Any], *, cache_control: str) -> Dict[str, Any]:
+    """
+    Tag a successful GET response with an ETag and the route's cache policy, and turn it into
+    `304 Not Modified` (no body) when the request's `If-None-Match` already has that version.
+    """
+    if resp.get("statusCode") != 200 or resp.get("isBase64Encoded"):
+        return resp
+    etag = etag_for(resp.get("body") or "")
+    headers = resp["headers"]
+    headers["etag"] = etag
+    headers["cache-control"] = cache_control
+    headers["access-control-expose-headers"] = "etag"
+
+    req_headers = event.get("headers") or {}
+    if etag_matches(req_headers.get("if-none-match") or req_headers.get("If-None-Match"), etag):
+        # content-type is meaningless without a body.
+        return {
+            "statusCode": 304,
+            "headers": {k: v for k, v in headers.items() if k != "content-type"},
+            "body": "",
+        }
+    return resp
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """Encodings from an `Accept-Encoding` header that we can produce, most preferred first."""
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    ranked = []
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q <= 0:
+            continue
+        for enc in available if name == "*" else [name]:
+            if enc in available:
+                # Ties go to our preference order (br before gzip).
+                ranked.append((-q, available.index(enc), enc))
+    return list(dict.fromkeys(enc for _, _, enc in sorted(ranked)))
+
+
+def compress_response(
+    event: Dict[str, Any],
+    resp: Dict[str, Any],
+    *,
+    min_bytes: int = COMPRESSION_MIN_BYTES,
+) -> Dict[str, Any]:
+    """
+    Compress a text response body per the request's `Accept-Encoding` (brotli if installed,
+    else gzip) once it reaches `min_bytes`. The result is sent base64-encoded with
+    `isBase64Encoded`, as API Gateway HTTP APIs require for binary bodies.
+    """
+    headers = resp.get("headers")
+    body = resp.get("body")
+    if not isinstance(headers, dict) or not isinstance(body, str) or resp.get("isBase64Encoded"):
+        return resp
+    if "content-encoding" in headers or resp.get("statusCode") in (204, 304):
+        return resp
+    # The representation depends on Accept-Encoding whether or not this one is compressed.
+    headers["vary"] = "accept-encoding"
+
+    raw = body.encode("utf-8")
+    if len(raw) < min_bytes:
+        return resp
+    req_headers = event.get("headers") or {}
+    encodings = accepted_encodings(req_headers.get("accept-encoding") or req_headers.get("Accept-Encoding"))
+    if not encodings:
+        return resp
+
+    encoding = encodings[0]
+    with span("compress"):
+        if encoding == "br":
+            data = brotli.compress(raw, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+        else:
+            data = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    if len(data) >= len(raw):
+        return resp
+
+    headers["content-encoding"] = encoding
+    if "etag" in headers:
+        # A strong ETag identifies one exact byte sequence, so each encoding gets its own.
+        headers["etag"] = headers["etag"][:-1] + f'-{encoding}"'
+    resp["body"] = base64.b64encode(data).decode("ascii")
+    resp["isBase64Encoded"] = True
+    return resp
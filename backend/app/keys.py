@@ -22,3 +22,23 @@ def book_sk(isbn: str) -> str:
     # ISBN is stored normalized (digits + optional X).
     return f"BOOK#{isbn}"
 
+
+def book_miss_sk(isbn: str) -> str:
+    # Negative-cache marker for ISBNs Google Books has no volume for.
+    # Deliberately not under `BOOK#` so library queries never see it.
+    return f"BOOKMISS#{isbn}"
+
+
+def stats_month_sk(year: int, month: int) -> str:
+    return f"STATS#{year}#M{month:02d}"
+
+
+def stats_week_sk(year: int, week: int) -> str:
+    # Keyed by the action's year, not the ISO year: weeks straddling New Year are folded into
+    # the year's first or last week (see `counters.bucket_sks`).
+    return f"STATS#{year}#W{week:02d}"
+
+
+def bulk_stats_sk(request_id: str, start: int, part: int) -> str:
+    # Marks one stats transaction of a POST /actions:bulk group as applied.
+    return f"BULKSTATS#{request_id}#{start}#{part}"
@@ -0,0 +1,931 @@
+"""
+In-memory stand-in for a DynamoDB table (hash key `pk`, range key `sk`).
+
+`MemoryTable` speaks the same resource-style API as `ClientTable` (plain Python values,
+native numbers) and implements the parts of DynamoDB this app relies on, with DynamoDB's
+semantics rather than canned answers:
+
+- items per partition kept in a sorted sort-key index (`bisect`), so `query` key conditions
+  (`=`, `<`, `<=`, `>`, `>=`, `BETWEEN`, `begins_with`) are range scans; `ScanIndexForward`,
+  `Limit`, `ExclusiveStartKey`/`LastEvaluatedKey`, the 1 MB page cap, `FilterExpression`,
+  `Select=COUNT`;
+- `UpdateExpression` SET (with `+`/`-`, `if_not_exists`, `list_append`), REMOVE, ADD, DELETE;
+- `ConditionExpression` (comparisons, `BETWEEN`, `IN`, `AND`/`OR`/`NOT`, `attribute_exists`,
+  `attribute_not_exists`, `attribute_type`, `begins_with`, `contains`, `size`);
+- `ProjectionExpression`, `ReturnValues`, `BatchGetItem`/`BatchWriteItem` limits and
+  all-or-nothing `TransactWriteItems` (with `ClientRequestToken` idempotency).
+
+Failures raise `DynamoDBError`, shaped like botocore's `ClientError`
+(`exc.response["Error"]["Code"]`), e.g. `ConditionalCheckFailedException`.
+
+Every call is charged with DynamoDB's capacity rules (4 KB read units, halved for eventually
+consistent reads; 1 KB write units; doubled inside transactions) and reported through
+`ReturnConsumedCapacity` and the cumulative `consumed` counters, so route costs can be
+measured offline. Capacity is also charged to the current request's telemetry.
+"""
+
+from __future__ import annotations
+
+import bisect
+import copy
+import math
+import re
+import threading
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .telemetry import add_capacity
+
+MAX_PAGE_BYTES = 1024 * 1024
+
+
+class DynamoDBError(Exception):
+    """Service error with botocore's `ClientError.response` shape."""
+
+    def __init__(self, code: str, message: str, **extra: Any) -> None:
+        super().__init__(f"{code}: {message}")
+        self.response: Dict[str, Any] = {"Error": {"Code": code, "Message": message}, **extra}
+
+
+def _validation(message: str) -> DynamoDBError:
+    return DynamoDBError("ValidationException", message)
+
+
+# --- item size / capacity -------------------------------------------------------------------
+
+
+def _value_size(v: Any) -> int:
+    if isinstance(v, str):
+        return len(v.encode("utf-8"))
+    if isinstance(v, bool) or v is None:
+        return 1
+    if isinstance(v, (int, float, Decimal)):
+        digits = str(abs(v)).replace(".", "").lstrip("0") or "0"
+        return (len(digits) + 1) // 2 + 1
+    if isinstance(v, (bytes, bytearray)):
+        return len(v)
+    if isinstance(v, dict):
+        return 3 + sum(len(k.encode("utf-8")) + _value_size(x) + 1 for k, x in v.items())
+    if isinstance(v, (list, tuple)):
+        return 3 + sum(_value_size(x) + 1 for x in v)
+    if isinstance(v, (set, frozenset)):
+        return sum(_value_size(x) for x in v)
+    return len(str(v))
+
+
+def item_size(item: Optional[Dict[str, Any]]) -> int:
+    """Approximate stored size in bytes, per DynamoDB's item size rules."""
+    if not item:
+        return 0
+    return sum(len(name.encode("utf-8")) + _value_size(v) for name, v in item.items())
+
+
+def read_units(size: int, *, consistent: bool) -> float:
+    units = max(1, math.ceil(size / 4096))
+    return float(units) if consistent else units / 2
+
+
+def write_units(size: int) -> float:
+    return float(max(1, math.ceil(size / 1024)))
+
+
+# --- expressions ----------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:(?P<num>\d+)|(?P<name>#?[A-Za-z_][A-Za-z0-9_\-]*)|(?P<value>:[A-Za-z0-9_]+)"
+    r"|(?P<op><>|<=|>=|=|<|>|\(|\)|,|\.|\[|\]|\+|-))"
+)
+
+
+def _tokenize(expr: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    expr = expr.rstrip()
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise _validation(f"Invalid expression near: {expr[pos:pos + 20]!r}")
+        kind = m.lastgroup or ""
+        tokens.append((kind, m.group(kind)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for condition, key-condition, update and projection expressions."""
+
+    def __init__(self, expr: str, names: Dict[str, str], values: Dict[str, Any]) -> None:
+        self.tokens = _tokenize(expr)
+        self.i = 0
+        self.names = names
+        self.values = values
+        self.used_values: set = set()
+
+    # token helpers
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        j = self.i + offset
+        return self.tokens[j] if j < len(self.tokens) else ("eof", "")
+
+    def next(self) -> Tuple[str, str]:
+        tok = self.peek()
+        self.i += 1
+        return tok
+
+    def expect(self, text: str) -> None:
+        kind, tok = self.next()
+        if tok != text:
+            raise _validation(f"Expected {text!r}, got {tok!r}")
+
+    def keyword(self, word: str) -> bool:
+        kind, tok = self.peek()
+        if kind == "name" and tok.upper() == word:
+            self.i += 1
+            return True
+        return False
+
+    def done(self) -> bool:
+        return self.i >= len(self.tokens)
+
+    # paths and operands
+    def path(self) -> List[Any]:
+        kind, tok = self.next()
+        if kind != "name":
+            raise _validation(f"Expected attribute name, got {tok!r}")
+        parts: List[Any] = [self._name(tok)]
+        while self.peek()[1] in (".", "["):
+            if self.next()[1] == ".":
+                kind, tok = self.next()
+                parts.append(self._name(tok))
+            else:
+                kind, tok = self.next()
+                if kind != "num":
+                    raise _validation("List index must be a number")
+                parts.append(int(tok))
+                self.expect("]")
+        return parts
+
+    def _name(self, tok: str) -> str:
+        if tok.startswith("#"):
+            if tok not in self.names:
+                raise _validation(f"Undefined attribute name placeholder: {tok}")
+            return self.names[tok]
+        return tok
+
+    def value(self) -> Any:
+        kind, tok = self.next()
+        if kind != "value":
+            raise _validation(f"Expected value placeholder, got {tok!r}")
+        if tok not in self.values:
+            raise _validation(f"Undefined attribute value placeholder: {tok}")
+        self.used_values.add(tok)
+        return self.values[tok]
+
+    def operand(self) -> Callable[[Dict[str, Any]], Any]:
+        kind, tok = self.peek()
+        if kind == "value":
+            v = self.value()
+            return lambda item: v
+        if kind == "name" and tok.lower() == "size" and self.peek(1)[1] == "(":
+            self.i += 2
+            p = self.path()
+            self.expect(")")
+            return lambda item: _size(_get(item, p))
+        p = self.path()
+        return lambda item: _get(item, p)
+
+    # conditions
+    def condition(self) -> Callable[[Dict[str, Any]], bool]:
+        left = self._and()
+        while self.keyword("OR"):
+            right = self._and()
+            left = (lambda a, b: lambda item: a(item) or b(item))(left, right)
+        return left
+
+    def _and(self) -> Callable[[Dict[str, Any]], bool]:
+        left = self._not()
+        while self.keyword("AND"):
+            right = self._not()
+            left = (lambda a, b: lambda item: a(item) and b(item))(left, right)
+        return left
+
+    def _not(self) -> Callable[[Dict[str, Any]], bool]:
+        if self.keyword("NOT"):
+            inner = self._not()
+            return lambda item: not inner(item)
+        return self._primary()
+
+    def _primary(self) -> Callable[[Dict[str, Any]], bool]:
+        kind, tok = self.peek()
+        if tok == "(":
+            self.i += 1
+            inner = self.condition()
+            self.expect(")")
+            return inner
+        if kind == "name" and self.peek(1)[1] == "(" and tok.lower() != "size":
+            return self._function(tok.lower())
+        left = self.operand()
+        kind, op = self.next()
+        if kind == "name" and op.upper() == "BETWEEN":
+            lo = self.operand()
+            if not self.keyword("AND"):
+                raise _validation("BETWEEN requires AND")
+            hi = self.operand()
+            return lambda item: _between(left(item), lo(item), hi(item))
+        if kind == "name" and op.upper() == "IN":
+            self.expect("(")
+            options = [self.operand()]
+            while self.peek()[1] == ",":
+                self.i += 1
+                options.append(self.operand())
+            self.expect(")")
+            return lambda item: _present(left(item)) and any(left(item) == o(item) for o in options)
+        if op not in _COMPARATORS:
+            raise _validation(f"Unexpected token {op!r}")
+        right = self.operand()
+        cmp = _COMPARATORS[op]
+        return lambda item: _compare(cmp, left(item), right(item))
+
+    def _function(self, fn: str) -> Callable[[Dict[str, Any]], bool]:
+        self.i += 2  # name + "("
+        p = self.path()
+        arg: Optional[Callable[[Dict[str, Any]], Any]] = None
+        if self.peek()[1] == ",":
+            self.i += 1
+            arg = self.operand()
+        self.expect(")")
+        if fn == "attribute_exists":
+            return lambda item: _present(_get(item, p))
+        if fn == "attribute_not_exists":
+            return lambda item: not _present(_get(item, p))
+        if arg is None:
+            raise _validation(f"{fn} requires two arguments")
+        if fn == "begins_with":
+            return lambda item: _begins_with(_get(item, p), arg(item))
+        if fn == "contains":
+            return lambda item: _contains(_get(item, p), arg(item))
+        if fn == "attribute_type":
+            return lambda item: _type_tag(_get(item, p)) == arg(item)
+        raise _validation(f"Unknown function: {fn}")
+
+    # update expressions
+    def update(self) -> List[Tuple[str, List[Any], Any]]:
+        actions: List[Tuple[str, List[Any], Any]] = []
+        seen = set()
+        while not self.done():
+            kind, tok = self.next()
+            clause = tok.upper()
+            if kind != "name" or clause not in ("SET", "REMOVE", "ADD", "DELETE"):
+                raise _validation(f"Expected SET, REMOVE, ADD or DELETE, got {tok!r}")
+            if clause in seen:
+                raise _validation(f"The {clause} section can only be used once in an update expression")
+            seen.add(clause)
+            while True:
+                p = self.path()
+                if clause == "SET":
+                    self.expect("=")
+                    actions.append(("SET", p, self._set_value()))
+                elif clause == "REMOVE":
+                    actions.append(("REMOVE", p, None))
+                else:
+                    v = self.value()
+                    actions.append((clause, p, v))
+                if self.peek()[1] != ",":
+                    break
+                self.i += 1
+        return actions
+
+    def _set_value(self) -> Callable[[Dict[str, Any]], Any]:
+        left = self._set_operand()
+        op = self.peek()[1]
+        if op in ("+", "-"):
+            self.i += 1
+            right = self._set_operand()
+            if op == "+":
+                return lambda item: _arith(left(item), right(item), 1)
+            return lambda item: _arith(left(item), right(item), -1)
+        return left
+
+    def _set_operand(self) -> Callable[[Dict[str, Any]], Any]:
+        kind, tok = self.peek()
+        if kind == "name" and self.peek(1)[1] == "(":
+            fn = tok.lower()
+            self.i += 2
+            if fn == "if_not_exists":
+                p = self.path()
+                self.expect(",")
+                fallback = self._set_operand()
+                self.expect(")")
+                return lambda item: _get(item, p) if _present(_get(item, p)) else fallback(item)
+            if fn == "list_append":
+                a = self._set_operand()
+                self.expect(",")
+                b = self._set_operand()
+                self.expect(")")
+                return lambda item: list(a(item) or []) + list(b(item) or [])
+            raise _validation(f"Unknown function in SET: {fn}")
+        return self.operand()
+
+    def projection(self) -> List[List[Any]]:
+        paths = [self.path()]
+        while self.peek()[1] == ",":
+            self.i += 1
+            paths.append(self.path())
+        return paths
+
+
+_MISSING = object()
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda a, b: a == b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def _present(v: Any) -> bool:
+    return v is not _MISSING
+
+
+def _get(item: Any, path: List[Any]) -> Any:
+    cur = item
+    for part in path:
+        if isinstance(part, int):
+            if not isinstance(cur, list) or part >= len(cur):
+                return _MISSING
+            cur = cur[part]
+        else:
+            if not isinstance(cur, dict) or part not in cur:
+                return _MISSING
+            cur = cur[part]
+    return cur
+
+
+def _same_kind(a: Any, b: Any) -> bool:
+    num = (int, float, Decimal)
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool)
+    if isinstance(a, num) and isinstance(b, num):
+        return True
+    return type(a) is type(b) or (isinstance(a, (bytes, bytearray)) and isinstance(b, (bytes, bytearray)))
+
+
+def _compare(cmp: Callable[[Any, Any], bool], a: Any, b: Any) -> bool:
+    if not _present(a) or not _present(b):
+        return cmp is _COMPARATORS["<>"] and _present(a) != _present(b)
+    if not _same_kind(a, b):
+        return cmp is _COMPARATORS["<>"]
+    try:
+        return cmp(a, b)
+    except TypeError:
+        return False
+
+
+def _between(v: Any, lo: Any, hi: Any) -> bool:
+    return _compare(_COMPARATORS[">="], v, lo) and _compare(_COMPARATORS["<="], v, hi)
+
+
+def _begins_with(v: Any, prefix: Any) -> bool:
+    if isinstance(v, str) and isinstance(prefix, str):
+        return v.startswith(prefix)
+    if isinstance(v, (bytes, bytearray)) and isinstance(prefix, (bytes, bytearray)):
+        return bytes(v).startswith(bytes(prefix))
+    return False
+
+
+def _contains(v: Any, operand: Any) -> bool:
+    if isinstance(v, str) and isinstance(operand, str):
+        return operand in v
+    if isinstance(v, (list, set, frozenset)):
+        return operand in v
+    return False
+
+
+def _size(v: Any) -> Any:
+    if not _present(v):
+        return _MISSING
+    if isinstance(v, str):
+        return len(v.encode("utf-8"))
+    if isinstance(v, (bytes, bytearray, list, dict, set, frozenset)):
+        return len(v)
+    return _MISSING
+
+
+def _type_tag(v: Any) -> Optional[str]:
+    if not _present(v):
+        return None
+    if v is None:
+        return "NULL"
+    if isinstance(v, bool):
+        return "BOOL"
+    if isinstance(v, str):
+        return "S"
+    if isinstance(v, (int, float, Decimal)):
+        return "N"
+    if isinstance(v, (bytes, bytearray)):
+        return "B"
+    if isinstance(v, dict):
+        return "M"
+    if isinstance(v, list):
+        return "L"
+    if isinstance(v, (set, frozenset)):
+        sample = next(iter(v), "")
+        return "SS" if isinstance(sample, str) else "BS" if isinstance(sample, bytes) else "NS"
+    return None
+
+
+def _arith(a: Any, b: Any, sign: int) -> Any:
+    num = (int, float, Decimal)
+    if not isinstance(a, num) or not isinstance(b, num) or isinstance(a, bool) or isinstance(b, bool):
+        raise _validation("An operand in the update expression has an incorrect data type")
+    return a + sign * b
+
+
+def _set_path(item: Dict[str, Any], path: List[Any], value: Any) -> None:
+    cur: Any = item
+    for part in path[:-1]:
+        nxt = _get(cur, [part])
+        if not _present(nxt):
+            raise _validation("The document path provided in the update expression is invalid for update")
+        cur = nxt
+    last = path[-1]
+    if isinstance(last, int):
+        if not isinstance(cur, list):
+            raise _validation("The document path provided in the update expression is invalid for update")
+        if last >= len(cur):
+            cur.append(value)
+        else:
+            cur[last] = value
+    else:
+        if not isinstance(cur, dict):
+            raise _validation("The document path provided in the update expression is invalid for update")
+        cur[last] = value
+
+
+def _remove_path(item: Dict[str, Any], path: List[Any]) -> None:
+    parent = _get(item, path[:-1]) if len(path) > 1 else item
+    last = path[-1]
+    if isinstance(last, int) and isinstance(parent, list) and last < len(parent):
+        del parent[last]
+    elif isinstance(parent, dict):
+        parent.pop(last, None)
+
+
+def _apply_update(item: Dict[str, Any], actions: List[Tuple[str, List[Any], Any]]) -> None:
+    # Every SET value is computed from the item as it was before the update.
+    before = copy.deepcopy(item)
+    for clause, path, arg in actions:
+        if clause == "SET":
+            _set_path(item, path, arg(before))
+        elif clause == "REMOVE":
+            _remove_path(item, path)
+        elif clause == "ADD":
+            current = _get(item, path)
+            if not _present(current):
+                _set_path(item, path, set(arg) if isinstance(arg, (set, frozenset)) else arg)
+            elif isinstance(current, (set, frozenset)) and isinstance(arg, (set, frozenset)):
+                _set_path(item, path, set(current) | set(arg))
+            else:
+                _set_path(item, path, _arith(current, arg, 1))
+        elif clause == "DELETE":
+            current = _get(item, path)
+            if _present(current) and isinstance(current, (set, frozenset)):
+                remaining = set(current) - set(arg)
+                if remaining:
+                    _set_path(item, path, remaining)
+                else:
+                    _remove_path(item, path)
+
+
+def prefix_successor(prefix: Any) -> Any:
+    """The smallest key greater than every key starting with non-empty `prefix`."""
+    if isinstance(prefix, str):
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return bytes(prefix[:-1]) + bytes([prefix[-1] + 1])
+
+
+def _prefix_end(keys: List[Any], prefix: Any) -> int:
+    """Index just past the last key starting with `prefix` in sorted `keys`."""
+    return bisect.bisect_left(keys, prefix_successor(prefix)) if prefix else len(keys)
+
+
+def _project(item: Dict[str, Any], paths: Optional[List[List[Any]]]) -> Dict[str, Any]:
+    if paths is None:
+        return copy.deepcopy(item)
+    out: Dict[str, Any] = {}
+    for path in paths:
+        v = _get(item, path)
+        if not _present(v):
+            continue
+        if len(path) == 1:
+            out[path[0]] = copy.deepcopy(v)
+        else:
+            # Nested projections keep the document shape down to the selected element.
+            cur = out
+            for part in path[:-1]:
+                cur = cur.setdefault(part, {}) if isinstance(part, str) else cur
+            cur[path[-1]] = copy.deepcopy(v)
+    return out
+
+
+# --- the table ------------------------------------------------------------------------------
+
+
+class MemoryTable:
+    """A DynamoDB table held in memory; thread-safe. See the module docstring for coverage."""
+
+    def __init__(self, name: str = "table", *, hash_key: str = "pk", range_key: str = "sk") -> None:
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self._partitions: Dict[Any, Tuple[List[Any], Dict[Any, Dict[str, Any]]]] = {}
+        self._lock = threading.RLock()
+        self._tokens: Dict[str, Any] = {}
+        self.consumed: Dict[str, float] = {"rcu": 0.0, "wcu": 0.0}
+        self.calls: Dict[str, int] = {}
+
+    # -- helpers
+    def _key_of(self, key_or_item: Dict[str, Any]) -> Tuple[Any, Any]:
+        try:
+            return key_or_item[self.hash_key], key_or_item[self.range_key]
+        except KeyError:
+            raise _validation("The provided key element does not match the schema") from None
+
+    def _check_key(self, key: Dict[str, Any]) -> Tuple[Any, Any]:
+        if set(key) != {self.hash_key, self.range_key}:
+            raise _validation("The provided key element does not match the schema")
+        return self._key_of(key)
+
+    def _load(self, pk: Any, sk: Any) -> Optional[Dict[str, Any]]:
+        part = self._partitions.get(pk)
+        return part[1].get(sk) if part else None
+
+    def _store(self, item: Dict[str, Any]) -> None:
+        pk, sk = self._key_of(item)
+        keys, items = self._partitions.setdefault(pk, ([], {}))
+        if sk not in items:
+            bisect.insort(keys, sk)
+        items[sk] = item
+
+    def _drop(self, pk: Any, sk: Any) -> None:
+        part = self._partitions.get(pk)
+        if not part or sk not in part[1]:
+            return
+        keys, items = part
+        del items[sk]
+        del keys[bisect.bisect_left(keys, sk)]
+        if not items:
+            del self._partitions[pk]
+
+    def _scan(
+        self, pk: Any, op: Optional[str], args: List[Any], *, forward: bool, after: Any = None
+    ) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """(sk, item) pairs of partition `pk` matching the sort-key condition, in key order, after `after`."""
+        keys, items = self._partitions.get(pk, ([], {}))
+        ranges: Dict[Optional[str], Callable[[], Tuple[int, int]]] = {
+            None: lambda: (0, len(keys)),
+            "=": lambda: (bisect.bisect_left(keys, args[0]), bisect.bisect_right(keys, args[0])),
+            "<": lambda: (0, bisect.bisect_left(keys, args[0])),
+            "<=": lambda: (0, bisect.bisect_right(keys, args[0])),
+            ">": lambda: (bisect.bisect_right(keys, args[0]), len(keys)),
+            ">=": lambda: (bisect.bisect_left(keys, args[0]), len(keys)),
+            "BETWEEN": lambda: (bisect.bisect_left(keys, args[0]), bisect.bisect_right(keys, args[1])),
+            # Every key with the prefix sorts between the prefix and its successor.
+            "begins_with": lambda: (bisect.bisect_left(keys, args[0]), _prefix_end(keys, args[0])),
+        }
+        lo, hi = ranges[op]()
+        if after is not None:
+            if forward:
+                lo = max(lo, bisect.bisect_right(keys, after))
+            else:
+                hi = min(hi, bisect.bisect_left(keys, after))
+        for idx in range(lo, hi) if forward else range(hi - 1, lo - 1, -1):
+            yield keys[idx], items[keys[idx]]
+
+    def _atomic(self) -> Any:
+        """Context manager making a group of `_load`/`_store`/`_drop` calls atomic."""
+        return self._lock
+
+    def _charge(
+        self, op: str, kwargs: Dict[str, Any], resp: Dict[str, Any], *, read: float = 0.0, write: float = 0.0
+    ) -> None:
+        self.calls[op] = self.calls.get(op, 0) + 1
+        self.consumed["rcu"] += read
+        self.consumed["wcu"] += write
+        # Charged to the current request like ClientTable does, so EMF lines match production.
+        add_capacity(read=read, write=write)
+        mode = kwargs.get("ReturnConsumedCapacity")
+        if mode in ("TOTAL", "INDEXES"):
+            cc: Dict[str, Any] = {"TableName": self.name, "CapacityUnits": read + write}
+            if read:
+                cc["ReadCapacityUnits"] = read
+            if write:
+                cc["WriteCapacityUnits"] = write
+            if mode == "INDEXES":
+                cc["Table"] = {"CapacityUnits": read + write}
+            resp["ConsumedCapacity"] = cc
+
+    @staticmethod
+    def _parser(expr: str, kwargs: Dict[str, Any]) -> _Parser:
+        names = kwargs.get("ExpressionAttributeNames") or {}
+        return _Parser(expr, names, kwargs.get("ExpressionAttributeValues") or {})
+
+    def _condition(self, kwargs: Dict[str, Any]) -> Optional[Callable[[Dict[str, Any]], bool]]:
+        expr = kwargs.get("ConditionExpression")
+        if not expr:
+            return None
+        parser = self._parser(expr, kwargs)
+        cond = parser.condition()
+        if not parser.done():
+            raise _validation(f"Syntax error in ConditionExpression: {expr}")
+        return cond
+
+    def _projection(self, kwargs: Dict[str, Any]) -> Optional[List[List[Any]]]:
+        expr = kwargs.get("ProjectionExpression")
+        if not expr:
+            return None
+        return self._parser(expr, kwargs).projection()
+
+    @staticmethod
+    def _return_values(
+        kwargs: Dict[str, Any], old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        mode = kwargs.get("ReturnValues") or "NONE"
+        if mode == "ALL_OLD" and old is not None:
+            return {"Attributes": copy.deepcopy(old)}
+        if mode in ("ALL_NEW", "UPDATED_NEW") and new is not None:
+            return {"Attributes": copy.deepcopy(new)}
+        return {}
+
+    # -- single-item operations
+    def get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        pk, sk = self._check_key(kwargs.get("Key") or {})
+        projection = self._projection(kwargs)
+        with self._atomic():
+            item = self._load(pk, sk)
+            resp: Dict[str, Any] = {"Item": _project(item, projection)} if item is not None else {}
+        read = read_units(item_size(item), consistent=bool(kwargs.get("ConsistentRead")))
+        self._charge("get_item", kwargs, resp, read=read)
+        return resp
+
+    def _prepare_write(self, op: str, kwargs: Dict[str, Any]) -> Callable[[], Tuple[Any, Any]]:
+        """
+        Validate a write and return a closure that applies it (under the table lock), returning
+        (old item, new item); raises ConditionalCheckFailedException before changing anything.
+        """
+        condition = self._condition(kwargs)
+        if op == "Put":
+            item = copy.deepcopy(kwargs.get("Item") or {})
+            pk, sk = self._key_of(item)
+        else:
+            pk, sk = self._check_key(kwargs.get("Key") or {})
+        actions = None
+        if op == "Update":
+            expr = kwargs.get("UpdateExpression")
+            if expr:
+                parser = self._parser(expr, kwargs)
+                actions = parser.update()
+
+        def apply() -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+            old = self._load(pk, sk)
+            if condition is not None and not condition(old or {}):
+                raise DynamoDBError("ConditionalCheckFailedException", "The conditional request failed")
+            if op == "Put":
+                new: Optional[Dict[str, Any]] = item
+            elif op == "Update":
+                new = copy.deepcopy(old) if old is not None else {self.hash_key: pk, self.range_key: sk}
+                if actions:
+                    _apply_update(new, actions)
+                    if new.get(self.hash_key) != pk or new.get(self.range_key) != sk:
+                        raise _validation("Cannot update attribute; this attribute is part of the key")
+            elif op == "Delete":
+                new = None
+            else:  # ConditionCheck
+                return old, old
+            if new is None:
+                self._drop(pk, sk)
+            else:
+                self._store(new)
+            return old, new
+
+        return apply
+
+    def _write(self, op: str, method: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        apply = self._prepare_write(op, kwargs)
+        with self._atomic():
+            try:
+                old, new = apply()
+            except DynamoDBError as exc:
+                if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                    # A failed conditional write still costs a write unit.
+                    self._charge(method, kwargs, {}, write=write_units(0))
+                raise
+        resp = self._return_values(kwargs, old, new)
+        self._charge(method, kwargs, resp, write=write_units(max(item_size(old), item_size(new))))
+        return resp
+
+    def put_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._write("Put", "put_item", kwargs)
+
+    def update_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._write("Update", "update_item", kwargs)
+
+    def delete_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._write("Delete", "delete_item", kwargs)
+
+    # -- query
+    def _key_condition(self, expr: str, kwargs: Dict[str, Any]) -> Tuple[Any, Optional[str], List[Any]]:
+        """Split a KeyConditionExpression into (partition key, sort-key operator or None, operands)."""
+        parser = self._parser(expr, kwargs)
+        terms: List[Tuple[str, str, List[Any]]] = []
+        while True:
+            kind, tok = parser.peek()
+            if kind == "name" and tok.lower() == "begins_with" and parser.peek(1)[1] == "(":
+                parser.i += 2
+                name = parser.path()
+                parser.expect(",")
+                terms.append(("begins_with", name[0], [parser.value()]))
+                parser.expect(")")
+            else:
+                name = parser.path()
+                kind, op = parser.next()
+                if op.upper() == "BETWEEN":
+                    lo = parser.value()
+                    if not parser.keyword("AND"):
+                        raise _validation("BETWEEN requires AND")
+                    terms.append(("BETWEEN", name[0], [lo, parser.value()]))
+                elif op in ("=", "<", "<=", ">", ">="):
+                    terms.append((op, name[0], [parser.value()]))
+                else:
+                    raise _validation(f"Invalid operator used in KeyConditionExpression: {op}")
+            if parser.done():
+                break
+            if not parser.keyword("AND"):
+                raise _validation("KeyConditionExpression terms must be joined with AND")
+
+        pk_terms = [t for t in terms if t[1] == self.hash_key]
+        sk_terms = [t for t in terms if t[1] == self.range_key]
+        other_terms = len(terms) - len(pk_terms) - len(sk_terms)
+        if len(pk_terms) != 1 or pk_terms[0][0] != "=" or len(sk_terms) > 1 or other_terms:
+            raise _validation("Query key condition not supported")
+        pk = pk_terms[0][2][0]
+        if not sk_terms:
+            return pk, None, []
+        op, _, args = sk_terms[0]
+        return pk, op, args
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        expr = kwargs.get("KeyConditionExpression")
+        if not isinstance(expr, str) or not expr:
+            raise _validation("KeyConditionExpression is required")
+        pk, op, args = self._key_condition(expr, kwargs)
+        forward = kwargs.get("ScanIndexForward", True)
+        limit = kwargs.get("Limit")
+        start = kwargs.get("ExclusiveStartKey")
+        projection = self._projection(kwargs)
+        filt = None
+        if kwargs.get("FilterExpression"):
+            parser = self._parser(kwargs["FilterExpression"], kwargs)
+            filt = parser.condition()
+
+        start_sk = self._key_of(start)[1] if start is not None else None
+        with self._atomic():
+            # Limit and the 1 MB cap count items read, before the filter (as DynamoDB does);
+            # reaching either ends the page with a LastEvaluatedKey.
+            out: List[Dict[str, Any]] = []
+            scanned = 0
+            size = 0
+            last_sk: Any = None
+            for last_sk, item in self._scan(pk, op, args, forward=forward, after=start_sk):
+                scanned += 1
+                size += item_size(item)
+                if filt is None or filt(item):
+                    out.append(_project(item, projection))
+                if (limit is not None and scanned >= limit) or size >= MAX_PAGE_BYTES:
+                    break
+            else:
+                last_sk = None
+
+        resp: Dict[str, Any] = {"Count": len(out), "ScannedCount": scanned}
+        if kwargs.get("Select") != "COUNT":
+            resp["Items"] = out
+        if last_sk is not None:
+            resp["LastEvaluatedKey"] = {self.hash_key: pk, self.range_key: last_sk}
+        self._charge("query", kwargs, resp, read=read_units(size, consistent=bool(kwargs.get("ConsistentRead"))))
+        return resp
+
+    # -- batch operations
+    def batch_get_item(self, *, RequestItems: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        spec = RequestItems.get(self.name)
+        if spec is None or len(RequestItems) != 1:
+            raise DynamoDBError("ResourceNotFoundException", "Requested resource not found")
+        keys = spec.get("Keys") or []
+        if not keys or len(keys) > 100:
+            raise _validation("Too many items requested for the BatchGetItem call")
+        projection = self._projection(spec)
+        consistent = bool(spec.get("ConsistentRead"))
+        found = []
+        read = 0.0
+        with self._atomic():
+            for key in keys:
+                item = self._load(*self._check_key(key))
+                read += read_units(item_size(item), consistent=consistent)
+                if item is not None:
+                    found.append(_project(item, projection))
+        resp: Dict[str, Any] = {"Responses": {self.name: found}, "UnprocessedKeys": {}}
+        self._charge("batch_get_item", kwargs, resp, read=read)
+        if "ConsumedCapacity" in resp:
+            resp["ConsumedCapacity"] = [resp["ConsumedCapacity"]]
+        return resp
+
+    def batch_write_item(self, *, RequestItems: Dict[str, List[Dict[str, Any]]], **kwargs: Any) -> Dict[str, Any]:
+        reqs = RequestItems.get(self.name)
+        if reqs is None or len(RequestItems) != 1:
+            raise DynamoDBError("ResourceNotFoundException", "Requested resource not found")
+        if not reqs or len(reqs) > 25:
+            raise _validation("Too many items requested for the BatchWriteItem call")
+        write = 0.0
+        with self._atomic():
+            for req in reqs:
+                if "PutRequest" in req:
+                    item = copy.deepcopy(req["PutRequest"]["Item"])
+                    old = self._load(*self._key_of(item))
+                    self._store(item)
+                    write += write_units(max(item_size(old), item_size(item)))
+                else:
+                    pk, sk = self._check_key(req["DeleteRequest"]["Key"])
+                    write += write_units(item_size(self._load(pk, sk)))
+                    self._drop(pk, sk)
+        resp: Dict[str, Any] = {"UnprocessedItems": {}}
+        self._charge("batch_write_item", kwargs, resp, write=write)
+        if "ConsumedCapacity" in resp:
+            resp["ConsumedCapacity"] = [resp["ConsumedCapacity"]]
+        return resp
+
+    def transact_write_items(self, *, TransactItems: List[Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        if not TransactItems or len(TransactItems) > 100:
+            raise _validation("Member must have length between 1 and 100")
+        token = kwargs.get("ClientRequestToken")
+        prepared = []
+        targets = set()
+        for op in TransactItems:
+            ((kind, body),) = op.items()
+            if body.get("TableName", self.name) != self.name:
+                raise DynamoDBError("ResourceNotFoundException", "Requested resource not found")
+            key = self._key_of(body["Item"] if kind == "Put" else body.get("Key") or {})
+            if key in targets:
+                raise _validation("Transaction request cannot include multiple operations on one item")
+            targets.add(key)
+            prepared.append((key, self._prepare_write(kind, body)))
+
+        with self._atomic():
+            if token is not None and token in self._tokens:
+                # Idempotent retry of a committed transaction.
+                return {}
+            # Check every condition before applying anything: all or nothing.
+            snapshot = {key: copy.deepcopy(self._load(*key)) for key, _ in prepared}
+            reasons = []
+            failed = False
+            for key, apply in prepared:
+                try:
+                    apply()
+                    reasons.append({"Code": "None"})
+                except DynamoDBError as exc:
+                    failed = True
+                    code = exc.response["Error"]["Code"].replace("Exception", "")
+                    reasons.append({"Code": code, "Message": exc.response["Error"]["Message"]})
+            # Transactional writes cost two units per KB.
+            write = sum(2 * write_units(max(item_size(snapshot[k]), item_size(self._load(*k)))) for k, _ in prepared)
+            if failed:
+                for (pk, sk), old in snapshot.items():
+                    if old is None:
+                        self._drop(pk, sk)
+                    else:
+                        self._store(old)
+                self._charge("transact_write_items", kwargs, {}, write=write)
+                raise DynamoDBError(
+                    "TransactionCanceledException",
+                    "Transaction cancelled, please refer cancellation reasons for specific reasons",
+                    CancellationReasons=reasons,
+                )
+            if token is not None:
+                self._tokens[token] = True
+        resp: Dict[str, Any] = {}
+        self._charge("transact_write_items", kwargs, resp, write=write)
+        return resp
+
+    # -- inspection
+    def items(self) -> List[Dict[str, Any]]:
+        """Every stored item, in key order (a copy)."""
+        with self._lock:
+            out = []
+            for pk in sorted(self._partitions, key=str):
+                keys, items = self._partitions[pk]
+                out.extend(copy.deepcopy(items[sk]) for sk in keys)
+            return out
+
+    def reset_consumed(self) -> None:
+        self.consumed = {"rcu": 0.0, "wcu": 0.0}
+        self.calls = {}
@@ -0,0 +1,47 @@
+"""
+In-process per-route request metrics, keyed by route name (see `app.router.ROUTES`).
+
+Counters live for the lifetime of the (warm) Lambda container, like the DynamoDB pool, and
+are cheap enough to record on every request.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict
+
+_lock = threading.Lock()
+_routes: Dict[str, Dict[str, float]] = {}
+
+
+def _empty() -> Dict[str, float]:
+    return {"count": 0, "clientErrors": 0, "serverErrors": 0, "totalMs": 0.0, "maxMs": 0.0}
+
+
+def record(route: str, status: int, duration_ms: float) -> None:
+    with _lock:
+        m = _routes.get(route)
+        if m is None:
+            m = _routes[route] = _empty()
+        m["count"] += 1
+        if status >= 500:
+            m["serverErrors"] += 1
+        elif status >= 400:
+            m["clientErrors"] += 1
+        m["totalMs"] += duration_ms
+        if duration_ms > m["maxMs"]:
+            m["maxMs"] = duration_ms
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Copy of every route's counters, plus `avgMs`."""
+    with _lock:
+        out = {name: dict(m) for name, m in _routes.items()}
+    for m in out.values():
+        m["avgMs"] = m["totalMs"] / m["count"] if m["count"] else 0.0
+    return out
+
+
+def reset() -> None:
+    with _lock:
+        _routes.clear()
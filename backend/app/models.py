@@ -49,6 +49,11 @@ class GoalKind(str, Enum):
     MONEY_SAVED_CENTS = "MONEY_SAVED_CENTS"
     BOOKS_FINISHED = "BOOKS_FINISHED"
 
+    @property
+    def stat_field(self) -> str:
+        """The `STATS#<year>` counter that measures progress towards this kind of goal."""
+        return _GOAL_KIND_STAT_FIELDS[self]
+
     @classmethod
     def from_any(cls, value: Any) -> Optional["GoalKind"]:
         if value is None:
@@ -62,3 +67,10 @@ class GoalKind(str, Enum):
         except Exception:
             return None
 
+
+_GOAL_KIND_STAT_FIELDS = {
+    GoalKind.BJJ_SESSIONS: "bjjCount",
+    GoalKind.PILATES_SESSIONS: "pilatesCount",
+    GoalKind.MONEY_SAVED_CENTS: "savedCentsTotal",
+    GoalKind.BOOKS_FINISHED: "readBooksTotal",
+}
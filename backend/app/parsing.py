@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 def parse_json_body(event: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
@@ -48,3 +48,25 @@ def parse_year(value: Optional[str]) -> Optional[int]:
     except Exception:
         return None
 
+
+def parse_fields(value: Optional[str], allowed: Any) -> Tuple[Optional[List[str]], Optional[str]]:
+    """
+    Parse a `?fields=a,b` sparse-fieldset parameter. Returns (None, None) when absent,
+    meaning "all fields".
+    """
+    if value is None or not value.strip():
+        return None, None
+    fields = []
+    for f in value.split(","):
+        f = f.strip()
+        if f and f not in fields:
+            fields.append(f)
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        return None, f"unknown fields: {','.join(unknown)} (allowed: {','.join(allowed)})"
+    return fields, None
+
+
+def parse_bool(value: Optional[str]) -> bool:
+    """Query-string flag: `1`, `true` or `yes` (any case) are true; anything else is false."""
+    return (value or "").strip().lower() in ("1", "true", "yes")
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, bursting up to `capacity`.
+    `acquire(n)` blocks until `n` tokens are available. Amounts larger than the capacity are
+    allowed and simply put the bucket in debt, so callers can charge actual usage
+    (e.g. consumed RCU reported after a query) rather than an up-front estimate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._refill()
+            # Wait until the bucket is non-negative, then charge the full amount.
+            if self._tokens < 0:
+                wait = -self._tokens / self.rate
+            elif self._tokens < min(amount, self.capacity):
+                wait = (min(amount, self.capacity) - self._tokens) / self.rate
+            else:
+                wait = 0.0
+            if wait > 0:
+                self._sleep(wait)
+                self._refill()
+            self._tokens -= amount
@@ -1,14 +1,116 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import importlib
+import re
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Pattern, Tuple
 
-from .http import json_response
+from . import metrics, telemetry
+from .config import get_env
+from .http import conditional_response, json_response
 from .parsing import method as get_method
 from .parsing import path as get_path
-from .routes.actions import get_actions, post_action
-from .routes.books import get_books, post_book
-from .routes.goals import delete_goal, get_goals, patch_goal, post_goal
-from .routes.stats import get_stats
+
+
+class Route(NamedTuple):
+    """
+    One API route. `path` may contain `{param}` segments, passed positionally to the handler
+    after the event. `module`/`func` name the handler in `app.routes`, which is imported on
+    first use so a cold start only pays for the route module it serves. `needs` lists the
+    optional keyword arguments the handler takes (`now_iso`, `dispatch`, `remaining_ms`). `cache_env` marks
+    ETag-able GETs and names the env var overriding their Cache-Control.
+    """
+
+    name: str
+    method: str
+    path: str
+    module: str
+    func: str
+    needs: Tuple[str, ...] = ()
+    cache_env: Optional[str] = None
+
+
+ROUTES: Tuple[Route, ...] = (
+    Route("stats.get", "GET", "/stats", "stats", "get_stats", cache_env="CACHE_CONTROL_STATS"),
+    Route("stats.series", "GET", "/stats/series", "stats", "get_stats_series", cache_env="CACHE_CONTROL_STATS"),
+    Route("goals.list", "GET", "/goals", "goals", "get_goals", ("now_iso",), "CACHE_CONTROL_GOALS"),
+    Route("goals.create", "POST", "/goals", "goals", "post_goal", ("now_iso",)),
+    Route("goals.autoComplete", "POST", "/goals:autoComplete", "goals", "post_goals_auto_complete", ("now_iso",)),
+    Route("goals.patch", "PATCH", "/goals/{goalId}", "goals", "patch_goal", ("now_iso",)),
+    Route("goals.delete", "DELETE", "/goals/{goalId}", "goals", "delete_goal"),
+    Route("actions.create", "POST", "/actions", "actions", "post_action", ("now_iso",)),
+    Route("actions.list", "GET", "/actions", "actions", "get_actions", cache_env="CACHE_CONTROL_ACTIONS"),
+    Route("actions.export", "GET", "/actions/export", "actions", "get_actions_export"),
+    Route("actions.bulk", "POST", "/actions:bulk", "actions", "post_actions_bulk", ("now_iso",)),
+    Route("books.list", "GET", "/books", "books", "get_books", cache_env="CACHE_CONTROL_BOOKS"),
+    Route("books.create", "POST", "/books", "books", "post_book", ("now_iso",)),
+    Route("books.bulk", "POST", "/books:bulk", "books", "post_books_bulk", ("now_iso", "remaining_ms")),
+    Route("batch", "POST", "/batch", "batch", "post_batch", ("now_iso", "dispatch", "remaining_ms")),
+)
+
+# The default lets the browser keep a copy but revalidate it (ETag) on every use, so a write
+# is always visible on the next read.
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+_PARAM_RE = re.compile(r"\{(\w+)\}")
+
+# Compiled once at import: literal paths are a dict lookup; parameterized ones are bucketed
+# by their (literal) first segment, so matching cost doesn't grow with the route count.
+_static: Dict[str, Dict[str, Route]] = {}
+_dynamic: Dict[str, List[Tuple[Pattern[str], Dict[str, Route]]]] = {}
+
+
+def _first_segment(path: str) -> str:
+    return path[1:].split("/", 1)[0]
+
+
+def _pattern(path: str) -> Pattern[str]:
+    segments = [r"([^/]+)" if _PARAM_RE.fullmatch(seg) else re.escape(seg) for seg in path[1:].split("/")]
+    return re.compile("^/" + "/".join(segments) + "$")
+
+
+def _compile(routes: Tuple[Route, ...]) -> None:
+    patterns: Dict[str, Tuple[Pattern[str], Dict[str, Route]]] = {}
+    for route in routes:
+        if "{" not in route.path:
+            _static.setdefault(route.path, {})[route.method] = route
+            continue
+        if route.path not in patterns:
+            patterns[route.path] = (_pattern(route.path), {})
+            _dynamic.setdefault(_first_segment(route.path), []).append(patterns[route.path])
+        patterns[route.path][1][route.method] = route
+
+
+_compile(ROUTES)
+
+
+def match(method: str, path: str) -> Tuple[Optional[Route], Tuple[str, ...], List[str]]:
+    """
+    Resolve a request to `(route, path_params, allowed_methods)`. `route` is None when nothing
+    matches; `allowed_methods` is then non-empty if the path exists under other methods.
+    HEAD falls back to the GET route.
+    """
+    path = path.rstrip("/") or "/"
+    methods = _static.get(path)
+    params: Tuple[str, ...] = ()
+    if methods is None:
+        for regex, candidates in _dynamic.get(_first_segment(path), ()):
+            m = regex.match(path)
+            if m:
+                methods, params = candidates, m.groups()
+                break
+    if methods is None:
+        return None, (), []
+    route = methods.get(method) or (methods.get("GET") if method == "HEAD" else None)
+    if route is None:
+        allowed = sorted(methods) + (["HEAD"] if "GET" in methods else []) + ["OPTIONS"]
+        return None, (), allowed
+    return route, params, []
+
+
+def _handler(route: Route) -> Callable[..., Dict[str, Any]]:
+    # `importlib` returns the cached module after the first call.
+    return getattr(importlib.import_module(f"{__package__}.routes.{route.module}"), route.func)
 
 
 def dispatch(
@@ -17,32 +119,45 @@ def dispatch(
     origin: str,
     table: Any,
     now_iso: Any,
+    remaining_ms: Optional[Callable[[], int]] = None,
 ) -> Dict[str, Any]:
+    """
+    Route `event` to its handler. `remaining_ms` (the Lambda context's
+    `get_remaining_time_in_millis`) lets long-running routes stop before the function times out.
+    """
     m = get_method(event)
-    p = get_path(event)
-
-    if m == "GET" and p == "/stats":
-        return get_stats(event, origin=origin, table=table)
-    if m == "GET" and p == "/goals":
-        return get_goals(event, origin=origin, table=table)
-    if m == "POST" and p == "/goals":
-        return post_goal(event, origin=origin, table=table, now_iso=now_iso)
-    if m == "PATCH" and p.startswith("/goals/"):
-        goal_id = p.split("/goals/", 1)[1].strip("/")
-        return patch_goal(event, goal_id, origin=origin, table=table, now_iso=now_iso)
-    if m == "DELETE" and p.startswith("/goals/"):
-        goal_id = p.split("/goals/", 1)[1].strip("/")
-        return delete_goal(event, goal_id, origin=origin, table=table)
-
-    if m == "POST" and p == "/actions":
-        return post_action(event, origin=origin, table=table, now_iso=now_iso)
-    if m == "GET" and p == "/actions":
-        return get_actions(event, origin=origin, table=table)
-
-    if m == "GET" and p == "/books":
-        return get_books(event, origin=origin, table=table)
-    if m == "POST" and p == "/books":
-        return post_book(event, origin=origin, table=table, now_iso=now_iso)
-
-    return json_response(404, {"error": "not_found"}, origin=origin)
+    route, params, allowed = match(m, get_path(event))
+    if route is None:
+        if allowed:
+            resp = json_response(405, {"error": "method_not_allowed"}, origin=origin)
+            resp["headers"]["allow"] = ",".join(allowed)
+            metrics.record("method_not_allowed", 405, 0.0)
+            return resp
+        metrics.record("not_found", 404, 0.0)
+        return json_response(404, {"error": "not_found"}, origin=origin)
+
+    kwargs: Dict[str, Any] = {"origin": origin, "table": table}
+    if "now_iso" in route.needs:
+        kwargs["now_iso"] = now_iso
+    if "dispatch" in route.needs:
+        kwargs["dispatch"] = dispatch
+    if "remaining_ms" in route.needs:
+        kwargs["remaining_ms"] = remaining_ms
+
+    telemetry.set_route(route.name)
+    started = time.perf_counter()
+    status = 500
+    try:
+        with telemetry.span("route"):
+            resp = _handler(route)(event, *params, **kwargs)
+        if route.cache_env is not None:
+            resp = conditional_response(event, resp, cache_control=get_env(route.cache_env, DEFAULT_CACHE_CONTROL))
+        status = int(resp.get("statusCode") or 200)
+    finally:
+        metrics.record(route.name, status, (time.perf_counter() - started) * 1000)
 
+    if m == "HEAD":
+        # Same status and headers as GET, no body.
+        resp = {k: v for k, v in resp.items() if k != "isBase64Encoded"}
+        resp["body"] = ""
+    return resp
@@ -1,164 +1,313 @@
 from __future__ import annotations
 
+import hashlib
 import uuid
-from typing import Any, Dict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
-from ..http import json_response
-from ..keys import action_sk, book_sk, pk, stats_sk
+from .. import telemetry
+from ..config import get_env
+from ..cursor import decode_cursor, encode_cursor
+from ..counters import action_increments, add_increments, bucket_sks, stats_update
+from ..db import batch_get_items, batch_write_items, projection, transact_write, transaction_condition_failed, write_all
+from ..export import EXPORT_FORMATS, LAMBDA_RESPONSE_LIMIT, export_actions, read_capped
+from ..http import bytes_response, json_response
+from ..keys import action_sk, book_sk, bulk_stats_sk, pk, stats_sk
+from ..bookcache import book_upsert_update, lookup_book
 from ..booklib import google_books_lookup, normalize_isbn
 from ..models import ActionType
-from ..parsing import parse_json_body, parse_year, querystring
+from ..parsing import parse_bool, parse_fields, parse_json_body, parse_year, querystring
+from ..timeutil import parse_iso
 
+# GET /actions response field -> stored attributes needed to produce it. The book fields
+# also need the reference attributes used by the BOOK# join.
+ACTION_FIELD_ATTRS = {
+    "year": ("year",),
+    "type": ("type",),
+    "ts": ("ts",),
+    "amountCents": ("amountCents",),
+    "isbn": ("isbn",),
+    "bookSk": ("bookSk", "isbn"),
+    "bookTitle": ("bookTitle", "type", "isbn", "bookSk"),
+    "bookAuthors": ("bookAuthors", "bookTitle", "type", "isbn", "bookSk"),
+    "note": ("note",),
+}
 
-def post_action(
-    event: Dict[str, Any],
-    *,
-    origin: str,
-    table: Any,
-    now_iso: Any,
-) -> Dict[str, Any]:
-    data, err = parse_json_body(event)
-    if err:
-        return json_response(400, {"error": err}, origin=origin)
 
+MAX_BULK_ACTIONS = 5000
+# Largest encoded export body; the rest of Lambda's response limit is left for the envelope.
+EXPORT_MAX_BYTES = LAMBDA_RESPONSE_LIMIT - 256 * 1024
+# POST /actions:bulk commits actions in groups: a group's ACTION items are written, then its
+# STATS increments applied, before the next group starts.
+BULK_COMMIT_ACTIONS = 500
+# Stats rows per transaction: TransactWriteItems takes 100 items, one of them the group's marker.
+BULK_STATS_PER_TRANSACTION = 99
+# How long `BULKSTATS#` markers are kept (DynamoDB TTL): the window for resending a failed import.
+BULK_MARKER_TTL = timedelta(days=7)
+
+
+def _parse_action(
+    data: Dict[str, Any], *, now_iso: Any, require_ts: bool = False
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate one action payload; returns its normalized fields or an error message."""
     year = parse_year(str(data.get("year")) if data.get("year") is not None else None)
     if year is None:
-        return json_response(400, {"error": "year is required"}, origin=origin)
+        return None, "year is required"
 
     action_type = ActionType.from_any(data.get("type"))
     if action_type is None:
-        return json_response(400, {"error": "type must be BJJ|PILATES|SAVE|READ"}, origin=origin)
+        return None, "type must be BJJ|PILATES|SAVE|READ"
 
-    ts = str(data.get("ts") or "").strip() or now_iso()
     # Keep ts in ISO format; if user sends something else we still store it, but it impacts sorting.
-    action_id = uuid.uuid4().hex
+    ts = str(data.get("ts") or "").strip()
+    if not ts and require_ts:
+        return None, "ts is required"
+    if not ts:
+        ts = _default_ts(year, now_iso())
+    else:
+        dt = parse_iso(ts)
+        if dt is not None and dt.year != year:
+            return None, f"ts must fall within year {year}"
+    action: Dict[str, Any] = {"year": year, "type": action_type, "ts": ts}
 
-    item: Dict[str, Any] = {
-        "pk": pk(),
-        "sk": action_sk(year, ts, action_id),
-        "year": year,
-        "ts": ts,
-        "type": action_type.value,
-        "createdAt": now_iso(),
-    }
-
-    # Stats increments
-    inc_expr = ["updatedAt = :u"]
-    inc_vals: Dict[str, Any] = {":u": now_iso()}
-    inc_names: Dict[str, str] = {}
-    add_parts = []
-
-    if action_type == ActionType.BJJ:
-        add_parts.append("#bjjCount :b")
-        inc_names["#bjjCount"] = "bjjCount"
-        inc_vals[":b"] = 1
-    elif action_type == ActionType.PILATES:
-        add_parts.append("#pilatesCount :p")
-        inc_names["#pilatesCount"] = "pilatesCount"
-        inc_vals[":p"] = 1
-    elif action_type == ActionType.SAVE:
+    if action_type == ActionType.SAVE:
         amount_cents = data.get("amountCents")
         if not isinstance(amount_cents, int):
-            return json_response(400, {"error": "SAVE requires integer amountCents"}, origin=origin)
-        item["amountCents"] = amount_cents
-        add_parts.append("#savedCentsTotal :s")
-        inc_names["#savedCentsTotal"] = "savedCentsTotal"
-        inc_vals[":s"] = amount_cents
+            return None, "SAVE requires integer amountCents"
+        action["amountCents"] = amount_cents
     elif action_type == ActionType.READ:
         isbn = normalize_isbn(data.get("isbn"))
         if isbn is None:
-            return json_response(400, {"error": "READ requires valid isbn (ISBN-10 or ISBN-13)"}, origin=origin)
+            return None, "READ requires valid isbn (ISBN-10 or ISBN-13)"
+        action["isbn"] = isbn
 
+    note = data.get("note")
+    if note:
+        action["note"] = str(note)
+    return action, None
+
+
+def _default_ts(year: int, now: str) -> str:
+    """`now`, clamped into `year` when logging for another year (e.g. a late entry for last year)."""
+    dt = parse_iso(now)
+    if dt is None or dt.year == year:
+        return now
+    if dt.year > year:
+        return datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc).isoformat()
+    return datetime(year, 1, 1, tzinfo=timezone.utc).isoformat()
+
+
+def _action_item(action: Dict[str, Any], action_id: str, *, created_at: str) -> Dict[str, Any]:
+    year = action["year"]
+    item: Dict[str, Any] = {
+        "pk": pk(),
+        "sk": action_sk(year, action["ts"], action_id),
+        "year": year,
+        "ts": action["ts"],
+        "type": action["type"].value,
+        "createdAt": created_at,
+    }
+    if "amountCents" in action:
+        item["amountCents"] = action["amountCents"]
+    if "isbn" in action:
+        item["isbn"] = action["isbn"]
+        # Prefer referencing the persistent BOOK# item over duplicating book metadata on each action.
+        item["bookSk"] = book_sk(action["isbn"])
+    if "note" in action:
+        item["note"] = action["note"]
+    return item
+
+
+def _increments(action: Dict[str, Any]) -> Dict[str, int]:
+    return action_increments(action["type"], amount_cents=action.get("amountCents", 0))
+
+
+def post_action(
+    event: Dict[str, Any],
+    *,
+    origin: str,
+    table: Any,
+    now_iso: Any,
+) -> Dict[str, Any]:
+    data, err = parse_json_body(event)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
+
+    action, err = _parse_action(data, now_iso=now_iso)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
+
+    action_id = uuid.uuid4().hex
+    year = action["year"]
+    # All writes for this action go out together (see `db.write_all`).
+    writes = []
+
+    if action["type"] == ActionType.READ:
+        isbn = action["isbn"]
         try:
-            meta = google_books_lookup(isbn)
+            meta, fetched = lookup_book(table, isbn, now_iso=now_iso, fetch=google_books_lookup)
         except Exception:
             return json_response(502, {"error": "google_books_lookup_failed"}, origin=origin)
         if meta is None:
             return json_response(404, {"error": "book_not_found_for_isbn"}, origin=origin)
 
-        item["isbn"] = isbn
-        # Prefer referencing the persistent BOOK# item over duplicating book metadata on each action.
-        item["bookSk"] = book_sk(isbn)
-
-        # Upsert a persistent "library" record (deduped by ISBN).
-        now = now_iso()
-        authors = meta.get("authors") or []
-        if not isinstance(authors, list):
-            authors = []
-        authors = [str(a) for a in authors if str(a).strip()]
-
-        expr_parts = [
-            "updatedAt = :u",
-            "createdAt = if_not_exists(createdAt, :c)",
-            "isbn = :isbn",
-            "authors = :a",
-            "googleFetchedAt = :gf",
-        ]
-        expr_vals: Dict[str, Any] = {":u": now, ":c": now, ":isbn": isbn, ":a": authors, ":gf": now}
-
-        if meta.get("title") is not None:
-            expr_parts.append("title = :t")
-            expr_vals[":t"] = str(meta.get("title"))
-        if meta.get("publishedDate") is not None:
-            expr_parts.append("publishedDate = :pd")
-            expr_vals[":pd"] = str(meta.get("publishedDate"))
-        if meta.get("pageCount") is not None:
-            expr_parts.append("pageCount = :pc")
-            expr_vals[":pc"] = meta.get("pageCount")
-        if meta.get("categories") is not None:
-            expr_parts.append("categories = :cat")
-            expr_vals[":cat"] = meta.get("categories") or []
-        if meta.get("thumbnail") is not None:
-            expr_parts.append("thumbnail = :th")
-            expr_vals[":th"] = str(meta.get("thumbnail"))
-        if meta.get("googleVolumeId") is not None:
-            expr_parts.append("googleVolumeId = :gvid")
-            expr_vals[":gvid"] = str(meta.get("googleVolumeId"))
-        # Always persist the full Google `volumeInfo` payload when available.
-        volume_info = meta.get("googleVolumeInfo")
-        if isinstance(volume_info, dict) and volume_info:
-            expr_parts.append("googleVolumeInfo = :gvi")
-            expr_vals[":gvi"] = volume_info
-
-        table.update_item(
-            Key={"pk": pk(), "sk": book_sk(isbn)},
-            UpdateExpression="SET " + ", ".join(expr_parts),
-            ExpressionAttributeValues=expr_vals,
-        )
-
-        add_parts.append("#readBooksTotal :rb")
-        add_parts.append("#readCount :rc")
-        inc_names["#readBooksTotal"] = "readBooksTotal"
-        inc_names["#readCount"] = "readCount"
-        inc_vals[":rb"] = 1
-        inc_vals[":rc"] = 1
+        # Upsert a persistent "library" record (deduped by ISBN) only when the metadata was
+        # (re)fetched; a cache hit means the BOOK item is already current.
+        if fetched:
+            writes.append({"Update": book_upsert_update(isbn, meta, now=now_iso())})
 
-    note = data.get("note")
-    if note:
-        item["note"] = str(note)
+    writes.append({"Put": {"Item": _action_item(action, action_id, created_at=now_iso())}})
+    # Upsert the yearly stats row and the month/week buckets with atomic increments.
+    increments = _increments(action)
+    for sk in [stats_sk(year)] + bucket_sks(action["year"], action["ts"]):
+        writes.append({"Update": stats_update(sk, increments, now=now_iso())})
 
-    table.put_item(Item=item)
+    # One TransactWriteItems call, so stats can't drift from actions; the action id doubles
+    # as the idempotency token for SDK retries.
+    write_all(table, writes, token=action_id)
 
-    # Upsert stats row with atomic increments.
-    update_expr = "SET " + ", ".join(inc_expr)
-    if add_parts:
-        update_expr += " ADD " + ", ".join(add_parts)
+    return json_response(
+        201,
+        {"action": {"year": year, "type": action["type"].value, "ts": action["ts"], "id": action_id}},
+        origin=origin,
+    )
 
-    update_kwargs: Dict[str, Any] = {
-        "Key": {"pk": pk(), "sk": stats_sk(year)},
-        "UpdateExpression": update_expr,
-        "ExpressionAttributeValues": inc_vals,
-    }
-    if inc_names:
-        update_kwargs["ExpressionAttributeNames"] = inc_names
-    table.update_item(**update_kwargs)
 
-    return json_response(201, {"action": {"year": year, "type": action_type.value, "ts": ts, "id": action_id}}, origin=origin)
+def post_actions_bulk(
+    event: Dict[str, Any],
+    *,
+    origin: str,
+    table: Any,
+    now_iso: Any,
+) -> Dict[str, Any]:
+    """
+    Import many actions at once (e.g. backfilling history).
+    Body: `{"actions": [<POST /actions body>, ...], "requestId": "...", "resumeFrom": 0}`.
 
+    Every action is validated with the `POST /actions` rules before anything is written; `ts` is
+    required, since it is part of the item key. Actions are committed in groups of
+    `BULK_COMMIT_ACTIONS`: ACTION items go out through `BatchWriteItem`, then the group's STATS
+    increments are applied (see `_apply_group_stats`). Action ids derive from `requestId`
+    (generated if absent) and the action's index, so when a group fails, sending the same body
+    again with the returned `requestId` and `resumeFrom` rewrites the group's items instead of
+    duplicating them, and counts its stats only if they weren't applied yet.
+    """
+    data, err = parse_json_body(event)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
 
-def get_actions(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, Any]:
-    from boto3.dynamodb.conditions import Key  # type: ignore
+    raw_actions = data.get("actions")
+    if not isinstance(raw_actions, list) or not raw_actions:
+        return json_response(400, {"error": "actions must be a non-empty list"}, origin=origin)
+    if len(raw_actions) > MAX_BULK_ACTIONS:
+        return json_response(400, {"error": f"at most {MAX_BULK_ACTIONS} actions per request"}, origin=origin)
+    request_id = data.get("requestId") or uuid.uuid4().hex
+    if not isinstance(request_id, str) or len(request_id) > 128:
+        return json_response(400, {"error": "requestId must be a string of at most 128 characters"}, origin=origin)
+    resume_from = data.get("resumeFrom")
+    if resume_from is None:
+        resume_from = 0
+    if isinstance(resume_from, bool) or not isinstance(resume_from, int) or not 0 <= resume_from <= len(raw_actions):
+        return json_response(400, {"error": "resumeFrom must be an index into actions"}, origin=origin)
 
+    actions = []
+    errors = []
+    for i, raw in enumerate(raw_actions):
+        if isinstance(raw, dict):
+            action, action_err = _parse_action(raw, now_iso=now_iso, require_ts=True)
+        else:
+            action, action_err = None, "must be an object"
+        if action_err:
+            errors.append({"index": i, "error": action_err})
+        else:
+            actions.append(action)
+    if errors:
+        return json_response(400, {"error": "invalid actions", "errors": errors}, origin=origin)
+
+    # READ actions: resolve each distinct ISBN once through the metadata cache.
+    isbns = {a["isbn"] for a in actions if a["type"] == ActionType.READ}
+    for isbn in sorted(isbns):
+        try:
+            meta, fetched = lookup_book(table, isbn, now_iso=now_iso, fetch=google_books_lookup)
+        except Exception:
+            return json_response(502, {"error": "google_books_lookup_failed", "isbn": isbn}, origin=origin)
+        if meta is None:
+            return json_response(404, {"error": "book_not_found_for_isbn", "isbn": isbn}, origin=origin)
+        if fetched:
+            table.update_item(**book_upsert_update(isbn, meta, now=now_iso()))
+
+    created_at = now_iso()
+    imported = 0
+    totals: Dict[int, Dict[str, int]] = {}
+
+    def body(**extra: Any) -> Dict[str, Any]:
+        stats = {str(y): inc for y, inc in sorted(totals.items())}
+        return {"imported": imported, "stats": stats, "requestId": request_id, **extra}
+
+    for start in range(resume_from, len(actions), BULK_COMMIT_ACTIONS):
+        group = range(start, min(start + BULK_COMMIT_ACTIONS, len(actions)))
+        items = []
+        per_year: Dict[int, Dict[str, int]] = {}
+        rows: Dict[str, Dict[str, int]] = {}
+        for i in group:
+            action = actions[i]
+            items.append(_action_item(action, _bulk_action_id(request_id, i), created_at=created_at))
+            increments = _increments(action)
+            add_increments(per_year.setdefault(action["year"], {}), increments)
+            for sk in [stats_sk(action["year"])] + bucket_sks(action["year"], action["ts"]):
+                add_increments(rows.setdefault(sk, {}), increments)
+
+        try:
+            batch_write_items(table, items)
+        except Exception:
+            # Part of the group may have landed, without its stats: resuming rewrites it all.
+            return json_response(500, body(error="bulk_write_failed", resumeFrom=start), origin=origin)
+        # Counters are applied once the group's actions have landed (BatchWriteItem is not
+        # transactional).
+        try:
+            _apply_group_stats(table, request_id, start, rows, now=now_iso())
+        except Exception:
+            # The actions are stored; resuming rewrites them unchanged and applies only the stats
+            # transactions that didn't commit.
+            return json_response(500, body(error="stats_update_failed", resumeFrom=start), origin=origin)
+        imported += len(items)
+        for year, increments in per_year.items():
+            add_increments(totals.setdefault(year, {}), increments)
+
+    return json_response(201, body(), origin=origin)
+
+
+def _apply_group_stats(
+    table: Any, request_id: str, start: int, rows: Dict[str, Dict[str, int]], *, now: str
+) -> None:
+    """
+    Apply a bulk group's STATS increments (stats sk -> increments; one ADD per row, however many
+    actions fed it) at most once. Rows go out in transactions that also put a `BULKSTATS#` marker
+    conditioned on not existing yet: each transaction lands whole, and resending an already
+    counted group is cancelled by its marker instead of counting twice.
+    """
+    sks = sorted(rows)
+    created = parse_iso(now)
+    for part, offset in enumerate(range(0, len(sks), BULK_STATS_PER_TRANSACTION)):
+        marker: Dict[str, Any] = {"pk": pk(), "sk": bulk_stats_sk(request_id, start, part), "createdAt": now}
+        if created is not None:
+            marker["expiresAt"] = int((created + BULK_MARKER_TTL).timestamp())
+        ops = [{"Put": {"Item": marker, "ConditionExpression": "attribute_not_exists(sk)"}}]
+        chunk = sks[offset : offset + BULK_STATS_PER_TRANSACTION]
+        ops += [{"Update": stats_update(sk, rows[sk], now=now)} for sk in chunk]
+        try:
+            transact_write(table, ops)
+        except Exception as exc:
+            if not transaction_condition_failed(exc, 0):
+                raise
+
+
+def _bulk_action_id(request_id: str, index: int) -> str:
+    # Same shape as the uuid4 hex ids of single actions.
+    return hashlib.sha256(f"{request_id}#{index}".encode("utf-8")).hexdigest()[:32]
+
+
+def get_actions(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, Any]:
     qs = querystring(event)
     year = parse_year(qs.get("year"))
     if year is None:
@@ -171,46 +320,107 @@ def get_actions(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str,
         limit = max(1, min(200, limit))
     except Exception:
         return json_response(400, {"error": "limit must be an integer"}, origin=origin)
+    fields, err = parse_fields(qs.get("fields"), ACTION_FIELD_ATTRS)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
 
-    resp = table.query(
-        KeyConditionExpression=Key("pk").eq(pk()) & Key("sk").begins_with(f"ACTION#{year}#"),
-        ScanIndexForward=False,
-        Limit=limit,
-    )
+    attrs: Dict[str, None] = {}
+    for f in fields or ACTION_FIELD_ATTRS:
+        attrs.update(dict.fromkeys(ACTION_FIELD_ATTRS[f]))
+    if action_type_filter:
+        attrs["type"] = None
+    query_kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": "pk = :pk AND begins_with(sk, :prefix)",
+        "ExpressionAttributeValues": {":pk": pk(), ":prefix": f"ACTION#{year}#"},
+        "ScanIndexForward": False,
+        "Limit": limit,
+        **projection(list(attrs)),
+    }
+    cursor_scope = f"actions:{year}"
+    if qs.get("cursor"):
+        start_key = decode_cursor(qs["cursor"], scope=cursor_scope)
+        if start_key is None:
+            return json_response(400, {"error": "invalid cursor"}, origin=origin)
+        query_kwargs["ExclusiveStartKey"] = start_key
+
+    resp = table.query(**query_kwargs)
     items = resp.get("Items") or []
+    if action_type_filter:
+        items = [it for it in items if it.get("type") == action_type_filter]
+
+    # Back-compat: older actions stored duplicated book fields; newer actions store only references.
+    # Resolve every referenced BOOK item in one batched read instead of a GetItem per ISBN.
+    wants_book = fields is None or "bookTitle" in fields or "bookAuthors" in fields
+    book_keys: Dict[str, None] = {}
+    for it in items if wants_book else []:
+        if it.get("type") == ActionType.READ.value and it.get("isbn") and it.get("bookTitle") is None:
+            book_keys[it.get("bookSk") or book_sk(str(it.get("isbn")))] = None
+    books_by_sk: Dict[str, Dict[str, Any]] = {}
+    if book_keys:
+        try:
+            found = batch_get_items(
+                table, [{"pk": pk(), "sk": sk} for sk in book_keys], attrs=["sk", "title", "authors"]
+            )
+            books_by_sk = {str(b.get("sk")): b for b in found}
+        except Exception as exc:
+            # The page is still served, without book titles/authors where they weren't denormalized.
+            telemetry.error("bookJoin", exc)
+            books_by_sk = {}
+
     actions = []
-    book_cache: Dict[str, Dict[str, Any]] = {}
     for it in items:
-        if action_type_filter and it.get("type") != action_type_filter:
-            continue
         isbn = it.get("isbn")
         book_title = it.get("bookTitle")
-        book_authors = it.get("bookAuthors") or []
-
-        # Back-compat: older actions stored duplicated book fields; newer actions store only references.
-        if it.get("type") == ActionType.READ.value and isbn and (book_title is None or book_authors is None):
-            if isbn not in book_cache:
-                try:
-                    res = table.get_item(Key={"pk": pk(), "sk": book_sk(str(isbn))})
-                    b = res.get("Item") or {}
-                    book_cache[isbn] = {"title": b.get("title"), "authors": b.get("authors") or []}
-                except Exception:
-                    book_cache[isbn] = {"title": None, "authors": []}
-            book_title = book_title if book_title is not None else book_cache[isbn].get("title")
+        book_authors = it.get("bookAuthors")
+        if it.get("type") == ActionType.READ.value and isbn and book_title is None:
+            book = books_by_sk.get(it.get("bookSk") or book_sk(str(isbn))) or {}
+            book_title = book.get("title")
             if book_authors is None:
-                book_authors = book_cache[isbn].get("authors") or []
-        actions.append(
-            {
-                "year": int(it.get("year", year)),
-                "type": it.get("type"),
-                "ts": it.get("ts"),
-                "amountCents": it.get("amountCents"),
-                "isbn": isbn,
-                "bookSk": it.get("bookSk") or (book_sk(str(isbn)) if isbn else None),
-                "bookTitle": book_title,
-                "bookAuthors": book_authors or [],
-                "note": it.get("note"),
-            }
-        )
-    return json_response(200, {"actions": actions}, origin=origin)
+                book_authors = book.get("authors") or []
+        action = {
+            "year": int(it.get("year", year)),
+            "type": it.get("type"),
+            "ts": it.get("ts"),
+            "amountCents": it.get("amountCents"),
+            "isbn": isbn,
+            "bookSk": it.get("bookSk") or (book_sk(str(isbn)) if isbn else None),
+            "bookTitle": book_title,
+            "bookAuthors": book_authors or [],
+            "note": it.get("note"),
+        }
+        actions.append({f: action[f] for f in fields} if fields else action)
+    next_cursor = encode_cursor(resp.get("LastEvaluatedKey"), scope=cursor_scope)
+    return json_response(200, {"actions": actions, "nextCursor": next_cursor}, origin=origin)
+
+
+def get_actions_export(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, Any]:
+    """
+    Export every action of a year: `?year=2026&format=ndjson|csv[&gzip=1]`.
+    Rows are paged from DynamoDB and encoded incrementally (see `app.export`). `gzip=1`
+    downloads a `.gz` file; an export too large for a Lambda response is a 413.
+    """
+    qs = querystring(event)
+    year = parse_year(qs.get("year"))
+    if year is None:
+        return json_response(400, {"error": "year is required (e.g. ?year=2026)"}, origin=origin)
+    fmt = (qs.get("format") or "ndjson").strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        return json_response(400, {"error": "format must be ndjson|csv"}, origin=origin)
+    gzip = parse_bool(qs.get("gzip"))
+
+    limit = int(get_env("EXPORT_MAX_BYTES", str(EXPORT_MAX_BYTES)))
+    body = read_capped(export_actions(table, year, fmt, gzip=gzip) or [], limit=limit, binary=gzip)
+    if body is None:
+        hint = "" if gzip else "; retry with gzip=1"
+        return json_response(413, {"error": f"export exceeds the {limit}-byte response limit{hint}"}, origin=origin)
 
+    # A gzip export is a `.gz` file, not a transfer encoding: clients save it as-is.
+    filename = f"actions-{year}.{fmt}.gz" if gzip else f"actions-{year}.{fmt}"
+    return bytes_response(
+        200,
+        body,
+        origin=origin,
+        content_type="application/gzip" if gzip else EXPORT_FORMATS[fmt],
+        headers={"content-disposition": f'attachment; filename="{filename}"'},
+        binary=gzip,
+    )
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from ..http import json_response
+from ..parsing import parse_json_body
+from ..router import match
+
+MAX_BATCH_REQUESTS = 10
+_ALLOWED_METHODS = {"GET", "POST", "PATCH", "DELETE"}
+
+# Worker threads are kept across warm invocations, like the DynamoDB connection pool.
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_BATCH_REQUESTS, thread_name_prefix="batch")
+    return _executor
+
+
+def _sub_event(parent: Dict[str, Any], req: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    if not isinstance(req, dict):
+        return None, "each request must be an object"
+    method = str(req.get("method") or "GET").strip().upper()
+    if method not in _ALLOWED_METHODS:
+        return None, "method must be GET|POST|PATCH|DELETE"
+    raw_path = str(req.get("path") or "")
+    if not raw_path.startswith("/"):
+        return None, "path must start with /"
+    split = urlsplit(raw_path)
+    # Resolve the path the way dispatch will (e.g. "/batch/"): a nested batch would wait on
+    # workers of the pool it occupies.
+    route, _, _ = match(method, split.path)
+    if route is not None and route.func == "post_batch":
+        return None, "nested /batch is not allowed"
+
+    query: Dict[str, str] = dict(parse_qsl(split.query))
+    extra_query = req.get("query") or {}
+    if not isinstance(extra_query, dict):
+        return None, "query must be an object"
+    query.update({str(k): str(v) for k, v in extra_query.items() if v is not None})
+
+    body = req.get("body")
+    if body is not None and not isinstance(body, dict):
+        return None, "body must be an object"
+
+    # Sub-requests inherit the (already authorized) caller's headers, except the conditional
+    # one: the batch's own If-None-Match says nothing about its parts.
+    headers = {k: v for k, v in (parent.get("headers") or {}).items() if k.lower() != "if-none-match"}
+    if_none_match = req.get("ifNoneMatch")
+    if if_none_match is not None:
+        if not isinstance(if_none_match, str):
+            return None, "ifNoneMatch must be a string"
+        headers["if-none-match"] = if_none_match
+
+    sub: Dict[str, Any] = {
+        "rawPath": split.path,
+        "requestContext": {"http": {"method": method}},
+        "headers": headers,
+        "queryStringParameters": query or None,
+        "isBase64Encoded": False,
+    }
+    if body is not None:
+        sub["body"] = json.dumps(body)
+    return sub, None
+
+
+def post_batch(
+    event: Dict[str, Any],
+    *,
+    origin: str,
+    table: Any,
+    now_iso: Any,
+    dispatch: Callable[..., Dict[str, Any]],
+    remaining_ms: Optional[Callable[[], int]] = None,
+) -> Dict[str, Any]:
+    """
+    Run several API calls in one invocation.
+    Body: `{"requests": [{"id", "method", "path", "query", "body", "ifNoneMatch"}]}`.
+    Sub-requests run concurrently against the shared table; the response lists
+    `{"id", "status", "body"}` in request order, plus `etag` for cacheable GETs (a matching
+    `ifNoneMatch` yields status 304 and no body). Non-JSON bodies (e.g. exports) are passed
+    through as a string, with the sub-response's `headers` and `isBase64Encoded`.
+    """
+    data, err = parse_json_body(event)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
+
+    reqs = data.get("requests")
+    if not isinstance(reqs, list) or not reqs:
+        return json_response(400, {"error": "requests must be a non-empty list"}, origin=origin)
+    if len(reqs) > MAX_BATCH_REQUESTS:
+        return json_response(400, {"error": f"at most {MAX_BATCH_REQUESTS} requests per batch"}, origin=origin)
+
+    subs: List[Dict[str, Any]] = []
+    for i, req in enumerate(reqs):
+        sub, sub_err = _sub_event(event, req)
+        if sub_err:
+            return json_response(400, {"error": f"requests[{i}]: {sub_err}"}, origin=origin)
+        subs.append(sub)
+
+    def run(sub: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return dispatch(sub, origin=origin, table=table, now_iso=now_iso, remaining_ms=remaining_ms)
+        except Exception as exc:
+            print("Unhandled exception in batch sub-request", {"path": sub.get("rawPath"), "error": repr(exc)})
+            print(traceback.format_exc())
+            return json_response(500, {"error": "internal_server_error"}, origin=origin)
+
+    # Copied contexts carry the request's telemetry into the worker threads.
+    futures = [_get_executor().submit(contextvars.copy_context().run, run, sub) for sub in subs]
+    results = [f.result() for f in futures]
+
+    responses = []
+    for req, res in zip(reqs, results):
+        raw = res.get("body")
+        headers = res.get("headers") or {}
+        entry: Dict[str, Any] = {"id": req.get("id"), "status": res.get("statusCode")}
+        if not raw or str(headers.get("content-type", "")).startswith("application/json"):
+            entry["body"] = json.loads(raw) if raw else None
+        else:
+            entry["body"] = raw
+            entry["headers"] = headers
+            entry["isBase64Encoded"] = bool(res.get("isBase64Encoded"))
+        etag = headers.get("etag")
+        if etag:
+            entry["etag"] = etag
+        responses.append(entry)
+    return json_response(200, {"responses": responses}, origin=origin)
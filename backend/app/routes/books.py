@@ -1,20 +1,45 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from ..http import json_response
+from ..bookcache import book_is_fresh, book_item, book_upsert_update, lookup_book, miss_item, prefetch_books
 from ..booklib import google_books_lookup, normalize_isbn
+from ..config import get_env
+from ..cursor import decode_cursor, encode_cursor
+from ..http import json_response
 from ..keys import book_sk, pk
-from ..parsing import parse_json_body
+from ..db import batch_write_items, projection
+from ..parsing import parse_fields, parse_json_body
 from ..parsing import querystring
+from ..ratelimit import TokenBucket
+
+MAX_BULK_BOOKS = 500
+
+# Response fields of GET /books; each is stored under the same attribute name. The large
+# `googleVolumeInfo` map is never projected.
+BOOK_FIELDS = (
+    "isbn",
+    "title",
+    "authors",
+    "publishedDate",
+    "pageCount",
+    "categories",
+    "thumbnail",
+    "googleVolumeId",
+    "updatedAt",
+    "createdAt",
+)
 
 
 def get_books(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, Any]:
     """
     List known books in the personal library (deduped by ISBN).
+    Pass the returned `nextCursor` back as `?cursor=` to fetch the next page, and
+    `?fields=title,authors` to read and return only those attributes.
     """
-    from boto3.dynamodb.conditions import Key  # type: ignore
-
     qs = querystring(event)
     limit_raw = qs.get("limit")
     try:
@@ -22,32 +47,44 @@ def get_books(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, An
         limit = max(1, min(500, limit))
     except Exception:
         return json_response(400, {"error": "limit must be an integer"}, origin=origin)
+    fields, err = parse_fields(qs.get("fields"), BOOK_FIELDS)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
 
-    resp = table.query(
-        KeyConditionExpression=Key("pk").eq(pk()) & Key("sk").begins_with("BOOK#"),
-        ScanIndexForward=True,
-        Limit=limit,
-    )
+    query_kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": "pk = :pk AND begins_with(sk, :prefix)",
+        "ExpressionAttributeValues": {":pk": pk(), ":prefix": "BOOK#"},
+        "ScanIndexForward": True,
+        "Limit": limit,
+        **projection(fields or BOOK_FIELDS),
+    }
+    if qs.get("cursor"):
+        start_key = decode_cursor(qs["cursor"], scope="books")
+        if start_key is None:
+            return json_response(400, {"error": "invalid cursor"}, origin=origin)
+        query_kwargs["ExclusiveStartKey"] = start_key
+
+    resp = table.query(**query_kwargs)
     items = resp.get("Items") or []
 
     books = []
     for it in items:
-        books.append(
-            {
-                "isbn": it.get("isbn"),
-                "title": it.get("title"),
-                "authors": it.get("authors") or [],
-                "publishedDate": it.get("publishedDate"),
-                "pageCount": it.get("pageCount"),
-                "categories": it.get("categories") or [],
-                "thumbnail": it.get("thumbnail"),
-                "googleVolumeId": it.get("googleVolumeId"),
-                "updatedAt": it.get("updatedAt"),
-                "createdAt": it.get("createdAt"),
-            }
-        )
+        book = {
+            "isbn": it.get("isbn"),
+            "title": it.get("title"),
+            "authors": it.get("authors") or [],
+            "publishedDate": it.get("publishedDate"),
+            "pageCount": it.get("pageCount"),
+            "categories": it.get("categories") or [],
+            "thumbnail": it.get("thumbnail"),
+            "googleVolumeId": it.get("googleVolumeId"),
+            "updatedAt": it.get("updatedAt"),
+            "createdAt": it.get("createdAt"),
+        }
+        books.append({f: book[f] for f in fields} if fields else book)
 
-    return json_response(200, {"books": books}, origin=origin)
+    next_cursor = encode_cursor(resp.get("LastEvaluatedKey"), scope="books")
+    return json_response(200, {"books": books, "nextCursor": next_cursor}, origin=origin)
 
 
 def post_book(
@@ -66,56 +103,22 @@ def post_book(
         return json_response(400, {"error": "isbn is required (ISBN-10 or ISBN-13)"}, origin=origin)
 
     try:
-        meta = google_books_lookup(isbn)
+        meta, fetched = lookup_book(table, isbn, now_iso=now_iso, fetch=google_books_lookup)
     except Exception:
         return json_response(502, {"error": "google_books_lookup_failed"}, origin=origin)
     if meta is None:
         return json_response(404, {"error": "book_not_found_for_isbn"}, origin=origin)
 
     now = now_iso()
-    authors = meta.get("authors") or []
-    if not isinstance(authors, list):
-        authors = []
-    authors = [str(a) for a in authors if str(a).strip()]
-
-    expr_parts = [
-        "updatedAt = :u",
-        "createdAt = if_not_exists(createdAt, :c)",
-        "isbn = :isbn",
-        "authors = :a",
-        "googleFetchedAt = :gf",
-        "inLibrary = :il",
-    ]
-    expr_vals: Dict[str, Any] = {":u": now, ":c": now, ":isbn": isbn, ":a": authors, ":gf": now, ":il": True}
-
-    if meta.get("title") is not None:
-        expr_parts.append("title = :t")
-        expr_vals[":t"] = str(meta.get("title"))
-    if meta.get("publishedDate") is not None:
-        expr_parts.append("publishedDate = :pd")
-        expr_vals[":pd"] = str(meta.get("publishedDate"))
-    if meta.get("pageCount") is not None:
-        expr_parts.append("pageCount = :pc")
-        expr_vals[":pc"] = meta.get("pageCount")
-    if meta.get("categories") is not None:
-        expr_parts.append("categories = :cat")
-        expr_vals[":cat"] = meta.get("categories") or []
-    if meta.get("thumbnail") is not None:
-        expr_parts.append("thumbnail = :th")
-        expr_vals[":th"] = str(meta.get("thumbnail"))
-    if meta.get("googleVolumeId") is not None:
-        expr_parts.append("googleVolumeId = :gvid")
-        expr_vals[":gvid"] = str(meta.get("googleVolumeId"))
-    volume_info = meta.get("googleVolumeInfo")
-    if isinstance(volume_info, dict) and volume_info:
-        expr_parts.append("googleVolumeInfo = :gvi")
-        expr_vals[":gvi"] = volume_info
-
-    table.update_item(
-        Key={"pk": pk(), "sk": book_sk(isbn)},
-        UpdateExpression="SET " + ", ".join(expr_parts),
-        ExpressionAttributeValues=expr_vals,
-    )
+    if fetched:
+        table.update_item(**book_upsert_update(isbn, meta, now=now, in_library=True))
+    elif not meta.get("inLibrary"):
+        # Known from a READ action but not yet added to the library: flag it without refetching.
+        table.update_item(
+            Key={"pk": pk(), "sk": book_sk(isbn)},
+            UpdateExpression="SET updatedAt = :u, inLibrary = :il",
+            ExpressionAttributeValues={":u": now, ":il": True},
+        )
 
     return json_response(
         201,
@@ -124,8 +127,169 @@ def post_book(
                 "isbn": isbn,
                 "sk": book_sk(isbn),
                 "title": meta.get("title"),
-                "authors": authors,
+                "authors": meta.get("authors") or [],
             }
         },
         origin=origin,
     )
+
+
+# Google lookups for bulk imports share one pool and one rate limit per warm container, so
+# concurrent imports can't multiply the request rate Google sees.
+_lookup_lock = threading.Lock()
+_lookup_executor: Optional[ThreadPoolExecutor] = None
+_lookup_bucket: Optional[TokenBucket] = None
+
+
+def _lookup_pool() -> Tuple[ThreadPoolExecutor, TokenBucket]:
+    global _lookup_executor, _lookup_bucket
+    if _lookup_executor is None or _lookup_bucket is None:
+        with _lookup_lock:
+            if _lookup_executor is None or _lookup_bucket is None:
+                _lookup_bucket = TokenBucket(float(get_env("GOOGLE_BOOKS_RATE_PER_SECOND", "5")))
+                workers = int(get_env("BULK_BOOKS_CONCURRENCY", "4"))
+                _lookup_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="books-bulk")
+    return _lookup_executor, _lookup_bucket
+
+
+def _library_item(book: Dict[str, Any], *, now: str) -> Dict[str, Any]:
+    # The stored BOOK item (read whole by `prefetch_books`), added to the library.
+    return {**book, "updatedAt": now, "inLibrary": True}
+
+
+def _bulk_lookup(isbn: str, bucket: TokenBucket, out_of_time: Callable[[], bool]) -> Dict[str, Any]:
+    # Checked before and after waiting for a token: queued lookups past the deadline are skipped.
+    if out_of_time():
+        return {"status": "pending"}
+    bucket.acquire()
+    if out_of_time():
+        return {"status": "pending"}
+    try:
+        return {"status": "fetched", "meta": google_books_lookup(isbn)}
+    except Exception as exc:
+        return {"status": "failed", "error": repr(exc)}
+
+
+def post_books_bulk(
+    event: Dict[str, Any],
+    *,
+    origin: str,
+    table: Any,
+    now_iso: Any,
+    remaining_ms: Optional[Callable[[], int]] = None,
+) -> Dict[str, Any]:
+    """
+    Add many books to the library. Body: `{"isbns": [...]}` (up to `MAX_BULK_BOOKS`).
+
+    ISBNs are normalized and deduplicated, and their cache state is read in one batch. Only the
+    ones without fresh metadata are looked up on Google, concurrently on a bounded pool under a
+    shared rate limit. New and newly added BOOK items (and not-found markers) go out through
+    `BatchWriteItem` 25 at a time as lookups complete, so a timed-out invocation only loses the
+    lookups in flight; a chunk that can't be written marks its ISBNs `failed` (`write_failed`).
+    Lookups that might not finish before the invocation's deadline are not started: they come
+    back as `pending` and are listed in `pending`, to be POSTed again.
+    """
+    data, err = parse_json_body(event)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
+    raw_isbns = data.get("isbns")
+    if not isinstance(raw_isbns, list) or not raw_isbns:
+        return json_response(400, {"error": "isbns must be a non-empty list"}, origin=origin)
+    if len(raw_isbns) > MAX_BULK_BOOKS:
+        return json_response(400, {"error": f"at most {MAX_BULK_BOOKS} isbns per request"}, origin=origin)
+
+    results: List[Dict[str, Any]] = []
+    by_isbn: Dict[str, Dict[str, Any]] = {}
+    for raw in raw_isbns:
+        isbn = normalize_isbn(raw)
+        if isbn is None:
+            results.append({"input": raw, "isbn": None, "status": "invalid"})
+        elif isbn in by_isbn:
+            results.append({"input": raw, "isbn": isbn, "status": "duplicate"})
+        else:
+            by_isbn[isbn] = {"input": raw, "isbn": isbn}
+            results.append(by_isbn[isbn])
+
+    now = now_iso()
+    books, missing = prefetch_books(table, list(by_isbn), now=now)
+    # (isbn, item) pairs not yet written.
+    writes: List[Tuple[str, Dict[str, Any]]] = []
+
+    def flush(*, final: bool = False) -> None:
+        while len(writes) >= 25 or (final and writes):
+            chunk = writes[:25]
+            del writes[:25]
+            try:
+                batch_write_items(table, [item for _, item in chunk])
+            except Exception:
+                # Puts are idempotent: these ISBNs can simply be POSTed again.
+                for isbn, _ in chunk:
+                    by_isbn[isbn].pop("source", None)
+                    by_isbn[isbn].update(status="failed", error="write_failed")
+
+    to_fetch: List[str] = []
+    for isbn, result in by_isbn.items():
+        book = books.get(isbn)
+        if book is not None and book_is_fresh(book, now):
+            result["title"] = book.get("title")
+            if book.get("inLibrary"):
+                result["status"] = "exists"
+                continue
+            # Known from a READ action: flag it without refetching.
+            writes.append((isbn, _library_item(book, now=now)))
+            result.update(status="added", source="cache")
+        elif book is None and isbn in missing:
+            result["status"] = "not_found"
+        else:
+            to_fetch.append(isbn)
+
+    # Cache hits are written while Google is being called.
+    flush()
+
+    from .. import googlebooks
+
+    # A lookup started now may run for the whole Google deadline; time for the last writes and
+    # the response is kept on top of that.
+    reserve_ms = googlebooks.deadline_seconds() * 1000 + int(get_env("BULK_BOOKS_RESERVE_MS", "1000"))
+
+    def out_of_time() -> bool:
+        return remaining_ms is not None and remaining_ms() < reserve_ms
+
+    pool, bucket = _lookup_pool()
+    # Copied contexts carry the request's telemetry (`google` spans) into the workers.
+    futures = {
+        pool.submit(contextvars.copy_context().run, _bulk_lookup, isbn, bucket, out_of_time): isbn for isbn in to_fetch
+    }
+    for future in as_completed(futures):
+        isbn = futures[future]
+        result = by_isbn[isbn]
+        outcome = future.result()
+        meta = outcome.get("meta")
+        if outcome["status"] == "fetched" and meta is not None:
+            stale = books.get(isbn) or {}
+            writes.append((isbn, book_item(isbn, meta, now=now, created_at=stale.get("createdAt"), in_library=True)))
+            result.update(status="added", source="google", title=meta.get("title"))
+        elif outcome["status"] in ("fetched", "failed") and isbn in books:
+            # Google is failing or no longer finds the book: add it with its stale stored metadata,
+            # refreshed by a later lookup.
+            writes.append((isbn, _library_item(books[isbn], now=now)))
+            result.update(status="added", source="stale", title=books[isbn].get("title"))
+        elif outcome["status"] == "fetched":
+            writes.append((isbn, miss_item(isbn, now=now)))
+            result["status"] = "not_found"
+        elif outcome["status"] == "failed":
+            result.update(status="failed", error="google_books_lookup_failed")
+        else:
+            result["status"] = "pending"
+        flush()
+    flush(final=True)
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    pending = [r["isbn"] for r in results if r["status"] == "pending"]
+    return json_response(
+        200,
+        {"results": results, "counts": counts, "pending": pending, "complete": not pending},
+        origin=origin,
+    )
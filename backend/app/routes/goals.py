@@ -1,28 +1,85 @@
 from __future__ import annotations
 
+import math
 import uuid
-from typing import Any, Dict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
 
+from ..db import projection
 from ..http import json_response
-from ..keys import goal_sk, pk
+from ..keys import goal_sk, pk, stats_sk
 from ..models import GoalKind, GoalStatus
-from ..parsing import parse_json_body, parse_year, querystring
+from ..parsing import parse_fields, parse_json_body, parse_year, querystring
+from ..timeutil import parse_iso
 
+# GET /goals response field -> stored attribute (`id` is derived from the sort key).
+GOAL_FIELD_ATTRS = {
+    "id": "sk",
+    "year": "year",
+    "title": "title",
+    "kind": "kind",
+    "status": "status",
+    "target": "target",
+    "createdAt": "createdAt",
+    "updatedAt": "updatedAt",
+}
+# `progress` is derived from the STATS row rather than stored on the goal.
+GOAL_FIELDS = tuple(GOAL_FIELD_ATTRS) + ("progress",)
 
-def get_goals(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, Any]:
-    from boto3.dynamodb.conditions import Key  # type: ignore
 
-    qs = querystring(event)
-    year = parse_year(qs.get("year"))
-    if year is None:
-        return json_response(400, {"error": "year is required (e.g. ?year=2026)"}, origin=origin)
+def goal_progress(goal: Dict[str, Any], stats: Dict[str, Any], *, today: date) -> Optional[Dict[str, Any]]:
+    """
+    Progress of a structured goal against its year's stats row (None for free-text goals):
+    the current value, percent done, what's left, the pace needed per remaining day (today
+    included) and, at the year-to-date average rate, the projected completion date.
+    """
+    kind = GoalKind.from_any(goal.get("kind"))
+    try:
+        target = int(goal.get("target") or 0)
+    except (TypeError, ValueError):
+        return None
+    if kind is None or target <= 0:
+        return None
+
+    year = int(goal["year"])
+    start, end = date(year, 1, 1), date(year, 12, 31)
+    value = int(stats.get(kind.stat_field, 0))
+    remaining = max(0, target - value)
+    days_left = (end - max(today, start)).days + 1 if today <= end else 0
+
+    pace: Optional[float] = None
+    projected: Optional[str] = None
+    if remaining == 0:
+        pace = 0.0
+    else:
+        if days_left:
+            pace = round(remaining / days_left, 2)
+        elapsed = (min(today, end) - start).days + 1 if today >= start else 0
+        if value > 0 and elapsed > 0 and today <= end:
+            days_needed = math.ceil(remaining / (value / elapsed))
+            projected = (today + timedelta(days=days_needed)).isoformat()
+
+    return {
+        "value": value,
+        "target": target,
+        # Floored: 100 only once the target is actually reached.
+        "percent": max(0, min(100, value * 100 // target)),
+        "remaining": remaining,
+        "daysLeft": days_left,
+        "pacePerDay": pace,
+        "projectedCompletion": projected,
+        "onTrack": remaining == 0 or (projected is not None and projected <= end.isoformat()),
+    }
 
+
+def _query_goals(table: Any, year: int, attrs: List[str]) -> List[Dict[str, Any]]:
     resp = table.query(
-        KeyConditionExpression=Key("pk").eq(pk()) & Key("sk").begins_with(f"GOAL#{year}#"),
+        KeyConditionExpression="pk = :pk AND begins_with(sk, :prefix)",
+        ExpressionAttributeValues={":pk": pk(), ":prefix": f"GOAL#{year}#"},
+        **projection(attrs),
     )
-    items = resp.get("Items") or []
     goals = []
-    for it in items:
+    for it in resp.get("Items") or []:
         _, _, goal_id = (str(it.get("sk", "GOAL#0#")).split("#", 2) + [""])[:3]
         goals.append(
             {
@@ -36,10 +93,81 @@ def get_goals(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, An
                 "updatedAt": it.get("updatedAt"),
             }
         )
+    return goals
+
+
+def _add_progress(table: Any, year: int, goals: List[Dict[str, Any]], *, now: str) -> None:
+    """Set each goal's `progress`, reading the year's counters only if some goal is measured against them."""
+    kinds = {GoalKind.from_any(g["kind"]) for g in goals} - {None}
+    stats: Dict[str, Any] = {}
+    if kinds:
+        # One GetItem, projected to the counters the goals need.
+        key = {"pk": pk(), "sk": stats_sk(year)}
+        stats = table.get_item(Key=key, **projection(sorted(k.stat_field for k in kinds))).get("Item") or {}
+    today = (parse_iso(now) or datetime.now(timezone.utc)).date()
+    for g in goals:
+        g["progress"] = goal_progress(g, stats, today=today) if kinds else None
+
+
+def get_goals(event: Dict[str, Any], *, origin: str, table: Any, now_iso: Any) -> Dict[str, Any]:
+    qs = querystring(event)
+    year = parse_year(qs.get("year"))
+    if year is None:
+        return json_response(400, {"error": "year is required (e.g. ?year=2026)"}, origin=origin)
+    fields, err = parse_fields(qs.get("fields"), GOAL_FIELDS)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
+    want_progress = fields is None or "progress" in fields
+
+    # status/createdAt are always read because the response is sorted by them; kind/target
+    # whenever progress is computed.
+    wanted = [GOAL_FIELD_ATTRS[f] for f in fields or GOAL_FIELD_ATTRS if f in GOAL_FIELD_ATTRS]
+    wanted += ["status", "createdAt"]
+    if want_progress:
+        wanted += ["kind", "target"]
+    goals = _query_goals(table, year, list(dict.fromkeys(wanted)))
+
+    if want_progress:
+        _add_progress(table, year, goals, now=now_iso())
+    else:
+        for g in goals:
+            g["progress"] = None
+
     goals.sort(key=lambda g: (g.get("status") != GoalStatus.DONE.value, g.get("createdAt") or ""))
+    if fields:
+        goals = [{f: g[f] for f in fields} for g in goals]
     return json_response(200, {"goals": goals}, origin=origin)
 
 
+def post_goals_auto_complete(event: Dict[str, Any], *, origin: str, table: Any, now_iso: Any) -> Dict[str, Any]:
+    """
+    Mark the year's structured goals that reached their target `done`. Body: `{"year": 2026}`.
+    A write of its own, so `GET /goals` stays a cacheable read.
+    """
+    data, err = parse_json_body(event)
+    if err:
+        return json_response(400, {"error": err}, origin=origin)
+    year = parse_year(str(data.get("year")) if data.get("year") is not None else None)
+    if year is None:
+        return json_response(400, {"error": "year is required"}, origin=origin)
+
+    now = now_iso()
+    goals = _query_goals(table, year, ["sk", "year", "kind", "target", "status"])
+    _add_progress(table, year, goals, now=now)
+    completed = []
+    for g in goals:
+        reached = g["progress"] is not None and g["progress"]["remaining"] == 0
+        if reached and g["status"] != GoalStatus.DONE.value:
+            table.update_item(
+                Key={"pk": pk(), "sk": goal_sk(year, g["id"])},
+                UpdateExpression="SET #status = :done, updatedAt = :u",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":done": GoalStatus.DONE.value, ":u": now},
+            )
+            completed.append(g["id"])
+    return json_response(200, {"completed": completed}, origin=origin)
+
+
 def post_goal(
     event: Dict[str, Any],
     *,
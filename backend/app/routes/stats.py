@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+from ..counters import STAT_FIELDS, iso_weeks
 from ..http import json_response
 from ..keys import pk, stats_sk
 from ..parsing import parse_year, querystring
 
+SERIES_GRANULARITIES = {"month": "M", "week": "W"}
+
 
 def get_stats(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, Any]:
     qs = querystring(event)
@@ -26,3 +29,49 @@ def get_stats(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, An
     }
     return json_response(200, {"stats": stats}, origin=origin)
 
+
+def _bucket_count(year: int, granularity: str) -> int:
+    if granularity == "month":
+        return 12
+    return iso_weeks(year)
+
+
+def get_stats_series(event: Dict[str, Any], *, origin: str, table: Any) -> Dict[str, Any]:
+    qs = querystring(event)
+    year = parse_year(qs.get("year"))
+    if year is None:
+        return json_response(400, {"error": "year is required (e.g. ?year=2026)"}, origin=origin)
+    granularity = (qs.get("granularity") or "month").strip().lower()
+    marker = SERIES_GRANULARITIES.get(granularity)
+    if marker is None:
+        return json_response(400, {"error": "granularity must be month or week"}, origin=origin)
+
+    # All buckets of the year live under one sort-key prefix: a single range query.
+    prefix = f"{stats_sk(year)}#{marker}"
+    kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": "pk = :pk AND begins_with(sk, :prefix)",
+        "ExpressionAttributeValues": {":pk": pk(), ":prefix": prefix},
+    }
+    stored: Dict[int, Dict[str, Any]] = {}
+    while True:
+        res = table.query(**kwargs)
+        for it in res.get("Items") or []:
+            try:
+                stored[int(str(it.get("sk", ""))[len(prefix):])] = it
+            except ValueError:
+                continue
+        last_key = res.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        kwargs["ExclusiveStartKey"] = last_key
+
+    # Dense series: buckets with no actions are reported as zeros.
+    series: List[Dict[str, Any]] = []
+    for n in range(1, _bucket_count(year, granularity) + 1):
+        item = stored.get(n) or {}
+        label = f"{year}-{n:02d}" if granularity == "month" else f"{year}-W{n:02d}"
+        row: Dict[str, Any] = {"bucket": label, granularity: n}
+        row.update({f: int(item.get(f, 0)) for f in STAT_FIELDS})
+        row["updatedAt"] = item.get("updatedAt")
+        series.append(row)
+    return json_response(200, {"year": year, "granularity": granularity, "series": series}, origin=origin)
@@ -0,0 +1,187 @@
+"""
+SQLite storage for self-hosting on a single box.
+
+`SqliteTable` is a `MemoryTable` whose items live in a SQLite database instead of dicts, so it
+accepts the same calls as the DynamoDB table (and runs the same expression evaluator), while
+storage and key-condition queries go through a real query engine:
+
+- one `items` row per item, `PRIMARY KEY (pk, sk)` in a `WITHOUT ROWID` table, so
+  `begins_with`/`BETWEEN`/comparison key conditions are index range scans (every query
+  here is one: there are no secondary indexes for writes to maintain);
+- `type` and `amountCents` copied into columns, which the stats aggregate reads;
+- WAL journal (readers never block the writer; `synchronous=NORMAL` is durable across process
+  crashes); every write and each `TransactWriteItems` is one SQLite transaction.
+
+`action_totals(year)` computes the `STATS#<year>` counters with a single SQL aggregate over the
+year's actions; `app.stats_rebuild` uses it instead of paging through them when available.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .counters import STAT_FIELDS, action_increments, add_increments
+from .keys import pk as user_pk
+from .memtable import MemoryTable, prefix_successor
+from .models import ActionType
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    pk TEXT NOT NULL,
+    sk TEXT NOT NULL,
+    type TEXT,
+    amount_cents INTEGER,
+    item TEXT NOT NULL,
+    PRIMARY KEY (pk, sk)
+) WITHOUT ROWID;
+"""
+
+_SK_CONDITIONS = {
+    None: ("", 0),
+    "=": ("AND sk = ?", 1),
+    "<": ("AND sk < ?", 1),
+    "<=": ("AND sk <= ?", 1),
+    ">": ("AND sk > ?", 1),
+    ">=": ("AND sk >= ?", 1),
+    "BETWEEN": ("AND sk BETWEEN ? AND ?", 2),
+}
+
+
+def _encode(item: Dict[str, Any]) -> str:
+    # JSON has no sets or binary; tag them so string/number sets and binary attributes round-trip.
+    def default(obj: Any) -> Any:
+        if isinstance(obj, (set, frozenset)):
+            return {"__set__": sorted(obj)}
+        if isinstance(obj, (bytes, bytearray, memoryview)):
+            return {"__b64__": base64.b64encode(bytes(obj)).decode("ascii")}
+        raise TypeError(f"Unsupported value type: {type(obj).__name__}")
+
+    return json.dumps(item, separators=(",", ":"), default=default)
+
+
+def _untag(d: Dict[str, Any]) -> Any:
+    if len(d) == 1 and "__set__" in d:
+        return set(d["__set__"])
+    if len(d) == 1 and "__b64__" in d:
+        return base64.b64decode(d["__b64__"])
+    return d
+
+
+def _decode(raw: str) -> Dict[str, Any]:
+    return json.loads(raw, object_hook=_untag)
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _str_or_none(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+class SqliteTable(MemoryTable):
+    """A `MemoryTable` persisted in SQLite at `path` (`:memory:` for a private in-memory database)."""
+
+    def __init__(self, path: str, name: str = "table", *, hash_key: str = "pk", range_key: str = "sk") -> None:
+        super().__init__(name, hash_key=hash_key, range_key=range_key)
+        self.path = path
+        # One connection shared by the worker threads; `_atomic` serializes access to it.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._depth = 0
+
+    @contextmanager
+    def _atomic(self) -> Iterator[None]:
+        with self._lock:
+            # Re-entrant: only the outermost block opens and closes the SQLite transaction.
+            outer = self._depth == 0
+            if outer:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if outer:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if outer:
+                self._conn.execute("COMMIT")
+
+    def _load(self, pk: Any, sk: Any) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT item FROM items WHERE pk = ? AND sk = ?", (pk, sk)).fetchone()
+        return _decode(row[0]) if row else None
+
+    def _store(self, item: Dict[str, Any]) -> None:
+        pk, sk = self._key_of(item)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO items (pk, sk, type, amount_cents, item) VALUES (?, ?, ?, ?, ?)",
+            (pk, sk, _str_or_none(item.get("type")), _int_or_none(item.get("amountCents")), _encode(item)),
+        )
+
+    def _drop(self, pk: Any, sk: Any) -> None:
+        self._conn.execute("DELETE FROM items WHERE pk = ? AND sk = ?", (pk, sk))
+
+    def _scan(
+        self, pk: Any, op: Optional[str], args: List[Any], *, forward: bool, after: Any = None
+    ) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        sql = "SELECT sk, item FROM items WHERE pk = ? "
+        params: List[Any] = [pk]
+        if op == "begins_with":
+            # A range on the primary key rather than LIKE, which can't use the index for arbitrary prefixes.
+            sql += "AND sk >= ? AND sk < ?"
+            params += [args[0], prefix_successor(args[0])]
+        else:
+            clause, arity = _SK_CONDITIONS[op]
+            sql += clause
+            params += args[:arity]
+        if after is not None:
+            sql += " AND sk > ?" if forward else " AND sk < ?"
+            params.append(after)
+        sql += " ORDER BY sk" + ("" if forward else " DESC")
+        # Rows are decoded lazily: a Limit-ed query stops reading where the page ends.
+        for sk, raw in self._conn.execute(sql, params):
+            yield sk, _decode(raw)
+
+    def items(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT item FROM items ORDER BY pk, sk").fetchall()
+        return [_decode(raw) for (raw,) in rows]
+
+    def action_totals(self, year: int) -> Dict[str, int]:
+        """
+        The year's `STATS` counters, aggregated per action type in SQL over the year's ACTION
+        items (a primary-key range) and mapped through `counters.action_increments`.
+        """
+        prefix = f"ACTION#{year}#"
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT type, COUNT(*), COALESCE(SUM(amount_cents), 0)
+                FROM items
+                WHERE pk = ? AND sk >= ? AND sk < ?
+                GROUP BY type
+                """,
+                (user_pk(), prefix, prefix_successor(prefix)),
+            ).fetchall()
+        totals = dict.fromkeys(STAT_FIELDS, 0)
+        for type_value, count, amount_cents in rows:
+            action_type = ActionType.from_any(type_value)
+            if action_type is None:
+                continue
+            if action_type == ActionType.SAVE:
+                increments = action_increments(action_type, amount_cents=int(amount_cents))
+            else:
+                increments = {field: n * count for field, n in action_increments(action_type).items()}
+            add_increments(totals, increments)
+        return totals
+
+    def close(self) -> None:
+        self._conn.close()
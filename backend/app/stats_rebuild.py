@@ -0,0 +1,175 @@
+"""
+Recompute `STATS#<year>` from the ACTION items and repair drift.
+
+The ACTION#<year># range is split into month-aligned sort-key segments that are queried in
+parallel, with read throughput held to an RCU-per-second budget. The stored row is read
+*before* the actions, and corrections are written with a condition that the row is unchanged,
+so an action logged mid-rebuild makes the update fail instead of being lost.
+
+CLI:     python -m app.stats_rebuild --year 2026 [--apply] [--segments 4] [--rcu-per-second 50]
+Lambda:  app.stats_rebuild.handler with event {"year": 2026, "apply": true}
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import get_env
+from .counters import STAT_FIELDS, action_increments, add_increments
+from .db import get_table, is_conditional_check_failed, projection
+from .keys import pk, stats_sk
+from .models import ActionType
+from .ratelimit import TokenBucket
+from .timeutil import now_iso
+
+
+def sk_segments(year: int, segments: int) -> List[Tuple[str, str]]:
+    """
+    Split `ACTION#<year>#` into `segments` contiguous, inclusive sort-key ranges on month
+    boundaries. The first and last ranges are open-ended, so actions whose `ts` is not an ISO
+    date of that year are still covered.
+    """
+    prefix = f"ACTION#{year}#"
+    segments = max(1, min(12, segments))
+    cuts = [f"{prefix}{year}-{1 + (12 * i) // segments:02d}" for i in range(1, segments)]
+    lows = [prefix] + cuts
+    highs = cuts + [prefix + "\uffff"]
+    return list(zip(lows, highs))
+
+
+def _scan_segment(table: Any, bounds: Tuple[str, str], bucket: Optional[TokenBucket]) -> Dict[str, Any]:
+    lo, hi = bounds
+    kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": "pk = :pk AND sk BETWEEN :lo AND :hi",
+        "ExpressionAttributeValues": {":pk": pk(), ":lo": lo, ":hi": hi},
+        "ConsistentRead": True,
+        "ReturnConsumedCapacity": "TOTAL",
+        **projection(["type", "amountCents"]),
+    }
+    totals: Dict[str, int] = {}
+    scanned = 0
+    consumed = 0.0
+    while True:
+        resp = table.query(**kwargs)
+        for it in resp.get("Items") or []:
+            scanned += 1
+            action_type = ActionType.from_any(it.get("type"))
+            if action_type is not None:
+                add_increments(totals, action_increments(action_type, amount_cents=int(it.get("amountCents") or 0)))
+        page_rcu = float((resp.get("ConsumedCapacity") or {}).get("CapacityUnits") or 0)
+        consumed += page_rcu
+        if bucket is not None and page_rcu:
+            bucket.acquire(page_rcu)
+        last_key = resp.get("LastEvaluatedKey")
+        if not last_key:
+            return {"totals": totals, "scanned": scanned, "consumedRcu": consumed}
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def rebuild_stats(
+    table: Any,
+    year: int,
+    *,
+    apply: bool = False,
+    segments: int = 4,
+    rcu_per_second: Optional[float] = None,
+    now: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Recompute the year's counters; with `apply=True`, write corrections if they differ."""
+    stored_item = table.get_item(Key={"pk": pk(), "sk": stats_sk(year)}, ConsistentRead=True).get("Item")
+    stored = {f: int((stored_item or {}).get(f, 0)) for f in STAT_FIELDS}
+
+    aggregate = getattr(table, "action_totals", None)
+    if aggregate is not None:
+        # Storage with a query engine (`SqliteTable`) sums the actions itself; nothing is paged.
+        parts = [{"totals": aggregate(year), "scanned": 0, "consumedRcu": 0.0}]
+    else:
+        bucket = TokenBucket(rcu_per_second) if rcu_per_second else None
+        ranges = sk_segments(year, segments)
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="stats-rebuild") as pool:
+            parts = list(pool.map(lambda bounds: _scan_segment(table, bounds, bucket), ranges))
+
+    computed = {f: 0 for f in STAT_FIELDS}
+    for part in parts:
+        add_increments(computed, part["totals"])
+    diff = {f: computed[f] - stored[f] for f in STAT_FIELDS if computed[f] != stored[f]}
+
+    result: Dict[str, Any] = {
+        "year": year,
+        "stored": stored,
+        "computed": computed,
+        "diff": diff,
+        "scanned": sum(p["scanned"] for p in parts),
+        "consumedRcu": sum(p["consumedRcu"] for p in parts),
+        "applied": False,
+        "conflict": False,
+    }
+    if not apply or not diff:
+        return result
+
+    names = {f"#{f}": f for f in STAT_FIELDS}
+    vals: Dict[str, Any] = {":u": now or now_iso()}
+    sets = ["updatedAt = :u"]
+    conditions = []
+    for f in STAT_FIELDS:
+        vals[f":{f}"] = computed[f]
+        sets.append(f"#{f} = :{f}")
+        if stored_item is not None and f in stored_item:
+            vals[f":old_{f}"] = stored_item[f]
+            conditions.append(f"#{f} = :old_{f}")
+        else:
+            conditions.append(f"attribute_not_exists(#{f})")
+    try:
+        table.update_item(
+            Key={"pk": pk(), "sk": stats_sk(year)},
+            UpdateExpression="SET " + ", ".join(sets),
+            ConditionExpression=" AND ".join(conditions),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=vals,
+        )
+    except Exception as exc:
+        if not is_conditional_check_failed(exc):
+            raise
+        # The row changed while we were counting; rerun to reconcile.
+        result["conflict"] = True
+        return result
+    result["applied"] = True
+    return result
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Lambda entry point for on-demand (or scheduled) reconciliation."""
+    table = get_table(get_env("TABLE_NAME"))
+    return rebuild_stats(
+        table,
+        int(event["year"]),
+        apply=bool(event.get("apply")),
+        segments=int(event.get("segments") or 4),
+        rcu_per_second=float(event["rcuPerSecond"]) if event.get("rcuPerSecond") else None,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute STATS#<year> from ACTION items.")
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--apply", action="store_true", help="write corrections (default: dry run)")
+    parser.add_argument("--segments", type=int, default=4, help="parallel sort-key segments (1-12)")
+    parser.add_argument("--rcu-per-second", type=float, default=None, help="read capacity budget")
+    parser.add_argument("--table", default=None, help="table name (default: $TABLE_NAME)")
+    args = parser.parse_args(argv)
+
+    table = get_table(args.table or get_env("TABLE_NAME"))
+    result = rebuild_stats(
+        table, args.year, apply=args.apply, segments=args.segments, rcu_per_second=args.rcu_per_second
+    )
+    json.dump(result, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 1 if result["conflict"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,192 @@
+"""
+Per-request latency breakdown, logged as one CloudWatch Embedded Metric Format (EMF) line.
+
+`begin()` starts collecting for the current request (a contextvar, so concurrent `/batch`
+sub-requests running in worker threads add to the same record when submitted with a copied
+context); `span("ddb")` times a phase and accumulates into it; `end()` emits the record
+through the sink. With no request in progress (tests, scripts, `TELEMETRY=off`) `span()`
+returns a shared no-op, so instrumented code costs one contextvar lookup.
+
+Phases may nest: `route` covers the handler, which includes `ddb`, `google` and `encode`.
+DynamoDB capacity reported by `ClientTable` is charged to the request as `consumedRcu`/`consumedWcu`.
+Failures a route recovers from are counted with `error("bookJoin", exc)` as `<kind>Errors`.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .config import get_env
+
+NAMESPACE = "YearGoals"
+
+_current: contextvars.ContextVar[Optional["RequestTelemetry"]] = contextvars.ContextVar("telemetry", default=None)
+_cold_start = True
+
+
+class RequestTelemetry:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.route: Optional[str] = None
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.rcu = 0.0
+        self.wcu = 0.0
+        self.errors: Dict[str, int] = {}
+        self.error_details: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, ms: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + ms
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def add_capacity(self, *, read: float = 0.0, write: float = 0.0) -> None:
+        with self._lock:
+            self.rcu += read
+            self.wcu += write
+
+    def add_error(self, kind: str, detail: str) -> None:
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+            self.error_details[kind] = detail
+
+
+class _Span:
+    __slots__ = ("_rec", "_phase", "_t0")
+
+    def __init__(self, rec: RequestTelemetry, phase: str) -> None:
+        self._rec = rec
+        self._phase = phase
+
+    def __enter__(self) -> "_Span":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._rec.add(self._phase, (time.perf_counter() - self._t0) * 1000)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(phase: str) -> Any:
+    """Context manager timing `phase` for the current request (no-op outside one)."""
+    rec = _current.get()
+    if rec is None:
+        return _NOOP
+    return _Span(rec, phase)
+
+
+def add_capacity(*, read: float = 0.0, write: float = 0.0) -> None:
+    """Charge DynamoDB capacity units to the current request (no-op outside one)."""
+    rec = _current.get()
+    if rec is not None:
+        rec.add_capacity(read=read, write=write)
+
+
+def error(kind: str, exc: BaseException) -> None:
+    """Count a failure the current request recovered from (no-op outside one); the last `repr` is kept."""
+    rec = _current.get()
+    if rec is not None:
+        rec.add_error(kind, repr(exc))
+
+
+def consumed_capacity() -> Optional[Dict[str, float]]:
+    """`{"rcu", "wcu"}` consumed so far by the current request, or None outside one."""
+    rec = _current.get()
+    if rec is None:
+        return None
+    return {"rcu": round(rec.rcu, 3), "wcu": round(rec.wcu, 3)}
+
+
+def set_route(name: str) -> None:
+    """Name the current request after its route; the outermost route (e.g. `batch`) wins."""
+    rec = _current.get()
+    if rec is not None and rec.route is None:
+        rec.route = name
+
+
+def stdout_sink(record: Dict[str, Any]) -> None:
+    # Lambda ships stdout to CloudWatch Logs, which extracts EMF metrics from JSON lines.
+    print(json.dumps(record, separators=(",", ":")))
+
+
+def null_sink(record: Dict[str, Any]) -> None:
+    return None
+
+
+_sink: Callable[[Dict[str, Any]], None] = stdout_sink
+
+
+def set_sink(sink: Callable[[Dict[str, Any]], None]) -> None:
+    global _sink
+    _sink = sink
+
+
+def enabled() -> bool:
+    return get_env("TELEMETRY", "emf") != "off"
+
+
+def begin() -> Optional[contextvars.Token]:
+    """Start collecting for a request; returns None (and collects nothing) when disabled."""
+    if not enabled():
+        return None
+    return _current.set(RequestTelemetry())
+
+
+def end(token: Optional[contextvars.Token], *, status: int, request_id: Optional[str] = None) -> None:
+    global _cold_start
+    if token is None:
+        return
+    rec = _current.get()
+    _current.reset(token)
+    if rec is None:
+        return
+    cold, _cold_start = _cold_start, False
+    _sink(emf_record(rec, status=status, cold_start=cold, request_id=request_id))
+
+
+def emf_record(rec: RequestTelemetry, *, status: int, cold_start: bool, request_id: Optional[str]) -> Dict[str, Any]:
+    latency = (time.perf_counter() - rec.started) * 1000
+    metrics = {"latencyMs": round(latency, 3)}
+    metrics.update({f"{phase}Ms": round(ms, 3) for phase, ms in rec.phases.items()})
+    units = {name: "Milliseconds" for name in metrics}
+    metrics.update({"consumedRcu": round(rec.rcu, 3), "consumedWcu": round(rec.wcu, 3)})
+    units.update({"consumedRcu": "Count", "consumedWcu": "Count"})
+    for kind, n in rec.errors.items():
+        metrics[f"{kind}Errors"] = n
+        units[f"{kind}Errors"] = "Count"
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": NAMESPACE,
+                    "Dimensions": [["route"]],
+                    "Metrics": [{"Name": name, "Unit": units[name]} for name in metrics],
+                }
+            ],
+        },
+        "route": rec.route or "unmatched",
+        "status": status,
+        "coldStart": cold_start,
+        "requestId": request_id,
+        "calls": dict(rec.counts),
+        **({"errors": dict(rec.error_details)} if rec.error_details else {}),
+        **metrics,
+    }
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Any, Optional
 
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
+
+def parse_iso(value: Any) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp; naive values are treated as UTC. Returns None if unparseable."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
@@ -0,0 +1,87 @@
+"""
+CPU vs bytes trade-off of response compression on a realistic `GET /books` payload.
+
+    cd backend && python -m benchmarks.bench_compression [--books 500] [--repeat 50]
+
+Prints, per encoder/level, the compressed size, ratio and mean compression time. Brotli rows
+appear only if the `brotli` package is installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.http import BROTLI_QUALITY, GZIP_LEVEL, json_response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def sample_books(n: int) -> Dict[str, Any]:
+    """Shaped like GET /books: Google Books thumbnails, categories and mostly-unique titles."""
+    books = []
+    for i in range(n):
+        isbn = f"978{i:010d}"
+        books.append(
+            {
+                "isbn": isbn,
+                "title": f"Book number {i}: a study of {['habits', 'systems', 'focus', 'time'][i % 4]}",
+                "authors": [f"Author {i % 97}", f"Co-author {i % 13}"] if i % 3 else [f"Author {i % 97}"],
+                "publishedDate": f"{1990 + i % 35}-0{1 + i % 9}-1{i % 10}",
+                "pageCount": 120 + (i * 37) % 600,
+                "categories": [["Nonfiction"], ["Self-Help"], ["Business & Economics"], ["Fiction"]][i % 4],
+                "thumbnail": f"http://books.google.com/books/content?id=vol{i:06d}xYz&printsec=frontcover&img=1&zoom=1",
+                "googleVolumeId": f"vol{i:06d}xYz",
+                "inLibrary": True,
+                "createdAt": f"2026-01-{1 + i % 28:02d}T10:00:00+00:00",
+                "updatedAt": f"2026-01-{1 + i % 28:02d}T10:00:00+00:00",
+            }
+        )
+    return {"books": books, "nextCursor": None}
+
+
+def _encoders() -> List[Tuple[str, Callable[[bytes], bytes]]]:
+    encoders: List[Tuple[str, Callable[[bytes], bytes]]] = [
+        (
+            f"gzip-{level}{' (default)' if level == GZIP_LEVEL else ''}",
+            lambda b, lv=level: gzip.compress(b, lv, mtime=0),
+        )
+        for level in (1, 6, 9)
+    ]
+    if brotli is not None:
+        encoders += [
+            (
+                f"br-{q}{' (default)' if q == BROTLI_QUALITY else ''}",
+                lambda b, q=q: brotli.compress(b, mode=brotli.MODE_TEXT, quality=q),
+            )
+            for q in (1, 5, 11)
+        ]
+    return encoders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    raw = json_response(200, sample_books(args.books), origin="*")["body"].encode("utf-8")
+    print(f"payload: {args.books} books, {len(raw):,} bytes uncompressed")
+    print(f"{'encoder':<16} {'bytes':>10} {'ratio':>7} {'ms/op':>8} {'MB/s':>8}")
+    for name, encode in _encoders():
+        out = encode(raw)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            encode(raw)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        ratio = len(raw) / len(out)
+        print(f"{name:<16} {len(out):>10,} {ratio:>6.1f}x {elapsed * 1000:>8.2f} {len(raw) / elapsed / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
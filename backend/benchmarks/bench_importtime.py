@@ -0,0 +1,126 @@
+"""
+Cold-start import cost of the Lambda entry point, measured with `python -X importtime` in a
+fresh interpreter per run (the same work a new Lambda container does during init).
+
+    cd backend && python -m benchmarks.bench_importtime [--runs 5] [--top 15] [--budget-ms 150] [--boto3]
+
+`--boto3` also times `import boto3` + creating the DynamoDB client, which `handler._preinit`
+moves into the Lambda init phase. Exits non-zero when `--budget-ms` is exceeded;
+`tests/test_import_budget.py` enforces the same budget in CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 150.0
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def import_profile(module: str = "handler") -> List[ImportRecord]:
+    """`-X importtime` records for importing `module` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        records.append(ImportRecord(name.strip(), depth, int(self_us), int(cumulative_us)))
+    return records
+
+
+def subtree(records: List[ImportRecord], module: str) -> List[ImportRecord]:
+    """Records imported on behalf of top-level `module` (importtime lists children first)."""
+    pending: List[ImportRecord] = []
+    for r in records:
+        if r.depth == 0:
+            if r.name == module:
+                return pending
+            pending = []
+        else:
+            pending.append(r)
+    return []
+
+
+def cumulative_ms(module: str = "handler", *, runs: int = 3) -> List[float]:
+    """Cumulative import time of `module` (ms), one value per fresh-interpreter run."""
+    out = []
+    for _ in range(runs):
+        rec = next(r for r in import_profile(module) if r.name == module and r.depth == 0)
+        out.append(rec.cumulative_us / 1000)
+    return out
+
+
+def imported_modules(module: str = "handler") -> List[str]:
+    """Every module loaded as a side effect of importing `module`."""
+    code = (
+        f"import sys; before = set(sys.modules); import {module}; "
+        "print('\\n'.join(sorted(set(sys.modules) - before)))"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    return proc.stdout.split()
+
+
+def boto3_client_ms() -> Optional[float]:
+    """Time to import boto3 and build a DynamoDB client in a fresh interpreter (None if absent)."""
+    code = (
+        "import time; t = time.perf_counter(); import boto3; "
+        "boto3.client('dynamodb', region_name='us-east-1'); print((time.perf_counter() - t) * 1000)"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True)
+    return float(proc.stdout) if proc.returncode == 0 else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark for handler.py.")
+    parser.add_argument("--module", default="handler")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--boto3", action="store_true", help="also time boto3 import + client creation")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    totals = cumulative_ms(args.module, runs=args.runs)
+    print(
+        f"import {args.module}: min {min(totals):.1f} ms, median {statistics.median(totals):.1f} ms "
+        f"over {args.runs} runs ({time.perf_counter() - started:.1f}s)"
+    )
+
+    print("\nslowest imports under it (cumulative, last run, depth <= 2):")
+    records = [r for r in subtree(import_profile(args.module), args.module) if r.depth <= 2]
+    for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[: args.top]:
+        print(f"  {r.cumulative_us / 1000:>7.2f} ms  {'  ' * r.depth}{r.name}")
+
+    if args.boto3:
+        ms = boto3_client_ms()
+        print(f"\nboto3 import + dynamodb client: {'not installed' if ms is None else f'{ms:.1f} ms'}")
+
+    if args.budget_ms is not None and min(totals) > args.budget_ms:
+        print(f"\nOVER BUDGET: {min(totals):.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+"""
+Deserialize + JSON-encode cost of realistic `/actions` and `/books` pages, comparing
+
+- resource: boto3 `TypeDeserializer` (Decimal numbers) + `json.dumps(default=_json_default)`,
+  i.e. what the routes did on the boto3 resource layer;
+- client:   `app.ddbclient.from_item` (native int/float) + `app.http.dumps` (no default hook).
+
+    cd backend && python -m benchmarks.bench_serialization [--items 500] [--repeat 200]
+
+Without boto3 installed, the resource path uses an equivalent Decimal-producing deserializer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from app.ddbclient import from_item, to_item
+from app.http import _json_default, dumps
+
+try:
+    from boto3.dynamodb.types import TypeDeserializer
+except ImportError:
+    TypeDeserializer = None
+
+
+def _decimal_from_attr(attr: Dict[str, Any]) -> Any:
+    ((tag, v),) = attr.items()
+    if tag == "N":
+        return Decimal(v)
+    if tag == "M":
+        return {k: _decimal_from_attr(x) for k, x in v.items()}
+    if tag == "L":
+        return [_decimal_from_attr(x) for x in v]
+    if tag == "NULL":
+        return None
+    return v
+
+
+def resource_deserializer() -> Callable[[Dict[str, Any]], Any]:
+    if TypeDeserializer is not None:
+        deser = TypeDeserializer()
+        return deser.deserialize
+    return _decimal_from_attr
+
+
+def actions_page(n: int) -> List[Dict[str, Any]]:
+    items = []
+    for i in range(n):
+        item: Dict[str, Any] = {
+            "pk": "USER#me",
+            "sk": f"ACTION#2026#2026-03-{1 + i % 28:02d}T07:{i % 60:02d}:00+00:00#{i:032x}",
+            "year": 2026,
+            "type": ["BJJ", "PILATES", "SAVE", "READ"][i % 4],
+            "ts": f"2026-03-{1 + i % 28:02d}T07:{i % 60:02d}:00+00:00",
+            "createdAt": f"2026-03-{1 + i % 28:02d}T07:{i % 60:02d}:01+00:00",
+        }
+        if i % 4 == 2:
+            item["amountCents"] = 1000 + i * 7
+        if i % 4 == 3:
+            item["isbn"] = f"978{i:010d}"
+        items.append(to_item(item))
+    return items
+
+
+def books_page(n: int) -> List[Dict[str, Any]]:
+    return [
+        to_item(
+            {
+                "pk": "USER#me",
+                "sk": f"BOOK#978{i:010d}",
+                "isbn": f"978{i:010d}",
+                "title": f"Book number {i}",
+                "authors": [f"Author {i % 97}"],
+                "publishedDate": "2019-04-02",
+                "pageCount": 120 + i % 600,
+                "averageRating": 3.5 + (i % 3) / 2,
+                "categories": ["Nonfiction"],
+                "thumbnail": f"http://books.google.com/books/content?id=vol{i:06d}&img=1&zoom=1",
+                "inLibrary": True,
+            }
+        )
+        for i in range(n)
+    ]
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DynamoDB deserialization + JSON encoding microbenchmark.")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    deser = resource_deserializer()
+    print(f"resource deserializer: {'boto3 TypeDeserializer' if TypeDeserializer else 'Decimal fallback'}")
+    print(f"{'payload':<10} {'path':<10} {'deserialize ms':>15} {'encode ms':>10} {'total ms':>9}")
+    for name, wire in (("actions", actions_page(args.items)), ("books", books_page(args.items))):
+
+        # Loop variables are bound as defaults, so each case times its own payload.
+        def resource_items(wire: List[Dict[str, Any]] = wire) -> List[Dict[str, Any]]:
+            return [{k: deser(v) for k, v in it.items()} for it in wire]
+
+        def client_items(wire: List[Dict[str, Any]] = wire) -> List[Dict[str, Any]]:
+            return [from_item(it) for it in wire]
+
+        decimal_rows, native_rows = resource_items(), client_items()
+        paths = (
+            (
+                "resource",
+                resource_items,
+                lambda name=name, rows=decimal_rows: json.dumps(
+                    {name: rows}, separators=(",", ":"), ensure_ascii=False, default=_json_default
+                ),
+            ),
+            ("client", client_items, lambda name=name, rows=native_rows: dumps({name: rows})),
+        )
+        for path, decode, encode in paths:
+            t_dec = _time(decode, args.repeat)
+            t_enc = _time(encode, args.repeat)
+            print(f"{name:<10} {path:<10} {t_dec * 1000:>15.3f} {t_enc * 1000:>10.3f} {(t_dec + t_enc) * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
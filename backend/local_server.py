@@ -0,0 +1,288 @@
+"""
+Local HTTP server for the Lambda handler.
+
+Translates each HTTP request into an API Gateway HTTP API (payload v2) event, calls
+`handler.handler` and writes its response back, serving requests concurrently from a
+bounded worker pool with keep-alive connections. Storage is pluggable (`--storage memory`
+keeps everything in an `app.memtable.MemoryTable`, `sqlite` in an `app.sqlitetable.SqliteTable`
+file; `dynamodb` uses the real table named by `TABLE_NAME`) and latency can be injected per
+request and per table call, so throughput and concurrency of the app layer can be measured
+without SAM, Docker or AWS:
+
+    cd backend && python local_server.py --port 8000 --workers 16 --ddb-latency-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import handler as lambda_handler
+from app import db, telemetry
+from app.memtable import MemoryTable
+from app.sqlitetable import SqliteTable
+
+DEFAULT_WORKERS = 16
+# The API function's `Timeout` in template.yaml.
+DEFAULT_TIMEOUT_MS = 10_000
+
+
+def to_event(
+    method: str,
+    target: str,
+    headers: List[Tuple[str, str]],
+    body: bytes,
+    *,
+    source_ip: str = "127.0.0.1",
+) -> Dict[str, Any]:
+    """HTTP request -> API Gateway HTTP API (v2) event, as the Lambda integration builds it."""
+    url = urlsplit(target)
+    merged: Dict[str, str] = {}
+    cookies: List[str] = []
+    for name, value in headers:
+        name = name.lower()
+        if name == "cookie":
+            cookies.extend(c.strip() for c in value.split(";") if c.strip())
+            continue
+        # v2 lowercases header names and joins repeated ones with commas.
+        merged[name] = f"{merged[name]},{value}" if name in merged else value
+    query: Dict[str, str] = {}
+    for name, value in parse_qsl(url.query, keep_blank_values=True):
+        query[name] = f"{query[name]},{value}" if name in query else value
+
+    now = datetime.now(timezone.utc)
+    request_id = uuid.uuid4().hex
+    event: Dict[str, Any] = {
+        "version": "2.0",
+        "routeKey": "ANY /{proxy+}",
+        "rawPath": url.path or "/",
+        "rawQueryString": url.query,
+        "headers": merged,
+        "requestContext": {
+            "accountId": "local",
+            "apiId": "local",
+            "domainName": merged.get("host", "localhost"),
+            "http": {
+                "method": method.upper(),
+                "path": url.path or "/",
+                "protocol": "HTTP/1.1",
+                "sourceIp": source_ip,
+                "userAgent": merged.get("user-agent", ""),
+            },
+            "requestId": request_id,
+            "routeKey": "ANY /{proxy+}",
+            "stage": "$default",
+            "time": now.strftime("%d/%b/%Y:%H:%M:%S +0000"),
+            "timeEpoch": int(now.timestamp() * 1000),
+        },
+        "isBase64Encoded": False,
+    }
+    if query:
+        event["queryStringParameters"] = query
+    if cookies:
+        event["cookies"] = cookies
+    if body:
+        try:
+            event["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            event["body"] = base64.b64encode(body).decode("ascii")
+            event["isBase64Encoded"] = True
+    return event
+
+
+def from_response(resp: Dict[str, Any]) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    """Lambda proxy response -> (status, headers, body bytes)."""
+    status = int(resp.get("statusCode") or 200)
+    headers = [(k, str(v)) for k, v in (resp.get("headers") or {}).items()]
+    headers += [("set-cookie", c) for c in resp.get("cookies") or []]
+    raw = resp.get("body") or ""
+    body = base64.b64decode(raw) if resp.get("isBase64Encoded") else raw.encode("utf-8")
+    return status, headers, body
+
+
+class LambdaContext:
+    """The parts of the Lambda context object the handler (and long-running routes) use."""
+
+    def __init__(self, *, timeout_ms: int = DEFAULT_TIMEOUT_MS, function_name: str = "year-goals-local") -> None:
+        self.aws_request_id = uuid.uuid4().hex
+        self.function_name = function_name
+        self._deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+class LatencyTable:
+    """Wraps a table, sleeping `latency_ms` before every call to simulate the network round trip."""
+
+    def __init__(self, table: Any, latency_ms: float) -> None:
+        self._table = table
+        self._latency = latency_ms / 1000
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._table, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            time.sleep(self._latency)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+def _memory_storage() -> Any:
+    return MemoryTable(os.environ.get("TABLE_NAME", "year-goals"))
+
+
+def _sqlite_storage() -> Any:
+    return SqliteTable(os.environ.get("SQLITE_PATH", "year-goals.sqlite3"), os.environ.get("TABLE_NAME", "year-goals"))
+
+
+def _dynamodb_storage() -> Optional[Any]:
+    # None: keep `db.get_table`'s pooled client table for TABLE_NAME.
+    return None
+
+
+STORAGE: Dict[str, Callable[[], Optional[Any]]] = {
+    "memory": _memory_storage,
+    "sqlite": _sqlite_storage,
+    "dynamodb": _dynamodb_storage,
+}
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so a load generator measures the app rather than TCP setup.
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections give their worker back after this many seconds.
+    timeout = 5
+    server: "LocalServer"
+
+    def _serve(self) -> None:
+        length = int(self.headers.get("content-length") or 0)
+        body = self.rfile.read(length) if length else b""
+        event = to_event(self.command, self.path, list(self.headers.items()), body, source_ip=self.client_address[0])
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        resp = lambda_handler.handler(event, LambdaContext(timeout_ms=self.server.timeout_ms))
+        status, headers, payload = from_response(resp)
+
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() not in ("content-length", "connection"):
+                self.send_header(name, value)
+        self.send_header("content-length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _serve
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class LocalServer(HTTPServer):
+    """`HTTPServer` that handles each connection on a fixed-size worker pool."""
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        *,
+        workers: int = DEFAULT_WORKERS,
+        latency_ms: float = 0.0,
+        timeout_ms: int = DEFAULT_TIMEOUT_MS,
+        quiet: bool = False,
+    ) -> None:
+        super().__init__(address, _RequestHandler)
+        self.latency_ms = latency_ms
+        self.timeout_ms = timeout_ms
+        self.quiet = quiet
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="local-server")
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    *,
+    storage: str = "memory",
+    workers: int = DEFAULT_WORKERS,
+    latency_ms: float = 0.0,
+    ddb_latency_ms: float = 0.0,
+    timeout_ms: int = DEFAULT_TIMEOUT_MS,
+    quiet: bool = False,
+) -> LocalServer:
+    """Configure storage and return a bound (not yet serving) server; call `serve_forever()`."""
+    os.environ.setdefault("TABLE_NAME", "year-goals")
+    table = STORAGE[storage]()
+    if table is None and ddb_latency_ms:
+        table = db.get_table(os.environ["TABLE_NAME"])
+    if table is not None and ddb_latency_ms:
+        table = LatencyTable(table, ddb_latency_ms)
+    db.set_table(table)
+    return LocalServer((host, port), workers=workers, latency_ms=latency_ms, timeout_ms=timeout_ms, quiet=quiet)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve handler.handler over HTTP for local runs and load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--storage", choices=sorted(STORAGE), default="memory")
+    parser.add_argument("--sqlite-path", default=None, help="database file for --storage sqlite ($SQLITE_PATH)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent requests served")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every request")
+    parser.add_argument("--ddb-latency-ms", type=float, default=0.0, help="added to every table call")
+    parser.add_argument("--timeout-ms", type=int, default=DEFAULT_TIMEOUT_MS, help="simulated function timeout")
+    parser.add_argument("--quiet", action="store_true", help="no access log or EMF lines")
+    args = parser.parse_args(argv)
+
+    if args.sqlite_path:
+        os.environ["SQLITE_PATH"] = args.sqlite_path
+    if args.quiet:
+        telemetry.set_sink(telemetry.null_sink)
+    server = serve(
+        args.host,
+        args.port,
+        storage=args.storage,
+        workers=args.workers,
+        latency_ms=args.latency_ms,
+        ddb_latency_ms=args.ddb_latency_ms,
+        timeout_ms=args.timeout_ms,
+        quiet=args.quiet,
+    )
+    print(f"Serving on http://{args.host}:{server.server_address[1]} ({args.storage}, {args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
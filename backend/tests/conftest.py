@@ -4,6 +4,18 @@ import json
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+import pytest
+
+from app import telemetry
+
+
+@pytest.fixture(autouse=True)
+def _silence_telemetry():
+    # Requests through handler.handler would otherwise print an EMF line each.
+    telemetry.set_sink(telemetry.null_sink)
+    yield
+    telemetry.set_sink(telemetry.stdout_sink)
+
 
 @dataclass
 class FakeTable:
@@ -11,11 +23,49 @@ class FakeTable:
     update_calls: List[Dict[str, Any]] = field(default_factory=list)
     delete_calls: List[Dict[str, Any]] = field(default_factory=list)
     get_item_result: Dict[str, Any] = field(default_factory=dict)
+    items_by_sk: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    get_item_calls: List[Dict[str, Any]] = field(default_factory=list)
+    query_pages: List[Dict[str, Any]] = field(default_factory=list)
+    query_calls: List[Dict[str, Any]] = field(default_factory=list)
+    batch_get_calls: List[Dict[str, Any]] = field(default_factory=list)
+    # Number of initial batch_get_item calls that return every key as unprocessed (throttling).
+    batch_get_throttled_calls: int = 0
+    transact_calls: List[Dict[str, Any]] = field(default_factory=list)
+    batch_write_calls: List[Dict[str, Any]] = field(default_factory=list)
 
     def get_item(self, **kwargs: Any) -> Dict[str, Any]:
-        # Allow tests to pre-seed a return value.
+        self.get_item_calls.append(kwargs)
+        # Per-key items win; otherwise fall back to the single pre-seeded return value.
+        sk = (kwargs.get("Key") or {}).get("sk")
+        if sk in self.items_by_sk:
+            return {"Item": dict(self.items_by_sk[sk])}
         return dict(self.get_item_result)
 
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        self.query_calls.append(kwargs)
+        # Successive calls return successive pre-seeded pages (empty once exhausted).
+        if not self.query_pages:
+            return {"Items": []}
+        return dict(self.query_pages.pop(0))
+
+    def batch_get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        self.batch_get_calls.append(kwargs)
+        request_items = kwargs["RequestItems"]
+        if self.batch_get_throttled_calls > 0:
+            self.batch_get_throttled_calls -= 1
+            return {"Responses": {}, "UnprocessedKeys": request_items}
+        responses: Dict[str, List[Dict[str, Any]]] = {}
+        for name, req in request_items.items():
+            responses[name] = [dict(self.items_by_sk[k["sk"]]) for k in req["Keys"] if k["sk"] in self.items_by_sk]
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+    def batch_write_item(self, **kwargs: Any) -> Dict[str, Any]:
+        self.batch_write_calls.append(kwargs)
+        for requests in kwargs["RequestItems"].values():
+            for req in requests:
+                self.put_item(Item=req["PutRequest"]["Item"])
+        return {"UnprocessedItems": {}}
+
     def put_item(self, **kwargs: Any) -> Dict[str, Any]:
         self.put_items.append(kwargs)
         return {}
@@ -25,6 +75,20 @@ class FakeTable:
         # Simulate "ALL_NEW" for goal patch by returning Attributes if provided by test.
         return {"Attributes": kwargs.get("_fake_attributes", {})}
 
+    def transact_write_items(self, **kwargs: Any) -> Dict[str, Any]:
+        self.transact_calls.append(kwargs)
+        # Apply each op through the single-item methods so their call lists reflect the effect.
+        for op in kwargs["TransactItems"]:
+            ((kind, body),) = op.items()
+            body = {k: v for k, v in body.items() if k != "TableName"}
+            if kind == "Put":
+                self.put_item(**body)
+            elif kind == "Update":
+                self.update_item(**body)
+            elif kind == "Delete":
+                self.delete_item(**body)
+        return {}
+
     def delete_item(self, **kwargs: Any) -> Dict[str, Any]:
         self.delete_calls.append(kwargs)
         return {}
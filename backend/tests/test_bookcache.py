@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from app.bookcache import lookup_book
+
+from .conftest import FakeTable
+
+NOW = "2026-03-01T00:00:00+00:00"
+META = {"googleVolumeId": "vol_1", "title": "Fetched", "authors": ["Jane Doe"]}
+
+
+def _fetch_counter(result):
+    calls = []
+
+    def fetch(isbn):
+        calls.append(isbn)
+        return result
+
+    return fetch, calls
+
+
+def test_fresh_book_item_is_served_without_fetching():
+    table = FakeTable(
+        items_by_sk={
+            "BOOK#9780132350884": {
+                "isbn": "9780132350884",
+                "title": "Cached",
+                "authors": ["A"],
+                "googleFetchedAt": "2026-02-20T00:00:00+00:00",
+                "inLibrary": True,
+            }
+        }
+    )
+    fetch, calls = _fetch_counter(META)
+
+    meta, fetched = lookup_book(table, "9780132350884", now_iso=lambda: NOW, fetch=fetch)
+
+    assert fetched is False
+    assert meta["title"] == "Cached"
+    assert meta["inLibrary"] is True
+    # The compressed volumeInfo is neither projected nor returned for a cache hit.
+    assert "googleVolumeInfo" not in meta
+    assert "googleVolumeInfoZ" not in table.get_item_calls[0]["ExpressionAttributeNames"].values()
+    assert calls == []
+    assert len(table.get_item_calls) == 1
+
+
+def test_stale_book_item_is_refetched(monkeypatch):
+    monkeypatch.setenv("BOOK_CACHE_TTL_SECONDS", "86400")
+    table = FakeTable(
+        items_by_sk={"BOOK#9780132350884": {"title": "Old", "googleFetchedAt": "2026-02-20T00:00:00+00:00"}}
+    )
+    fetch, calls = _fetch_counter(META)
+
+    meta, fetched = lookup_book(table, "9780132350884", now_iso=lambda: NOW, fetch=fetch)
+
+    assert fetched is True
+    assert meta["title"] == "Fetched"
+    assert calls == ["9780132350884"]
+
+
+def test_stale_book_item_is_served_when_google_no_longer_finds_it(monkeypatch):
+    monkeypatch.setenv("BOOK_CACHE_TTL_SECONDS", "86400")
+    table = FakeTable(
+        items_by_sk={"BOOK#9780132350884": {"title": "Old", "googleFetchedAt": "2026-02-20T00:00:00+00:00"}}
+    )
+    fetch, calls = _fetch_counter(None)
+
+    meta, fetched = lookup_book(table, "9780132350884", now_iso=lambda: NOW, fetch=fetch)
+
+    assert (meta["title"], fetched) == ("Old", False)
+    assert calls == ["9780132350884"]
+    assert table.put_items == []
+
+
+def test_unknown_isbn_is_negatively_cached():
+    table = FakeTable()
+    fetch, calls = _fetch_counter(None)
+
+    meta, fetched = lookup_book(table, "9780132350884", now_iso=lambda: NOW, fetch=fetch)
+
+    assert (meta, fetched) == (None, False)
+    assert calls == ["9780132350884"]
+    assert len(table.put_items) == 1
+    marker = table.put_items[0]["Item"]
+    assert marker["sk"] == "BOOKMISS#9780132350884"
+    assert marker["checkedAt"] == NOW
+
+    # A second lookup hits the negative entry and skips Google.
+    table.items_by_sk[marker["sk"]] = marker
+    meta, fetched = lookup_book(table, "9780132350884", now_iso=lambda: NOW, fetch=fetch)
+    assert (meta, fetched) == (None, False)
+    assert calls == ["9780132350884"]
+
+
+def test_upsert_stores_compressed_volume_info_and_drops_legacy_map():
+    from app.bookcache import book_upsert_update
+
+    volume_info = {"title": "The Example Book", "description": "x" * 2000}
+    kwargs = book_upsert_update("9780132350884", {"googleVolumeInfo": volume_info}, now=NOW)
+
+    packed = kwargs["ExpressionAttributeValues"][":googleVolumeInfoZ"]
+    assert isinstance(packed, bytes)
+    assert len(packed) < 200
+    assert "googleVolumeInfo =" not in kwargs["UpdateExpression"]
+    assert kwargs["UpdateExpression"].endswith(" REMOVE googleVolumeInfo")
+
+
+def test_decode_volume_info_reads_compressed_and_legacy_items():
+    from app.booklib import decode_volume_info, encode_volume_info
+
+    class Binary:  # Mimics boto3.dynamodb.types.Binary.
+        def __init__(self, value):
+            self.value = value
+
+    volume_info = {"title": "T", "authors": ["A"]}
+    assert decode_volume_info({"googleVolumeInfoZ": encode_volume_info(volume_info)}) == volume_info
+    assert decode_volume_info({"googleVolumeInfoZ": Binary(encode_volume_info(volume_info))}) == volume_info
+    assert decode_volume_info({"googleVolumeInfo": volume_info}) == volume_info
+    assert decode_volume_info({}) is None
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+
+import handler as lambda_handler
+from app import telemetry
+from app.capacity_report import parse_records, summarize
+from app.ddbclient import ClientTable, consumed_units
+
+from .conftest import make_event
+
+
+class _CapacityClient:
+    """Low-level client double that charges fixed capacity per operation."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def get_item(self, **kwargs):
+        self.calls.append(("get_item", kwargs))
+        return {"Item": {"bjjCount": {"N": "2"}}, "ConsumedCapacity": {"TableName": "tbl", "CapacityUnits": 0.5}}
+
+    def transact_write_items(self, **kwargs):
+        self.calls.append(("transact_write_items", kwargs))
+        return {"ConsumedCapacity": [{"TableName": "tbl", "CapacityUnits": 2.0}] * len(kwargs["TransactItems"])}
+
+
+def test_consumed_units_handles_single_and_list_shapes():
+    assert consumed_units({"CapacityUnits": 1.5}) == 1.5
+    assert consumed_units([{"CapacityUnits": 1}, {"CapacityUnits": 2}]) == 3
+    assert consumed_units(None) == 0
+
+
+def test_requests_charge_capacity_to_logs_and_debug_header(monkeypatch):
+    client = _CapacityClient()
+    records = []
+    telemetry.set_sink(records.append)
+    monkeypatch.setenv("TABLE_NAME", "tbl")
+    monkeypatch.setenv("ADMIN_TOKEN", "")
+    monkeypatch.setenv("CONSUMED_CAPACITY_HEADER", "1")
+    monkeypatch.setattr(lambda_handler, "get_table", lambda _: ClientTable(client, "tbl"))
+
+    stats = lambda_handler.handler(make_event(method="GET", path="/stats", query={"year": "2026"}), None)
+    post = lambda_handler.handler(make_event(method="POST", path="/actions", body={"year": 2026, "type": "BJJ"}), None)
+
+    assert client.calls[0][1]["ReturnConsumedCapacity"] == "TOTAL"
+    assert stats["headers"]["x-consumed-capacity"] == "rcu=0.5;wcu=0"
+    # ACTION put + yearly/monthly/weekly STATS updates in one transaction.
+    assert post["headers"]["x-consumed-capacity"] == "rcu=0;wcu=8"
+    assert [(r["route"], r["consumedRcu"], r["consumedWcu"]) for r in records] == [
+        ("stats.get", 0.5, 0.0),
+        ("actions.create", 0.0, 8.0),
+    ]
+
+
+def test_report_ranks_routes_by_capacity_per_call():
+    books = {"_aws": {}, "route": "books.list", "consumedRcu": 40, "latencyMs": 9}
+    lines = [
+        "2026-01-01T00:00:00Z abc " + json.dumps(books),
+        json.dumps({"_aws": {}, "route": "stats.get", "consumedRcu": 0.5, "latencyMs": 3}),
+        json.dumps({"_aws": {}, "route": "books.list", "consumedRcu": 20, "latencyMs": 7}),
+        "START RequestId: abc",
+    ]
+
+    rows = summarize(parse_records(lines))
+
+    assert [r["route"] for r in rows] == ["books.list", "stats.get"]
+    assert rows[0]["calls"] == 2 and rows[0]["rcuPerCall"] == 30 and rows[0]["avgLatencyMs"] == 8
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+
+from app import cursor
+from app.cursor import decode_cursor, encode_cursor
+
+KEY = {"pk": "USER#me", "sk": "ACTION#2026#2026-01-02T00:00:00+00:00#abc"}
+
+
+def test_cursor_round_trip():
+    token = encode_cursor(KEY, scope="actions:2026")
+    assert token is not None
+    assert decode_cursor(token, scope="actions:2026") == KEY
+
+
+def test_cursor_is_none_without_last_evaluated_key():
+    assert encode_cursor(None, scope="books") is None
+    assert encode_cursor({}, scope="books") is None
+
+
+def test_cursor_rejects_other_scope_tampering_and_garbage():
+    token = encode_cursor(KEY, scope="actions:2026")
+    assert decode_cursor(token, scope="actions:2025") is None
+
+    body, sig = token.split(".")
+    assert decode_cursor(f"{body}x.{sig}", scope="actions:2026") is None
+    assert decode_cursor("not-a-cursor", scope="actions:2026") is None
+    assert decode_cursor("", scope="actions:2026") is None
+
+
+def test_cursor_signature_depends_on_secret(monkeypatch):
+    monkeypatch.setenv("CURSOR_SECRET", "one")
+    token = encode_cursor(KEY, scope="books")
+    monkeypatch.setenv("CURSOR_SECRET", "two")
+    assert decode_cursor(token, scope="books") is None
+
+
+def test_cursor_secret_falls_back_to_a_key_derived_from_the_admin_token(monkeypatch):
+    monkeypatch.delenv("CURSOR_SECRET", raising=False)
+    monkeypatch.setenv("ADMIN_TOKEN", "admin")
+    assert cursor._secret() == hmac.new(b"admin", b"cursor", hashlib.sha256).digest()
+    assert cursor._secret() != b"admin"
+
+    # Without any secret the key is random per process, never a constant from the source.
+    monkeypatch.setenv("ADMIN_TOKEN", "")
+    assert cursor._secret() == cursor._PROCESS_KEY
+    assert decode_cursor(encode_cursor(KEY, scope="books"), scope="books") == KEY
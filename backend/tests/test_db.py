@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from app import db
+
+from .conftest import FakeTable
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    db.reset()
+    yield
+    db.reset()
+
+
+def test_get_table_reuses_client_and_table(monkeypatch):
+    client = object()
+    monkeypatch.setattr(db, "_create_client", lambda: client)
+
+    first = db.get_table("tbl")
+    second = db.get_table("tbl")
+
+    assert first is second
+    assert first.client is client and first.name == "tbl"
+    assert db.pool_stats() == {"clientCreated": 1, "tableCreated": 1, "tableReused": 1}
+
+
+def test_set_table_injects_table_for_any_name(monkeypatch):
+    monkeypatch.setattr(db, "_create_client", lambda: pytest.fail("must not build a client"))
+    table = FakeTable()
+
+    db.set_table(table)
+
+    assert db.get_table("whatever") is table
+    assert db.pool_stats()["clientCreated"] == 0
+
+
+def test_batch_get_items_chunks_and_retries_unprocessed_keys(monkeypatch):
+    monkeypatch.setattr(db.time, "sleep", lambda _: None)
+    table = FakeTable(
+        items_by_sk={f"BOOK#{i}": {"sk": f"BOOK#{i}"} for i in range(150)},
+        batch_get_throttled_calls=1,
+    )
+
+    found = db.batch_get_items(table, [{"pk": "USER#me", "sk": f"BOOK#{i}"} for i in range(150)], attrs=["sk"])
+
+    assert len(found) == 150
+    # First chunk throttled once then retried, second chunk (50 keys) in one call.
+    assert [len(next(iter(c["RequestItems"].values()))["Keys"]) for c in table.batch_get_calls] == [100, 100, 50]
+
+
+def test_batch_get_items_raises_when_keys_stay_unprocessed(monkeypatch):
+    monkeypatch.setattr(db.time, "sleep", lambda _: None)
+    table = FakeTable(items_by_sk={"BOOK#1": {"sk": "BOOK#1"}}, batch_get_throttled_calls=5)
+
+    with pytest.raises(RuntimeError, match="1 unprocessed keys after 5 attempts"):
+        db.batch_get_items(table, [{"pk": "USER#me", "sk": "BOOK#1"}])
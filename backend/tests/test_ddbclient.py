@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import pytest
+
+from app.ddbclient import ClientTable, from_attr, to_attr
+from app.http import json_response
+
+
+class _FakeClient:
+    """Records low-level calls and answers with canned (typed) responses."""
+
+    def __init__(self, responses: Dict[str, Any]) -> None:
+        self.responses = responses
+        self.calls: List[tuple] = []
+
+    def __getattr__(self, op: str) -> Any:
+        def call(**kwargs: Any) -> Dict[str, Any]:
+            self.calls.append((op, kwargs))
+            return self.responses.get(op, {})
+
+        return call
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["s", 7, -12, 1.5, True, None, b"\x00z", {"a": [1, "x", {"b": 2.25}]}, {"x", "y"}, {1, 2}],
+)
+def test_attr_round_trip(value):
+    assert from_attr(to_attr(value)) == value
+
+
+def test_numbers_come_back_native():
+    assert type(from_attr({"N": "42"})) is int
+    assert type(from_attr({"N": "4.5"})) is float
+    assert from_attr({"N": "1E+2"}) == 100 and type(from_attr({"N": "1E+2"})) is int
+    assert to_attr(Decimal("12.50")) == {"N": "12.50"}
+
+
+def test_query_types_the_request_and_untypes_the_response():
+    client = _FakeClient(
+        {
+            "query": {
+                "Items": [{"sk": {"S": "ACTION#2026#x#1"}, "amountCents": {"N": "1234"}}],
+                "LastEvaluatedKey": {"pk": {"S": "USER#me"}, "sk": {"S": "ACTION#2026#x#1"}},
+                "ResponseMetadata": {"HTTPStatusCode": 200},
+            }
+        }
+    )
+    table = ClientTable(client, "tbl")
+
+    resp = table.query(
+        KeyConditionExpression="pk = :pk",
+        ExpressionAttributeValues={":pk": "USER#me"},
+        ExclusiveStartKey={"pk": "USER#me", "sk": "A"},
+    )
+
+    op, kwargs = client.calls[0]
+    assert op == "query"
+    assert kwargs["TableName"] == "tbl"
+    assert kwargs["ExpressionAttributeValues"] == {":pk": {"S": "USER#me"}}
+    assert kwargs["ExclusiveStartKey"] == {"pk": {"S": "USER#me"}, "sk": {"S": "A"}}
+    assert resp == {
+        "Items": [{"sk": "ACTION#2026#x#1", "amountCents": 1234}],
+        "LastEvaluatedKey": {"pk": "USER#me", "sk": "ACTION#2026#x#1"},
+    }
+    # Native numbers need no Decimal handling to serialize.
+    assert json_response(200, resp, origin="*")["body"].count("1234") == 1
+
+
+def test_batch_get_item_returns_unprocessed_keys_untyped_for_retry():
+    client = _FakeClient(
+        {
+            "batch_get_item": {
+                "Responses": {"tbl": [{"sk": {"S": "BOOK#1"}, "pageCount": {"N": "300"}}]},
+                "UnprocessedKeys": {"tbl": {"Keys": [{"pk": {"S": "USER#me"}, "sk": {"S": "BOOK#2"}}]}},
+            }
+        }
+    )
+    table = ClientTable(client, "tbl")
+
+    resp = table.batch_get_item(RequestItems={"tbl": {"Keys": [{"pk": "USER#me", "sk": "BOOK#1"}]}})
+
+    assert client.calls[0][1]["RequestItems"]["tbl"]["Keys"] == [{"pk": {"S": "USER#me"}, "sk": {"S": "BOOK#1"}}]
+    assert resp["Responses"]["tbl"] == [{"sk": "BOOK#1", "pageCount": 300}]
+    assert resp["UnprocessedKeys"] == {"tbl": {"Keys": [{"pk": "USER#me", "sk": "BOOK#2"}]}}
+
+
+def test_transact_write_items_types_every_op():
+    client = _FakeClient({})
+    table = ClientTable(client, "tbl")
+
+    table.transact_write_items(
+        TransactItems=[
+            {"Put": {"TableName": "tbl", "Item": {"pk": "USER#me", "n": 1}}},
+            {"Update": {"TableName": "tbl", "Key": {"pk": "USER#me"}, "ExpressionAttributeValues": {":n": 2}}},
+        ],
+        ClientRequestToken="t",
+    )
+
+    items = client.calls[0][1]["TransactItems"]
+    assert items[0]["Put"]["Item"] == {"pk": {"S": "USER#me"}, "n": {"N": "1"}}
+    assert items[1]["Update"]["ExpressionAttributeValues"] == {":n": {"N": "2"}}
+    assert client.calls[0][1]["ClientRequestToken"] == "t"
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+
+from app.export import encode_csv, iter_action_rows
+from app.router import dispatch
+
+from .conftest import FakeTable, make_event
+
+PAGE_1 = {
+    "Items": [{"sk": "ACTION#2026#2026-01-01T00:00:00#a1", "year": 2026, "type": "BJJ", "ts": "2026-01-01T00:00:00"}],
+    "LastEvaluatedKey": {"pk": "USER#me", "sk": "ACTION#2026#2026-01-01T00:00:00#a1"},
+}
+PAGE_2 = {
+    "Items": [
+        {
+            "sk": "ACTION#2026#2026-01-02T00:00:00#a2",
+            "year": 2026,
+            "type": "SAVE",
+            "ts": "2026-01-02T00:00:00",
+            "amountCents": 150,
+            "note": 'with "quotes", commas',
+        }
+    ]
+}
+
+
+def _export(query):
+    table = FakeTable(query_pages=[dict(PAGE_1), dict(PAGE_2)])
+    resp = dispatch(make_event(path="/actions/export", query=query), origin="*", table=table, now_iso=lambda: "")
+    return resp, table
+
+
+def test_iter_action_rows_follows_last_evaluated_key():
+    table = FakeTable(query_pages=[dict(PAGE_1), dict(PAGE_2)])
+
+    rows = list(iter_action_rows(table, 2026))
+
+    assert [r["id"] for r in rows] == ["a1", "a2"]
+    assert table.query_calls[1]["ExclusiveStartKey"] == PAGE_1["LastEvaluatedKey"]
+    assert table.query_calls[0]["ScanIndexForward"] is True
+
+
+def test_export_ndjson():
+    resp, _ = _export({"year": "2026", "format": "ndjson"})
+
+    assert resp["statusCode"] == 200
+    assert resp["headers"]["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp["body"].splitlines()]
+    assert [(r["type"], r["amountCents"]) for r in lines] == [("BJJ", None), ("SAVE", 150)]
+
+
+def test_export_csv_gzip_is_a_base64_encoded_gz_file():
+    resp, _ = _export({"year": "2026", "format": "csv", "gzip": "1"})
+
+    assert resp["isBase64Encoded"] is True
+    # One encoding only: a .gz download, not a Content-Encoding the client would undo.
+    assert "content-encoding" not in resp["headers"]
+    assert resp["headers"]["content-type"] == "application/gzip"
+    assert resp["headers"]["content-disposition"] == 'attachment; filename="actions-2026.csv.gz"'
+    text = gzip.decompress(base64.b64decode(resp["body"])).decode("utf-8")
+    lines = text.splitlines()
+    assert lines[0] == "id,year,type,ts,amountCents,isbn,note,createdAt"
+    assert lines[2] == 'a2,2026,SAVE,2026-01-02T00:00:00,150,,"with ""quotes"", commas",'
+
+
+def test_export_too_large_for_a_lambda_response_is_a_413(monkeypatch):
+    monkeypatch.setenv("EXPORT_MAX_BYTES", "100")
+    table = FakeTable(query_pages=[dict(PAGE_1), dict(PAGE_1), dict(PAGE_2)])
+
+    resp = dispatch(
+        make_event(path="/actions/export", query={"year": "2026"}), origin="*", table=table, now_iso=lambda: ""
+    )
+
+    assert resp["statusCode"] == 413
+    assert json.loads(resp["body"])["error"] == "export exceeds the 100-byte response limit; retry with gzip=1"
+    # The first row already crosses the limit: the remaining pages are never read.
+    assert len(table.query_calls) == 1
+
+
+def test_export_rejects_unknown_format():
+    resp, table = _export({"year": "2026", "format": "xml"})
+
+    assert resp["statusCode"] == 400
+    assert table.query_calls == []
+
+
+def test_encode_csv_yields_one_chunk_per_row():
+    chunks = list(encode_csv([{"id": "a"}, {"id": "b"}]))
+
+    assert len(chunks) == 2
+    assert chunks[1] == b"b,,,,,,,\r\n"
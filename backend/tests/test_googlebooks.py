@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import googlebooks
+from app.bookcache import lookup_book
+from app.booklib import google_books_lookup
+from app.googlebooks import CircuitBreaker, CircuitOpenError, GoogleBooksError
+
+from .conftest import FakeTable
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_StubServer"
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        self.server.connections.add(self.client_address)
+        time.sleep(self.server.delays.pop(0) if self.server.delays else 0)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = json.dumps(
+            {"items": [{"id": "vol_1", "volumeInfo": {"title": "Clean Code", "authors": ["Robert C. Martin"]}}]}
+            if status == 200
+            else {"error": status}
+        ).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Stub)
+        self.paths = []
+        self.connections = set()
+        self.statuses = []
+        self.delays = []
+
+    def handle_error(self, request, client_address):
+        # The client hung up on a delayed response: expected in the timeout tests.
+        pass
+
+
+@pytest.fixture
+def google(monkeypatch):
+    srv = _StubServer()
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setenv("GOOGLE_BOOKS_BASE_URL", f"http://127.0.0.1:{srv.server_address[1]}")
+    monkeypatch.setattr(googlebooks, "_backoff", lambda attempt: 0)
+    googlebooks.reset()
+    yield srv
+    googlebooks.reset()
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_lookups_reuse_one_keep_alive_connection(google):
+    for _ in range(3):
+        meta = google_books_lookup("9780132350884")
+        assert meta["title"] == "Clean Code"
+
+    assert google.paths == ["/books/v1/volumes?q=isbn:9780132350884"] * 3
+    assert len(google.connections) == 1
+    assert googlebooks.stats()["connectionsOpened"] == 1
+    assert googlebooks.stats()["connectionsReused"] == 2
+
+
+def test_transient_errors_are_retried(google):
+    google.statuses = [503, 429]
+
+    assert google_books_lookup("9780132350884")["title"] == "Clean Code"
+    assert len(google.paths) == 3
+    assert googlebooks.stats()["retries"] == 2
+    assert googlebooks.breaker().state == "closed"
+
+
+def test_client_errors_are_not_retried(google):
+    google.statuses = [404]
+
+    with pytest.raises(GoogleBooksError) as exc:
+        googlebooks.volumes_by_isbn("9780132350884")
+    assert exc.value.status == 404
+    assert len(google.paths) == 1
+
+
+def test_read_timeouts_are_not_retried_and_the_deadline_bounds_the_lookup(google, monkeypatch):
+    monkeypatch.setenv("GOOGLE_BOOKS_READ_TIMEOUT_SECONDS", "0.2")
+    google.delays = [1.0]
+
+    started = time.monotonic()
+    with pytest.raises(GoogleBooksError, match="timed out"):
+        googlebooks.volumes_by_isbn("9780132350884")
+    assert time.monotonic() - started < 0.5
+    assert len(google.paths) == 1
+    assert googlebooks.stats()["retries"] == 0
+
+    # Retries of 5xx stop at the deadline: the slow second answer is cut short, no third attempt.
+    monkeypatch.setenv("GOOGLE_BOOKS_READ_TIMEOUT_SECONDS", "3")
+    google.paths, google.statuses, google.delays = [], [503], [0, 1.0]
+    started = time.monotonic()
+    with pytest.raises(GoogleBooksError):
+        googlebooks.volumes_by_isbn("9780132350884", deadline=0.3)
+    assert time.monotonic() - started < 0.6
+    assert len(google.paths) == 2
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast(google, monkeypatch):
+    monkeypatch.setenv("GOOGLE_BOOKS_MAX_ATTEMPTS", "1")
+    monkeypatch.setenv("GOOGLE_BOOKS_BREAKER_THRESHOLD", "2")
+    google.statuses = [500, 500]
+
+    for _ in range(2):
+        with pytest.raises(GoogleBooksError):
+            googlebooks.volumes_by_isbn("9780132350884")
+    with pytest.raises(CircuitOpenError):
+        googlebooks.volumes_by_isbn("9780132350884")
+
+    assert len(google.paths) == 2
+    assert googlebooks.stats()["shortCircuited"] == 1
+
+
+def test_breaker_lets_one_trial_through_after_the_reset_period():
+    now = [0.0]
+    breaker = CircuitBreaker(2, 30, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] = 30.0
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    # Only one trial at a time; a failed trial re-opens the circuit for another period.
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] = 60.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_an_unexpected_error_in_the_half_open_trial_reopens_the_circuit(monkeypatch):
+    now = [0.0]
+    circuit = CircuitBreaker(1, 30, clock=lambda: now[0])
+    circuit.record_failure()
+    now[0] = 30.0
+    monkeypatch.setattr(googlebooks, "_breaker", circuit)
+
+    def broken(path, *, remaining):
+        raise ValueError("bad response")
+
+    monkeypatch.setattr(googlebooks, "_get_once", broken)
+    with pytest.raises(ValueError):
+        googlebooks.volumes_by_isbn("9780132350884")
+
+    # The trial was released: the circuit re-opened and allows the next trial after the reset period.
+    assert circuit.state == "open"
+    now[0] = 60.0
+    assert circuit.allow()
+
+
+def test_unreachable_google_falls_back_to_stale_metadata(monkeypatch):
+    # Nothing listens on port 9: the connection is refused.
+    monkeypatch.setenv("GOOGLE_BOOKS_BASE_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("GOOGLE_BOOKS_MAX_ATTEMPTS", "1")
+    monkeypatch.setenv("BOOK_CACHE_TTL_SECONDS", "86400")
+    googlebooks.reset()
+    table = FakeTable(
+        items_by_sk={"BOOK#9780132350884": {"title": "Old", "googleFetchedAt": "2026-01-01T00:00:00+00:00"}}
+    )
+    try:
+        meta, fetched = lookup_book(
+            table, "9780132350884", now_iso=lambda: "2026-03-01T00:00:00+00:00", fetch=google_books_lookup
+        )
+        assert (meta["title"], fetched) == ("Old", False)
+
+        # Without stored metadata the failure propagates.
+        with pytest.raises(GoogleBooksError):
+            lookup_book(FakeTable(), "9780132350884", now_iso=lambda: "2026-03-01", fetch=google_books_lookup)
+    finally:
+        googlebooks.reset()
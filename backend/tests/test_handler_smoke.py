@@ -39,3 +39,20 @@ def test_handler_dispatches_route(monkeypatch):
     assert resp["statusCode"] == 201
     assert len(table.put_items) == 1
 
+
+def test_preinit_builds_table_only_inside_lambda(monkeypatch):
+    built = []
+    monkeypatch.setattr(lambda_handler, "get_table", lambda name: built.append(name))
+    monkeypatch.setenv("TABLE_NAME", "tbl")
+
+    monkeypatch.delenv("AWS_LAMBDA_FUNCTION_NAME", raising=False)
+    lambda_handler._preinit()
+    assert built == []
+
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "year-goals-api")
+    lambda_handler._preinit()
+    assert built == ["tbl"]
+
+    monkeypatch.setenv("DDB_PREINIT", "0")
+    lambda_handler._preinit()
+    assert built == ["tbl"]
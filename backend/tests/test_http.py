@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import json
+import base64
+import gzip
 from decimal import Decimal
 
-from app.http import json_response
+from app import http as http_mod
+from app.http import accepted_encodings, compress_response, conditional_response, json_response
 
 
 def test_json_response_serializes_decimal():
@@ -12,3 +15,65 @@ def test_json_response_serializes_decimal():
     body = json.loads(resp["body"])
     assert body == {"x": 12, "y": 1.5}
 
+
+def test_conditional_response_returns_304_for_matching_etag():
+    resp = json_response(200, {"x": 1}, origin="*")
+    tagged = conditional_response({"headers": {}}, resp, cache_control="private, no-cache")
+    etag = tagged["headers"]["etag"]
+    assert tagged["statusCode"] == 200
+    assert tagged["headers"]["cache-control"] == "private, no-cache"
+
+    again = json_response(200, {"x": 1}, origin="*")
+    not_modified = conditional_response(
+        {"headers": {"if-none-match": f'"other", W/{etag}'}}, again, cache_control="private, no-cache"
+    )
+    assert not_modified["statusCode"] == 304
+    assert not_modified["body"] == ""
+    assert not_modified["headers"]["etag"] == etag
+
+    changed = conditional_response(
+        {"headers": {"if-none-match": etag}}, json_response(200, {"x": 2}, origin="*"), cache_control="no-store"
+    )
+    assert changed["statusCode"] == 200
+
+
+def test_conditional_response_leaves_errors_alone():
+    resp = json_response(400, {"error": "nope"}, origin="*")
+    assert "etag" not in conditional_response({"headers": {"if-none-match": "*"}}, resp, cache_control="x")["headers"]
+
+
+def test_accepted_encodings_honors_q_values(monkeypatch):
+    monkeypatch.setattr(http_mod, "brotli", None)
+    assert accepted_encodings("gzip, deflate, br") == ["gzip"]
+    assert accepted_encodings("gzip;q=0, identity") == []
+    assert accepted_encodings("*") == ["gzip"]
+    assert accepted_encodings(None) == []
+
+
+def test_compress_response_gzips_large_bodies_when_accepted(monkeypatch):
+    monkeypatch.setattr(http_mod, "brotli", None)
+    payload = {"books": [{"isbn": f"97800000000{i:02d}", "title": "The Example Book"} for i in range(50)]}
+    event = {"headers": {"accept-encoding": "gzip, deflate"}}
+    resp = conditional_response(event, json_response(200, payload, origin="*"), cache_control="no-cache")
+    etag = resp["headers"]["etag"]
+
+    out = compress_response(event, resp, min_bytes=256)
+
+    assert out["isBase64Encoded"] is True
+    assert out["headers"]["content-encoding"] == "gzip"
+    assert out["headers"]["vary"] == "accept-encoding"
+    assert json.loads(gzip.decompress(base64.b64decode(out["body"]))) == payload
+    # The compressed variant gets its own strong ETag, which still revalidates.
+    assert out["headers"]["etag"] == etag[:-1] + '-gzip"'
+    again = json_response(200, payload, origin="*")
+    revalidated = conditional_response({"headers": {"if-none-match": out["headers"]["etag"]}}, again, cache_control="x")
+    assert revalidated["statusCode"] == 304
+
+
+def test_compress_response_skips_small_or_unaccepted_bodies():
+    small = compress_response({"headers": {"accept-encoding": "gzip"}}, json_response(200, {"ok": True}, origin="*"))
+    assert "content-encoding" not in small["headers"]
+    assert small["headers"]["vary"] == "accept-encoding"
+
+    big = json_response(200, {"x": "y" * 5000}, origin="*")
+    assert "isBase64Encoded" not in compress_response({"headers": {}}, big)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import os
+
+from benchmarks.bench_importtime import DEFAULT_BUDGET_MS, cumulative_ms, imported_modules
+
+
+def test_handler_import_defers_routes_and_aws_sdk():
+    loaded = imported_modules("handler")
+
+    assert "app.router" in loaded
+    # Route modules load on first dispatch; boto3 only in Lambda (pre-init) or on first table use.
+    assert [m for m in loaded if m.startswith("app.routes")] == []
+    assert [m for m in loaded if m.split(".")[0] in ("boto3", "botocore", "traceback")] == []
+
+
+def test_handler_import_time_within_budget():
+    budget = float(os.environ.get("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+    # Best of three fresh interpreters: the budget guards against regressions, not CI noise.
+    best = min(cumulative_ms("handler", runs=3))
+    assert best <= budget, f"import handler took {best:.1f} ms (budget {budget:.0f} ms)"
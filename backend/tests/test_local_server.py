@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import local_server
+from app import db
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "")
+    monkeypatch.setenv("ALLOWED_ORIGIN", "*")
+    servers = []
+
+    def start(**kwargs):
+        srv = local_server.serve(port=0, quiet=True, **kwargs)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servers.append(srv)
+        return srv.server_address[1]
+
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+    db.set_table(None)
+
+
+def _request(port, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request(method, path, body=json.dumps(body) if body is not None else None)
+    resp = conn.getresponse()
+    return resp.status, dict(resp.getheaders()), resp.read()
+
+
+def test_to_event_builds_a_v2_event():
+    event = local_server.to_event(
+        "post",
+        "/actions?year=2026&tag=a&tag=b",
+        [("Content-Type", "application/json"), ("X-Admin-Token", "t"), ("Cookie", "a=1; b=2")],
+        b'{"x": 1}',
+    )
+
+    assert event["rawPath"] == "/actions"
+    assert event["requestContext"]["http"]["method"] == "POST"
+    assert event["queryStringParameters"] == {"year": "2026", "tag": "a,b"}
+    assert event["headers"]["x-admin-token"] == "t"
+    assert event["cookies"] == ["a=1", "b=2"]
+    assert event["body"] == '{"x": 1}' and event["isBase64Encoded"] is False
+    assert local_server.to_event("GET", "/", [], b"\xff")["isBase64Encoded"] is True
+
+
+def test_serves_routes_against_memory_storage(server):
+    port = server()
+
+    status, _, _ = _request(port, "POST", "/actions", {"year": 2026, "type": "BJJ", "ts": "2026-03-01T09:00:00Z"})
+    assert status == 201
+    status, headers, body = _request(port, "GET", "/stats?year=2026")
+    assert status == 200
+    assert json.loads(body)["stats"]["bjjCount"] == 1
+    assert int(headers["content-length"]) == len(body)
+    assert _request(port, "GET", "/nope")[0] == 404
+
+
+def test_requests_are_served_concurrently(server):
+    port = server(workers=8, latency_ms=200)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(lambda _: _request(port, "GET", "/health")[0], range(8)))
+    elapsed = time.perf_counter() - started
+
+    assert statuses == [200] * 8
+    # Serially this would take 8 x 200 ms.
+    assert elapsed < 1.0
+
+
+def test_latency_table_delays_every_call():
+    table = local_server.LatencyTable(local_server.MemoryTable(), 20)
+
+    started = time.perf_counter()
+    table.put_item(Item={"pk": "USER#me", "sk": "A"})
+    assert table.get_item(Key={"pk": "USER#me", "sk": "A"})["Item"]["sk"] == "A"
+    assert time.perf_counter() - started >= 0.04
+    assert table.name == "table"
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app import telemetry
+from app.db import batch_get_items, batch_write_items, is_conditional_check_failed
+from app.memtable import DynamoDBError, MemoryTable, item_size
+from app.router import dispatch
+
+from .conftest import make_event
+
+
+def _seed(table: MemoryTable, sks):
+    for sk in sks:
+        table.put_item(Item={"pk": "USER#me", "sk": sk, "n": 1})
+
+
+def _query(table: MemoryTable, expr: str, values, **kwargs):
+    return table.query(KeyConditionExpression=expr, ExpressionAttributeValues=values, **kwargs)
+
+
+def test_query_key_conditions_are_sorted_ranges():
+    table = MemoryTable()
+    _seed(table, ["GOAL#2026#b", "ACTION#2026#2", "ACTION#2026#1", "ACTION#2027#1", "ACTION#20"])
+
+    items = _query(table, "pk = :pk AND begins_with(sk, :p)", {":pk": "USER#me", ":p": "ACTION#2026#"})["Items"]
+    assert [it["sk"] for it in items] == ["ACTION#2026#1", "ACTION#2026#2"]
+
+    resp = _query(
+        table, "pk = :pk AND sk BETWEEN :lo AND :hi", {":pk": "USER#me", ":lo": "ACTION#2026", ":hi": "ACTION#2027~"}
+    )
+    assert [it["sk"] for it in resp["Items"]] == ["ACTION#2026#1", "ACTION#2026#2", "ACTION#2027#1"]
+
+    resp = _query(table, "pk = :pk AND sk < :s", {":pk": "USER#me", ":s": "ACTION#2026#2"}, ScanIndexForward=False)
+    assert [it["sk"] for it in resp["Items"]] == ["ACTION#2026#1", "ACTION#20"]
+    assert _query(table, "pk = :pk", {":pk": "USER#other"}) == {"Items": [], "Count": 0, "ScannedCount": 0}
+
+
+def test_query_paginates_with_last_evaluated_key_in_both_directions():
+    table = MemoryTable()
+    _seed(table, [f"ACTION#{i}" for i in range(5)])
+
+    for forward, expected in ((True, [0, 1, 2, 3, 4]), (False, [4, 3, 2, 1, 0])):
+        seen, start, pages = [], None, 0
+        while True:
+            kwargs = {"Limit": 2, "ScanIndexForward": forward}
+            if start:
+                kwargs["ExclusiveStartKey"] = start
+            resp = _query(table, "pk = :pk AND begins_with(sk, :p)", {":pk": "USER#me", ":p": "ACTION#"}, **kwargs)
+            seen += [it["sk"] for it in resp["Items"]]
+            pages += 1
+            start = resp.get("LastEvaluatedKey")
+            if not start:
+                break
+        assert seen == [f"ACTION#{i}" for i in expected]
+        # Like DynamoDB, a page that fills Limit exactly still returns a key; the next one is empty.
+        assert pages == 3
+
+
+def test_query_filter_counts_scanned_items_and_select_count():
+    table = MemoryTable()
+    for i in range(4):
+        table.put_item(Item={"pk": "USER#me", "sk": f"A#{i}", "type": "BJJ" if i % 2 else "READ"})
+
+    resp = _query(
+        table,
+        "pk = :pk",
+        {":pk": "USER#me", ":t": "BJJ"},
+        FilterExpression="#t = :t",
+        ExpressionAttributeNames={"#t": "type"},
+        Select="COUNT",
+    )
+    assert resp == {"Count": 2, "ScannedCount": 4}
+
+
+def test_update_expression_set_add_remove_if_not_exists():
+    table = MemoryTable()
+    key = {"pk": "USER#me", "sk": "STATS#2026"}
+
+    for _ in range(2):
+        table.update_item(
+            Key=key,
+            UpdateExpression="SET createdAt = if_not_exists(createdAt, :u), updatedAt = :u ADD #f :one",
+            ExpressionAttributeNames={"#f": "bjjCount"},
+            ExpressionAttributeValues={":u": "t1", ":one": 1},
+        )
+    resp = table.update_item(
+        Key=key,
+        UpdateExpression="SET total = bjjCount + :n, tags = list_append(if_not_exists(tags, :e), :t) REMOVE createdAt",
+        ExpressionAttributeValues={":n": 10, ":e": [], ":t": ["a"]},
+        ReturnValues="ALL_NEW",
+    )
+
+    assert resp["Attributes"] == {**key, "updatedAt": "t1", "bjjCount": 2, "total": 12, "tags": ["a"]}
+    assert table.get_item(Key=key, ProjectionExpression="#b", ExpressionAttributeNames={"#b": "bjjCount"}) == {
+        "Item": {"bjjCount": 2}
+    }
+
+
+def test_conditional_writes_raise_conditional_check_failed():
+    table = MemoryTable()
+    item = {"pk": "USER#me", "sk": "BOOK#1", "title": "Dune"}
+    table.put_item(Item=item, ConditionExpression="attribute_not_exists(pk)")
+
+    with pytest.raises(DynamoDBError) as exc:
+        table.put_item(Item=item, ConditionExpression="attribute_not_exists(pk)")
+    assert is_conditional_check_failed(exc.value)
+
+    table.update_item(
+        Key={"pk": "USER#me", "sk": "BOOK#1"},
+        UpdateExpression="SET title = :new",
+        ConditionExpression="title = :old AND (size(title) > :zero OR NOT attribute_exists(x))",
+        ExpressionAttributeValues={":new": "Emma", ":old": "Dune", ":zero": 0},
+    )
+    assert table.get_item(Key={"pk": "USER#me", "sk": "BOOK#1"})["Item"]["title"] == "Emma"
+
+
+def test_transact_write_is_all_or_nothing_and_idempotent():
+    table = MemoryTable()
+    table.put_item(Item={"pk": "USER#me", "sk": "GOAL#1", "status": "done"})
+    ops = [
+        {"Put": {"Item": {"pk": "USER#me", "sk": "ACTION#1"}}},
+        {
+            "Update": {
+                "Key": {"pk": "USER#me", "sk": "GOAL#1"},
+                "UpdateExpression": "SET #s = :todo",
+                "ConditionExpression": "#s = :doing",
+                "ExpressionAttributeNames": {"#s": "status"},
+                "ExpressionAttributeValues": {":todo": "todo", ":doing": "doing"},
+            }
+        },
+    ]
+
+    with pytest.raises(DynamoDBError) as exc:
+        table.transact_write_items(TransactItems=ops)
+    assert exc.value.response["Error"]["Code"] == "TransactionCanceledException"
+    assert [r["Code"] for r in exc.value.response["CancellationReasons"]] == ["None", "ConditionalCheckFailed"]
+    assert [it["sk"] for it in table.items()] == ["GOAL#1"]
+
+    ops[1]["Update"]["ExpressionAttributeValues"][":doing"] = "done"
+    table.transact_write_items(TransactItems=ops, ClientRequestToken="tok")
+    # Replaying the same token is a no-op even though the condition no longer holds.
+    table.transact_write_items(TransactItems=ops, ClientRequestToken="tok")
+    assert [it["sk"] for it in table.items()] == ["ACTION#1", "GOAL#1"]
+
+
+def test_batch_helpers_and_capacity_units():
+    table = MemoryTable()
+    big = "x" * 5000
+    batch_write_items(table, [{"pk": "USER#me", "sk": f"BOOK#{i}", "blob": big} for i in range(30)])
+    assert table.calls["batch_write_item"] == 2
+    # 5 KB items: 5 write units each.
+    assert table.consumed["wcu"] == 150
+
+    table.reset_consumed()
+    found = batch_get_items(table, [{"pk": "USER#me", "sk": f"BOOK#{i}"} for i in range(3)])
+    assert len(found) == 3
+    # Eventually consistent: ceil(5 KB / 4 KB) / 2 per item.
+    assert table.consumed["rcu"] == 3.0
+
+    resp = table.get_item(Key={"pk": "USER#me", "sk": "BOOK#0"}, ConsistentRead=True, ReturnConsumedCapacity="TOTAL")
+    assert resp["ConsumedCapacity"]["CapacityUnits"] == 2.0
+    assert item_size(resp["Item"]) > 5000
+
+
+def test_routes_run_against_the_memory_table_and_report_capacity():
+    table = MemoryTable()
+
+    def call(method, path, body=None, query=None):
+        resp = dispatch(
+            make_event(method=method, path=path, body=body, query=query),
+            origin="*",
+            table=table,
+            now_iso=lambda: "2026-03-01T10:00:00+00:00",
+        )
+        return resp["statusCode"], json.loads(resp["body"])
+
+    token = telemetry.begin()
+    try:
+        assert call("POST", "/goals", {"year": 2026, "kind": "BJJ_SESSIONS", "target": 10})[0] == 201
+        for _ in range(3):
+            assert call("POST", "/actions", {"year": 2026, "type": "BJJ", "ts": "2026-03-01T09:00:00Z"})[0] == 201
+        status, body = call("GET", "/goals", query={"year": "2026"})
+        capacity = telemetry.consumed_capacity()
+    finally:
+        telemetry.end(token, status=200)
+
+    assert status == 200
+    assert body["goals"][0]["progress"]["value"] == 3
+    assert call("GET", "/stats", query={"year": "2026"})[1]["stats"]["bjjCount"] == 3
+    # 1 goal put + 3 transactions (action + year/month/week counters, 2 units per write).
+    assert capacity["wcu"] == 1 + 3 * 4 * 2
+    assert capacity["rcu"] > 0
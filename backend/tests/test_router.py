@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app import metrics
+from app.router import dispatch, match
+
+from .conftest import FakeTable, make_event
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _dispatch(method, path, **kwargs):
+    return dispatch(
+        make_event(method=method, path=path, **kwargs),
+        origin="*",
+        table=FakeTable(),
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+    )
+
+
+def test_match_resolves_literal_and_parameterized_paths():
+    route, params, _ = match("GET", "/stats")
+    assert route.name == "stats.get" and params == ()
+
+    route, params, _ = match("PATCH", "/goals/abc123/")
+    assert route.name == "goals.patch" and params == ("abc123",)
+
+    assert match("GET", "/goals/abc/extra") == (None, (), [])
+    assert match("GET", "/nope") == (None, (), [])
+
+
+def test_known_path_with_wrong_method_is_405_with_allow_header():
+    resp = _dispatch("PUT", "/goals/abc")
+
+    assert resp["statusCode"] == 405
+    assert resp["headers"]["allow"] == "DELETE,PATCH,OPTIONS"
+    assert _dispatch("DELETE", "/stats")["headers"]["allow"] == "GET,HEAD,OPTIONS"
+    assert _dispatch("GET", "/missing")["statusCode"] == 404
+
+
+def test_head_runs_the_get_route_without_a_body():
+    resp = _dispatch("HEAD", "/stats", query={"year": "2026"})
+
+    assert resp["statusCode"] == 200
+    assert resp["body"] == ""
+    assert resp["headers"]["etag"]
+
+
+def test_path_params_reach_the_handler():
+    resp = _dispatch("DELETE", "/goals/g1", query={"year": "2026"})
+
+    assert resp["statusCode"] == 200
+    assert json.loads(resp["body"]) == {"ok": True}
+
+
+def test_metrics_are_keyed_by_route_name():
+    _dispatch("GET", "/stats", query={"year": "2026"})
+    _dispatch("GET", "/stats")
+    _dispatch("GET", "/missing")
+
+    snap = metrics.snapshot()
+    assert snap["stats.get"]["count"] == 2
+    assert snap["stats.get"]["clientErrors"] == 1
+    assert snap["stats.get"]["avgMs"] >= 0
+    assert snap["not_found"]["count"] == 1
+
+
+def test_remaining_time_reaches_routes_that_need_it():
+    from app.memtable import MemoryTable
+
+    sub = {"method": "POST", "path": "/books:bulk", "body": {"isbns": ["0306406152"]}}
+    resp = dispatch(
+        make_event(method="POST", path="/batch", body={"requests": [sub]}),
+        origin="*",
+        table=MemoryTable(),
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+        remaining_ms=lambda: 0,
+    )
+
+    body = json.loads(resp["body"])["responses"][0]["body"]
+    assert body["pending"] == ["0306406152"]
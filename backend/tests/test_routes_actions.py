@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 
-from app.routes.actions import post_action
+from app.routes.actions import get_actions, post_action
 
 from .conftest import FakeTable, make_event
 
@@ -21,7 +21,8 @@ def test_post_action_bjj_happy_path():
     body = json.loads(resp["body"])
     assert body["action"]["type"] == "BJJ"
     assert len(table.put_items) == 1
-    assert len(table.update_calls) == 1
+    # Yearly stats row plus the month and ISO-week buckets.
+    assert [c["Key"]["sk"] for c in table.update_calls] == ["STATS#2026", "STATS#2026#M01", "STATS#2026#W01"]
 
 
 def test_post_action_pilates_happy_path():
@@ -38,7 +39,7 @@ def test_post_action_pilates_happy_path():
     body = json.loads(resp["body"])
     assert body["action"]["type"] == "PILATES"
     assert len(table.put_items) == 1
-    assert len(table.update_calls) == 1
+    assert len(table.update_calls) == 3
 
 
 def test_post_action_read_requires_valid_isbn():
@@ -86,6 +87,343 @@ def test_post_action_read_happy_path_looks_up_book(monkeypatch):
 
     assert resp["statusCode"] == 201
     assert len(table.put_items) == 1
-    # One update for BOOK upsert + one update for STATS increment
-    assert len(table.update_calls) == 2
+    # One update for BOOK upsert + three for the STATS increments (year, month, week)
+    assert len(table.update_calls) == 4
+    # ...all committed together with the ACTION put.
+    assert len(table.transact_calls) == 1
+    assert len(table.transact_calls[0]["TransactItems"]) == 5
 
+
+def test_post_action_read_uses_cached_book_item(monkeypatch):
+    from app.routes import actions as actions_mod
+
+    def _no_network(isbn):
+        raise AssertionError("google_books_lookup must not be called for a cached book")
+
+    monkeypatch.setattr(actions_mod, "google_books_lookup", _no_network)
+
+    table = FakeTable(
+        items_by_sk={
+            "BOOK#9780132350884": {
+                "isbn": "9780132350884",
+                "title": "The Example Book",
+                "googleFetchedAt": "2025-12-31T00:00:00+00:00",
+            }
+        }
+    )
+    resp = post_action(
+        make_event(method="POST", path="/actions", body={"year": 2026, "type": "READ", "isbn": "9780132350884"}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+    )
+
+    assert resp["statusCode"] == 201
+    assert len(table.get_item_calls) == 1
+    assert len(table.put_items) == 1
+    # Only the STATS increments; the BOOK item is already current.
+    assert [c["Key"]["sk"].split("#")[0] for c in table.update_calls] == ["STATS"] * 3
+
+
+def test_get_actions_pages_with_signed_cursor():
+    last_key = {"pk": "USER#me", "sk": "ACTION#2026#2026-01-02T00:00:00+00:00#a1"}
+    table = FakeTable(
+        query_pages=[
+            {"Items": [{"year": 2026, "type": "BJJ", "ts": "2026-01-02T00:00:00+00:00"}], "LastEvaluatedKey": last_key},
+            {"Items": [{"year": 2026, "type": "SAVE", "ts": "2026-01-01T00:00:00+00:00", "amountCents": 100}]},
+        ]
+    )
+
+    first = get_actions(make_event(query={"year": "2026", "limit": "1"}), origin="*", table=table)
+    body = json.loads(first["body"])
+    assert [a["type"] for a in body["actions"]] == ["BJJ"]
+    assert body["nextCursor"]
+    assert "ExclusiveStartKey" not in table.query_calls[0]
+
+    second = get_actions(
+        make_event(query={"year": "2026", "limit": "1", "cursor": body["nextCursor"]}), origin="*", table=table
+    )
+    body = json.loads(second["body"])
+    assert [a["type"] for a in body["actions"]] == ["SAVE"]
+    assert body["nextCursor"] is None
+    assert table.query_calls[1]["ExclusiveStartKey"] == last_key
+
+
+def test_get_actions_rejects_cursor_from_another_year():
+    from app.cursor import encode_cursor
+
+    token = encode_cursor({"pk": "USER#me", "sk": "ACTION#2025#x"}, scope="actions:2025")
+    table = FakeTable()
+
+    resp = get_actions(make_event(query={"year": "2026", "cursor": token}), origin="*", table=table)
+
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error"] == "invalid cursor"
+    assert table.query_calls == []
+
+
+def test_get_actions_joins_books_with_one_batch_get():
+    read = {"type": "READ", "year": 2026, "ts": "2026-01-01T00:00:00+00:00"}
+    table = FakeTable(
+        query_pages=[
+            {
+                "Items": [
+                    {**read, "isbn": "9780132350884", "bookSk": "BOOK#9780132350884"},
+                    {**read, "isbn": "9780132350884", "bookSk": "BOOK#9780132350884"},
+                    {**read, "isbn": "0306406152"},
+                    {**read, "isbn": "9781111111111", "bookTitle": "Stored inline", "bookAuthors": ["X"]},
+                ]
+            }
+        ],
+        items_by_sk={
+            "BOOK#9780132350884": {"sk": "BOOK#9780132350884", "title": "Clean Code", "authors": ["Robert Martin"]},
+            "BOOK#0306406152": {"sk": "BOOK#0306406152", "title": "Other", "authors": []},
+        },
+    )
+
+    resp = get_actions(make_event(query={"year": "2026"}), origin="*", table=table)
+
+    actions = json.loads(resp["body"])["actions"]
+    assert [a["bookTitle"] for a in actions] == ["Clean Code", "Clean Code", "Other", "Stored inline"]
+    assert actions[0]["bookAuthors"] == ["Robert Martin"]
+    assert table.get_item_calls == []
+    assert len(table.batch_get_calls) == 1
+    request = next(iter(table.batch_get_calls[0]["RequestItems"].values()))
+    assert [k["sk"] for k in request["Keys"]] == ["BOOK#9780132350884", "BOOK#0306406152"]
+    assert sorted(request["ExpressionAttributeNames"].values()) == ["authors", "sk", "title"]
+
+
+def test_get_actions_sparse_fields_skip_book_join():
+    table = FakeTable(query_pages=[{"Items": [{"type": "READ", "ts": "2026-01-01", "isbn": "9780132350884"}]}])
+
+    resp = get_actions(make_event(query={"year": "2026", "fields": "ts,type"}), origin="*", table=table)
+
+    assert json.loads(resp["body"])["actions"] == [{"ts": "2026-01-01", "type": "READ"}]
+    assert sorted(table.query_calls[0]["ExpressionAttributeNames"].values()) == ["ts", "type"]
+    assert table.batch_get_calls == []
+
+
+def test_post_action_writes_action_and_stats_in_one_transaction():
+    table = FakeTable()
+
+    resp = post_action(
+        make_event(method="POST", path="/actions", body={"year": 2026, "type": "SAVE", "amountCents": 500}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+    )
+
+    assert resp["statusCode"] == 201
+    assert len(table.transact_calls) == 1
+    call = table.transact_calls[0]
+    assert [next(iter(op)) for op in call["TransactItems"]] == ["Put", "Update", "Update", "Update"]
+    assert call["ClientRequestToken"] == json.loads(resp["body"])["action"]["id"]
+
+
+def test_post_action_concurrent_write_mode_skips_transaction(monkeypatch):
+    monkeypatch.setenv("MULTI_WRITE_MODE", "concurrent")
+    table = FakeTable()
+
+    resp = post_action(
+        make_event(method="POST", path="/actions", body={"year": 2026, "type": "BJJ"}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+    )
+
+    assert resp["statusCode"] == 201
+    assert table.transact_calls == []
+    assert len(table.put_items) == 1
+    assert len(table.update_calls) == 3
+
+
+def test_post_actions_bulk_batches_writes_and_collapses_stats_per_year():
+    from app.routes.actions import post_actions_bulk
+
+    actions = [{"year": 2025, "type": "BJJ", "ts": f"2025-03-{d:02d}T12:00:00"} for d in range(1, 31)]
+    actions += [
+        {"year": 2025, "type": "SAVE", "amountCents": 250, "ts": "2025-12-31T08:00:00Z"},
+        {"year": 2026, "type": "PILATES", "ts": "2026-01-01T09:00:00Z"},
+    ]
+    table = FakeTable()
+
+    resp = post_actions_bulk(
+        make_event(method="POST", path="/actions:bulk", body={"actions": actions}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+    )
+
+    assert resp["statusCode"] == 201
+    body = json.loads(resp["body"])
+    assert body["imported"] == 32
+    assert body["stats"] == {"2025": {"bjjCount": 30, "savedCentsTotal": 250}, "2026": {"pilatesCount": 1}}
+    assert [len(next(iter(c["RequestItems"].values()))) for c in table.batch_write_calls] == [25, 7]
+    assert sum(p["Item"]["sk"].startswith("ACTION#") for p in table.put_items) == 32
+    # One transaction for the group's stats, guarded by its marker.
+    assert len(table.transact_calls) == 1
+    marker = table.transact_calls[0]["TransactItems"][0]["Put"]
+    assert marker["Item"]["sk"] == f"BULKSTATS#{body['requestId']}#0#0"
+    assert marker["ConditionExpression"] == "attribute_not_exists(sk)"
+    updates = {c["Key"]["sk"]: c["ExpressionAttributeValues"] for c in table.update_calls}
+    assert updates["STATS#2025"][":bjjCount"] == 30
+    assert updates["STATS#2026"] == {":u": "2026-01-01T00:00:00+00:00", ":pilatesCount": 1}
+    # Buckets follow each action's timestamp: March 2025 spans ISO weeks 9-13.
+    assert updates["STATS#2025#M03"][":bjjCount"] == 30
+    assert sum(updates[f"STATS#2025#W{w:02d}"][":bjjCount"] for w in range(9, 14)) == 30
+    # 2025-12-31 lies in ISO week 2026-W01, which is folded into 2025's last week.
+    assert updates["STATS#2025#M12"] == {":u": "2026-01-01T00:00:00+00:00", ":savedCentsTotal": 250}
+    assert updates["STATS#2025#W52"][":savedCentsTotal"] == 250
+    assert updates["STATS#2026#M01"] == {":u": "2026-01-01T00:00:00+00:00", ":pilatesCount": 1}
+    assert len(table.update_calls) == 2 + 3 + 7  # years + months + weeks
+
+
+def test_post_action_rejects_a_ts_outside_the_year():
+    table = FakeTable()
+    resp = post_action(
+        make_event(method="POST", path="/actions", body={"year": 2025, "type": "BJJ", "ts": "2026-01-02T10:00:00Z"}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-01-05T00:00:00+00:00",
+    )
+
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error"] == "ts must fall within year 2025"
+    assert table.transact_calls == []
+
+
+def test_post_actions_bulk_resumes_a_failed_import_without_duplicates(monkeypatch):
+    from app.memtable import MemoryTable
+    from app.routes import actions as actions_mod
+
+    class FlakyTable(MemoryTable):
+        fail_next_write = True
+
+        def batch_write_item(self, **kwargs):
+            # The second group: its first chunk lands, then the table gives up.
+            if self.calls.get("batch_write_item") == 3 and self.fail_next_write:
+                self.fail_next_write = False
+                raise RuntimeError("throttled")
+            return super().batch_write_item(**kwargs)
+
+    monkeypatch.setattr(actions_mod, "BULK_COMMIT_ACTIONS", 50)
+    actions = [
+        {"year": 2025, "type": "BJJ", "ts": f"2025-03-01T{h:02d}:{m:02d}:00"} for h in range(4) for m in range(30)
+    ]
+    table = FlakyTable()
+
+    def post(body):
+        resp = actions_mod.post_actions_bulk(
+            make_event(method="POST", path="/actions:bulk", body=body),
+            origin="*",
+            table=table,
+            now_iso=lambda: "2026-01-01T00:00:00+00:00",
+        )
+        return resp["statusCode"], json.loads(resp["body"])
+
+    status, body = post({"actions": actions})
+    assert status == 500
+    assert body["error"] == "bulk_write_failed"
+    assert (body["imported"], body["resumeFrom"], body["stats"]) == (50, 50, {"2025": {"bjjCount": 50}})
+    # 50 committed + the 25 that landed from the failed group (not counted yet).
+    assert sum(it["sk"].startswith("ACTION#") for it in table.items()) == 75
+
+    status, body = post({"actions": actions, "requestId": body["requestId"], "resumeFrom": body["resumeFrom"]})
+    assert status == 201
+    assert body["imported"] == 70
+    assert sum(it["sk"].startswith("ACTION#") for it in table.items()) == 120
+    assert table.get_item(Key={"pk": "USER#me", "sk": "STATS#2025"})["Item"]["bjjCount"] == 120
+
+
+def test_post_actions_bulk_resend_after_a_stats_failure_counts_once(monkeypatch):
+    from app.memtable import MemoryTable
+    from app.routes import actions as actions_mod
+
+    class FlakyTable(MemoryTable):
+        fail_next_transaction = True
+
+        def transact_write_items(self, **kwargs):
+            # The group's second stats transaction fails; the first has committed.
+            if self.calls.get("transact_write_items") == 1 and self.fail_next_transaction:
+                self.fail_next_transaction = False
+                raise RuntimeError("throttled")
+            return super().transact_write_items(**kwargs)
+
+    monkeypatch.setattr(actions_mod, "BULK_STATS_PER_TRANSACTION", 2)
+    actions = [{"year": 2025, "type": "BJJ", "ts": f"2025-0{m}-02T10:00:00Z"} for m in range(1, 4)]
+    table = FlakyTable()
+
+    def post(body):
+        resp = actions_mod.post_actions_bulk(
+            make_event(method="POST", path="/actions:bulk", body=body),
+            origin="*",
+            table=table,
+            now_iso=lambda: "2026-01-01T00:00:00+00:00",
+        )
+        return resp["statusCode"], json.loads(resp["body"])
+
+    status, body = post({"actions": actions, "requestId": "import-1"})
+    assert status == 500
+    assert (body["error"], body["resumeFrom"], body["imported"]) == ("stats_update_failed", 0, 0)
+
+    # Resending the same body, before or after it succeeds, neither duplicates nor recounts.
+    for _ in range(2):
+        status, body = post({"actions": actions, "requestId": "import-1", "resumeFrom": body.get("resumeFrom", 0)})
+        assert status == 201
+    assert sum(it["sk"].startswith("ACTION#") for it in table.items()) == 3
+
+    def count(sk):
+        return table.get_item(Key={"pk": "USER#me", "sk": sk})["Item"]["bjjCount"]
+
+    assert count("STATS#2025") == 3
+    assert [count(f"STATS#2025#M0{m}") for m in range(1, 4)] == [1, 1, 1]
+    assert count("STATS#2025#W05") == 1
+
+
+def test_post_actions_bulk_rejects_a_boolean_resume_from():
+    from app.routes.actions import post_actions_bulk
+
+    resp = post_actions_bulk(
+        make_event(
+            method="POST",
+            path="/actions:bulk",
+            body={"actions": [{"year": 2026, "type": "BJJ", "ts": "2026-01-05T09:00:00Z"}], "resumeFrom": True},
+        ),
+        origin="*",
+        table=FakeTable(),
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+    )
+
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error"] == "resumeFrom must be an index into actions"
+
+
+def test_post_actions_bulk_validates_everything_before_writing():
+    from app.routes.actions import post_actions_bulk
+
+    table = FakeTable()
+    resp = post_actions_bulk(
+        make_event(
+            method="POST",
+            path="/actions:bulk",
+            body={
+                "actions": [
+                    {"year": 2026, "type": "BJJ"},
+                    {"year": 2026, "type": "SAVE", "ts": "2026-01-01T09:00:00Z"},
+                    "nope",
+                ]
+            },
+        ),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+    )
+
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["errors"] == [
+        {"index": 0, "error": "ts is required"},
+        {"index": 1, "error": "SAVE requires integer amountCents"},
+        {"index": 2, "error": "must be an object"},
+    ]
+    assert table.batch_write_calls == []
+    assert table.update_calls == []
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+
+from app.router import dispatch
+
+from .conftest import FakeTable, make_event
+
+
+def _batch(table, requests):
+    resp = dispatch(
+        make_event(method="POST", path="/batch", body={"requests": requests}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-01-01T00:00:00+00:00",
+    )
+    return resp["statusCode"], json.loads(resp["body"])
+
+
+def test_batch_runs_sub_requests_and_keeps_order():
+    table = FakeTable(get_item_result={"Item": {"bjjCount": 3}})
+
+    status, body = _batch(
+        table,
+        [
+            {"id": "stats", "method": "GET", "path": "/stats?year=2026"},
+            {"id": "log", "method": "POST", "path": "/actions", "body": {"year": 2026, "type": "BJJ"}},
+            {"id": "missing", "method": "GET", "path": "/nope"},
+        ],
+    )
+
+    assert status == 200
+    responses = body["responses"]
+    assert [r["id"] for r in responses] == ["stats", "log", "missing"]
+    assert [r["status"] for r in responses] == [200, 201, 404]
+    assert responses[0]["body"]["stats"]["bjjCount"] == 3
+    assert len(table.put_items) == 1
+
+
+def test_batch_query_object_is_merged_into_path_query():
+    table = FakeTable()
+
+    status, body = _batch(table, [{"method": "GET", "path": "/stats", "query": {"year": "2026"}}])
+
+    assert status == 200
+    assert body["responses"][0]["status"] == 200
+
+
+def test_batch_rejects_nested_batch():
+    for path in ("/batch", "/batch/", "/batch/?x=1"):
+        status, body = _batch(FakeTable(), [{"method": "POST", "path": path, "body": {"requests": []}}])
+
+        assert status == 400
+        assert body["error"] == "requests[0]: nested /batch is not allowed"
+
+
+def test_batch_passes_non_json_bodies_through():
+    table = FakeTable(query_pages=[{"Items": [{"sk": "ACTION#2026#a", "type": "BJJ", "ts": "2026-01-05T09:00:00Z"}]}])
+
+    status, body = _batch(
+        table,
+        [
+            {"id": "csv", "method": "GET", "path": "/actions/export?year=2026&format=csv"},
+            {"id": "stats", "method": "GET", "path": "/stats?year=2026"},
+        ],
+    )
+
+    assert status == 200
+    export, stats = body["responses"]
+    assert export["status"] == 200
+    assert export["isBase64Encoded"] is False
+    assert export["headers"]["content-type"].startswith("text/csv")
+    assert "BJJ" in export["body"]
+    assert stats["status"] == 200 and "headers" not in stats
+
+
+def test_batch_rejects_empty_and_oversized_lists():
+    status, _ = _batch(FakeTable(), [])
+    assert status == 400
+
+    status, body = _batch(FakeTable(), [{"method": "GET", "path": "/stats?year=2026"}] * 11)
+    assert status == 400
+    assert body["error"] == "at most 10 requests per batch"
+
+
+def test_batch_sub_requests_carry_etags_and_honor_if_none_match():
+    table = FakeTable(get_item_result={"Item": {"bjjCount": 3}})
+
+    _, first = _batch(table, [{"method": "GET", "path": "/stats?year=2026"}])
+    etag = first["responses"][0]["etag"]
+
+    _, second = _batch(
+        table,
+        [
+            {"method": "GET", "path": "/stats?year=2026", "ifNoneMatch": etag},
+            {"method": "GET", "path": "/stats?year=2025", "ifNoneMatch": etag},
+        ],
+    )
+    assert [r["status"] for r in second["responses"]] == [304, 200]
+    assert second["responses"][0]["body"] is None
@@ -52,3 +52,233 @@ def test_post_book_happy_path_looks_up_book(monkeypatch):
     assert resp["statusCode"] == 201
     assert len(table.update_calls) == 1
 
+
+def test_get_books_returns_next_cursor_and_resumes_from_it():
+    from app.routes.books import get_books
+
+    last_key = {"pk": "USER#me", "sk": "BOOK#9780132350884"}
+    table = FakeTable(query_pages=[{"Items": [{"isbn": "9780132350884", "title": "A"}], "LastEvaluatedKey": last_key}])
+
+    resp = get_books(make_event(query={"limit": "1"}), origin="*", table=table)
+    body = json.loads(resp["body"])
+    assert [b["isbn"] for b in body["books"]] == ["9780132350884"]
+
+    get_books(make_event(query={"limit": "1", "cursor": body["nextCursor"]}), origin="*", table=table)
+    assert table.query_calls[1]["ExclusiveStartKey"] == last_key
+
+
+def test_get_books_default_projection_skips_volume_info():
+    from app.routes.books import get_books
+
+    table = FakeTable()
+    get_books(make_event(), origin="*", table=table)
+
+    names = table.query_calls[0]["ExpressionAttributeNames"].values()
+    assert "googleVolumeInfo" not in names
+    assert "title" in names
+
+
+def test_get_books_sparse_fields_project_and_trim_response():
+    from app.routes.books import get_books
+
+    table = FakeTable(query_pages=[{"Items": [{"isbn": "9780132350884", "title": "A"}]}])
+    resp = get_books(make_event(query={"fields": "title,isbn"}), origin="*", table=table)
+
+    assert json.loads(resp["body"])["books"] == [{"title": "A", "isbn": "9780132350884"}]
+    call = table.query_calls[0]
+    assert sorted(call["ExpressionAttributeNames"].values()) == ["isbn", "title"]
+    assert call["ProjectionExpression"] == ", ".join(call["ExpressionAttributeNames"])
+
+
+def test_get_books_rejects_unknown_field():
+    from app.routes.books import get_books
+
+    table = FakeTable()
+    resp = get_books(make_event(query={"fields": "title,googleVolumeInfo"}), origin="*", table=table)
+
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error"].startswith("unknown fields: googleVolumeInfo")
+    assert table.query_calls == []
+
+
+def _bulk_table():
+    from app.memtable import MemoryTable
+
+    table = MemoryTable()
+    table.put_item(
+        Item={
+            "pk": "USER#me",
+            "sk": "BOOK#9780132350884",
+            "isbn": "9780132350884",
+            "title": "In library",
+            "googleFetchedAt": "2026-02-20T00:00:00+00:00",
+            "inLibrary": True,
+        }
+    )
+    table.put_item(
+        Item={
+            "pk": "USER#me",
+            "sk": "BOOK#9780201633610",
+            "isbn": "9780201633610",
+            "title": "Read, not added",
+            "googleFetchedAt": "2026-02-20T00:00:00+00:00",
+        }
+    )
+    table.put_item(Item={"pk": "USER#me", "sk": "BOOKMISS#0000000000", "checkedAt": "2026-02-28T12:00:00+00:00"})
+    return table
+
+
+def _bulk(monkeypatch, table, isbns, *, lookup, remaining_ms=None):
+    from app.routes import books as books_mod
+
+    monkeypatch.setenv("GOOGLE_BOOKS_RATE_PER_SECOND", "1000")
+    monkeypatch.setattr(books_mod, "_lookup_executor", None)
+    monkeypatch.setattr(books_mod, "_lookup_bucket", None)
+    monkeypatch.setattr(books_mod, "google_books_lookup", lookup)
+    resp = books_mod.post_books_bulk(
+        make_event(method="POST", path="/books:bulk", body={"isbns": isbns}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-03-01T00:00:00+00:00",
+        remaining_ms=remaining_ms,
+    )
+    return resp["statusCode"], json.loads(resp["body"])
+
+
+def test_post_books_bulk_dedupes_uses_the_cache_and_batches_writes(monkeypatch):
+    table = _bulk_table()
+    looked_up = []
+
+    def lookup(isbn):
+        looked_up.append(isbn)
+        if isbn == "9781449373320":
+            return None
+        if isbn == "9780596007126":
+            raise TimeoutError("slow")
+        return {"title": f"Book {isbn}", "authors": ["A"], "googleVolumeInfo": {"title": "x"}}
+
+    isbns = [
+        "978-0132350884",
+        "9780201633610",
+        "000000000-0",
+        "nope",
+        "978-1-4493-7332-0",
+        "9780596007126",
+        "0-306-40615-2",
+        "0306406152",
+    ]
+    status, body = _bulk(monkeypatch, table, isbns, lookup=lookup)
+
+    assert status == 200
+    assert [(r["isbn"], r["status"]) for r in body["results"]] == [
+        ("9780132350884", "exists"),
+        ("9780201633610", "added"),
+        ("0000000000", "not_found"),
+        (None, "invalid"),
+        ("9781449373320", "not_found"),
+        ("9780596007126", "failed"),
+        ("0306406152", "added"),
+        ("0306406152", "duplicate"),
+    ]
+    assert body["results"][1]["source"] == "cache"
+    assert body["results"][6]["source"] == "google"
+    assert body["complete"] is True and body["pending"] == []
+    assert sorted(looked_up) == ["0306406152", "9780596007126", "9781449373320"]
+    # One batched read of the cache, one batched write of the new BOOK and BOOKMISS items.
+    assert table.calls["batch_get_item"] == 1
+    assert table.calls["batch_write_item"] == 1
+    assert "update_item" not in table.calls
+    stored = {it["sk"]: it for it in table.items()}
+    assert stored["BOOK#0306406152"]["inLibrary"] is True
+    assert stored["BOOK#9780201633610"]["inLibrary"] is True
+    assert "BOOKMISS#9781449373320" in stored
+
+
+def test_post_books_bulk_leaves_work_past_the_deadline_pending(monkeypatch):
+    table = _bulk_table()
+    looked_up = []
+
+    status, body = _bulk(
+        monkeypatch,
+        table,
+        ["0306406152", "9781449373320", "9780132350884"],
+        lookup=lambda isbn: looked_up.append(isbn) or {"title": "T"},
+        remaining_ms=lambda: 500,
+    )
+
+    assert status == 200
+    assert looked_up == []
+    assert body["pending"] == ["0306406152", "9781449373320"]
+    assert body["complete"] is False
+    assert body["counts"] == {"pending": 2, "exists": 1}
+
+    # Resuming with the pending list (and enough time) finishes the import.
+    status, body = _bulk(monkeypatch, table, body["pending"], lookup=lambda isbn: {"title": "T"})
+    assert body["counts"] == {"added": 2} and body["complete"] is True
+
+
+def test_post_books_bulk_adds_stale_books_when_google_fails(monkeypatch):
+    monkeypatch.setenv("BOOK_CACHE_TTL_SECONDS", "86400")
+    table = _bulk_table()
+
+    def lookup(isbn):
+        raise TimeoutError("slow")
+
+    status, body = _bulk(monkeypatch, table, ["9780201633610", "0306406152"], lookup=lookup)
+
+    assert status == 200
+    assert [(r["status"], r.get("source")) for r in body["results"]] == [("added", "stale"), ("failed", None)]
+    stored = table.get_item(Key={"pk": "USER#me", "sk": "BOOK#9780201633610"})["Item"]
+    # Written back whole: only the library flag and updatedAt change.
+    assert stored["inLibrary"] is True and stored["title"] == "Read, not added"
+    assert stored["googleFetchedAt"] == "2026-02-20T00:00:00+00:00"
+
+
+def test_post_books_bulk_keeps_stale_books_google_no_longer_finds(monkeypatch):
+    monkeypatch.setenv("BOOK_CACHE_TTL_SECONDS", "86400")
+    table = _bulk_table()
+
+    status, body = _bulk(monkeypatch, table, ["9780201633610", "0306406152"], lookup=lambda isbn: None)
+
+    assert status == 200
+    assert [(r["status"], r.get("source")) for r in body["results"]] == [("added", "stale"), ("not_found", None)]
+    assert table.get_item(Key={"pk": "USER#me", "sk": "BOOK#9780201633610"})["Item"]["inLibrary"] is True
+    assert "Item" not in table.get_item(Key={"pk": "USER#me", "sk": "BOOKMISS#9780201633610"})
+    assert "Item" in table.get_item(Key={"pk": "USER#me", "sk": "BOOKMISS#0306406152"})
+
+
+def test_post_books_bulk_writes_in_chunks_and_reports_failed_chunks(monkeypatch):
+    from app.memtable import MemoryTable
+
+    class FlakyTable(MemoryTable):
+        chunks = []
+
+        def batch_write_item(self, **kwargs):
+            self.chunks.append(len(next(iter(kwargs["RequestItems"].values()))))
+            if self.chunks[-1] == 25:
+                raise RuntimeError("throttled")
+            return super().batch_write_item(**kwargs)
+
+    table = FlakyTable()
+    # ISBN-10s 0-306-40615-2 style: 9 digits plus a mod-11 check digit.
+    isbns = []
+    for n in range(30):
+        body = f"030640{n:03d}"
+        check = (11 - sum((10 - i) * int(d) for i, d in enumerate(body)) % 11) % 11
+        isbns.append(body + ("X" if check == 10 else str(check)))
+
+    status, body = _bulk(monkeypatch, table, isbns, lookup=lambda isbn: {"title": f"Book {isbn}"})
+
+    assert status == 200
+    assert table.chunks == [25, 5]
+    assert body["counts"] == {"added": 5, "failed": 25}
+    failed = {r["isbn"] for r in body["results"] if r["status"] == "failed"}
+    assert all(r["error"] == "write_failed" and "source" not in r for r in body["results"] if r["status"] == "failed")
+    assert {it["isbn"] for it in table.items()} == set(isbns) - failed
+
+
+def test_post_books_bulk_validates_the_body(monkeypatch):
+    status, body = _bulk(monkeypatch, FakeTable(), [], lookup=lambda isbn: None)
+    assert status == 400
+    status, body = _bulk(monkeypatch, FakeTable(), ["1"] * 501, lookup=lambda isbn: None)
+    assert status == 400 and body["error"] == "at most 500 isbns per request"
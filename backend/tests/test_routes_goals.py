@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 
-from app.routes.goals import delete_goal, patch_goal, post_goal
+from app.routes.goals import delete_goal, get_goals, patch_goal, post_goal, post_goals_auto_complete
 
 from .conftest import FakeTable, make_event
 
@@ -72,3 +72,88 @@ def test_delete_goal_requires_year_query_param():
     assert json.loads(resp["body"])["error"].startswith("year is required")
     assert len(table.delete_calls) == 0
 
+
+def _goals_table(*goals):
+    return FakeTable(
+        query_pages=[{"Items": list(goals)}],
+        items_by_sk={"STATS#2026": {"bjjCount": 25, "savedCentsTotal": 50000}},
+    )
+
+
+def test_get_goals_computes_progress_from_the_stats_row():
+    table = _goals_table(
+        {"sk": "GOAL#2026#g1", "year": 2026, "kind": "BJJ_SESSIONS", "target": 100, "status": "doing"},
+        {"sk": "GOAL#2026#g2", "year": 2026, "title": "Learn to juggle", "status": "todo"},
+    )
+
+    resp = get_goals(
+        make_event(method="GET", path="/goals", query={"year": "2026"}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-02-19T10:00:00+00:00",  # day 50 of the year
+    )
+
+    assert resp["statusCode"] == 200
+    goals = {g["id"]: g for g in json.loads(resp["body"])["goals"]}
+    assert goals["g1"]["progress"] == {
+        "value": 25,
+        "target": 100,
+        "percent": 25,
+        "remaining": 75,
+        "daysLeft": 316,
+        "pacePerDay": 0.24,
+        # 25 sessions in 50 days -> 0.5/day -> 150 more days.
+        "projectedCompletion": "2026-07-19",
+        "onTrack": True,
+    }
+    assert goals["g2"]["progress"] is None
+    # Only the counters the goals need are read.
+    assert [c["Key"]["sk"] for c in table.get_item_calls] == ["STATS#2026"]
+    assert list(table.get_item_calls[0]["ExpressionAttributeNames"].values()) == ["bjjCount"]
+
+
+def test_auto_complete_marks_reached_goals_done():
+    table = _goals_table(
+        {"sk": "GOAL#2026#g1", "year": 2026, "kind": "MONEY_SAVED_CENTS", "target": 40000, "status": "doing"},
+        {"sk": "GOAL#2026#g2", "year": 2026, "kind": "BJJ_SESSIONS", "target": 100, "status": "doing"},
+    )
+
+    resp = post_goals_auto_complete(
+        make_event(method="POST", path="/goals:autoComplete", body={"year": 2026}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-02-19T10:00:00+00:00",
+    )
+
+    assert resp["statusCode"] == 200
+    assert json.loads(resp["body"]) == {"completed": ["g1"]}
+    assert [c["Key"]["sk"] for c in table.update_calls] == ["GOAL#2026#g1"]
+
+
+def test_get_goals_never_writes_and_floors_percent():
+    table = _goals_table({"sk": "GOAL#2026#g1", "year": 2026, "kind": "BJJ_SESSIONS", "target": 33})
+
+    resp = get_goals(
+        make_event(method="GET", path="/goals", query={"year": "2026", "autoComplete": "1"}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-02-19T10:00:00+00:00",
+    )
+
+    # 25/33 is 75.8%: floored, so a goal never shows 100 before it is reached.
+    assert json.loads(resp["body"])["goals"][0]["progress"]["percent"] == 75
+    assert table.update_calls == []
+
+
+def test_get_goals_skips_stats_when_progress_is_not_requested():
+    table = _goals_table({"sk": "GOAL#2026#g1", "year": 2026, "kind": "BJJ_SESSIONS", "target": 100})
+
+    resp = get_goals(
+        make_event(method="GET", path="/goals", query={"year": "2026", "fields": "id,status"}),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-02-19T10:00:00+00:00",
+    )
+
+    assert json.loads(resp["body"])["goals"] == [{"id": "g1", "status": "todo"}]
+    assert table.get_item_calls == []
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+
+from app.counters import bucket_sks
+from app.routes.stats import get_stats_series
+
+from .conftest import FakeTable, make_event
+
+
+def test_bucket_sks_use_the_timestamps_calendar_date():
+    assert bucket_sks(2026, "2026-03-15T23:30:00-05:00") == ["STATS#2026#M03", "STATS#2026#W11"]
+    # Jan 1 2027 is a Friday of ISO week 2026-W53: it counts in 2027's first week.
+    assert bucket_sks(2027, "2027-01-01") == ["STATS#2027#M01", "STATS#2027#W01"]
+    # Dec 29 2025 is a Monday of ISO week 2026-W01: it counts in 2025's last week.
+    assert bucket_sks(2025, "2025-12-29") == ["STATS#2025#M12", "STATS#2025#W52"]
+    assert bucket_sks(2026, "yesterday") == []
+
+
+def test_bucket_sks_fold_the_week_straddling_new_year_into_the_actions_year():
+    # ISO week 2026-W01 runs Mon Dec 29 2025 to Sun Jan 4 2026.
+    for day in ("2025-12-29", "2025-12-30", "2025-12-31"):
+        assert bucket_sks(2025, f"{day}T20:00:00Z") == ["STATS#2025#M12", "STATS#2025#W52"]
+    for day in ("2026-01-01", "2026-01-02", "2026-01-03"):
+        assert bucket_sks(2026, f"{day}T08:00:00Z") == ["STATS#2026#M01", "STATS#2026#W01"]
+    # ISO week 2020-W53 runs into Jan 3 2021: those days count in 2021's first week.
+    assert bucket_sks(2020, "2020-12-31") == ["STATS#2020#M12", "STATS#2020#W53"]
+    assert bucket_sks(2021, "2021-01-03") == ["STATS#2021#M01", "STATS#2021#W01"]
+
+
+def test_get_stats_series_is_one_range_query_with_dense_months():
+    table = FakeTable(
+        query_pages=[
+            {
+                "Items": [
+                    {"sk": "STATS#2026#M01", "bjjCount": 4, "updatedAt": "2026-01-30T00:00:00+00:00"},
+                    {"sk": "STATS#2026#M03", "savedCentsTotal": 1500},
+                ]
+            }
+        ]
+    )
+
+    resp = get_stats_series(
+        make_event(method="GET", path="/stats/series", query={"year": "2026"}), origin="*", table=table
+    )
+
+    assert resp["statusCode"] == 200
+    body = json.loads(resp["body"])
+    assert body["granularity"] == "month"
+    assert [row["bucket"] for row in body["series"]] == [f"2026-{m:02d}" for m in range(1, 13)]
+    assert body["series"][0]["bjjCount"] == 4
+    assert body["series"][1]["bjjCount"] == 0
+    assert body["series"][2]["savedCentsTotal"] == 1500
+    assert len(table.query_calls) == 1
+    assert table.query_calls[0]["ExpressionAttributeValues"][":prefix"] == "STATS#2026#M"
+
+
+def test_get_stats_series_weeks_cover_the_iso_year():
+    table = FakeTable(query_pages=[{"Items": [{"sk": "STATS#2026#W53", "pilatesCount": 2}]}])
+
+    resp = get_stats_series(
+        make_event(method="GET", path="/stats/series", query={"year": "2026", "granularity": "week"}),
+        origin="*",
+        table=table,
+    )
+
+    series = json.loads(resp["body"])["series"]
+    assert len(series) == 53
+    assert series[-1] == {
+        "bucket": "2026-W53",
+        "week": 53,
+        "bjjCount": 0,
+        "pilatesCount": 2,
+        "savedCentsTotal": 0,
+        "readBooksTotal": 0,
+        "readCount": 0,
+        "updatedAt": None,
+    }
+
+
+def test_get_stats_series_rejects_unknown_granularity():
+    resp = get_stats_series(
+        make_event(method="GET", path="/stats/series", query={"year": "2026", "granularity": "day"}),
+        origin="*",
+        table=FakeTable(),
+    )
+
+    assert resp["statusCode"] == 400
+
+
+def test_dispatch_answers_conditional_get_with_304(monkeypatch):
+    from app.router import dispatch
+
+    monkeypatch.setenv("CACHE_CONTROL_STATS", "private, max-age=30")
+    table = FakeTable(get_item_result={"Item": {"bjjCount": 3, "updatedAt": "2026-01-02T00:00:00+00:00"}})
+
+    event = make_event(method="GET", path="/stats", query={"year": "2026"})
+    first = dispatch(event, origin="*", table=table, now_iso=None)
+    assert first["headers"]["cache-control"] == "private, max-age=30"
+
+    second = dispatch(
+        make_event(
+            method="GET", path="/stats", query={"year": "2026"}, headers={"if-none-match": first["headers"]["etag"]}
+        ),
+        origin="*",
+        table=table,
+        now_iso=None,
+    )
+    assert second["statusCode"] == 304
+    assert second["body"] == ""
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.memtable import DynamoDBError, MemoryTable
+from app.router import dispatch
+from app.sqlitetable import SqliteTable
+from app.stats_rebuild import rebuild_stats
+
+from .conftest import make_event
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def table(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryTable()
+        return
+    t = SqliteTable(str(tmp_path / "t.sqlite3"))
+    yield t
+    t.close()
+
+
+def _call(table, method, path, body=None, query=None):
+    resp = dispatch(
+        make_event(method=method, path=path, body=body, query=query),
+        origin="*",
+        table=table,
+        now_iso=lambda: "2026-03-01T10:00:00+00:00",
+    )
+    return resp["statusCode"], json.loads(resp["body"])
+
+
+def test_routes_behave_the_same_on_every_storage(table):
+    for body in (
+        {"year": 2026, "type": "BJJ", "ts": "2026-01-05T09:00:00Z"},
+        {"year": 2026, "type": "SAVE", "amountCents": 250, "ts": "2026-02-01T09:00:00Z"},
+        {"year": 2026, "type": "BJJ", "ts": "2026-02-03T09:00:00Z"},
+        {"year": 2025, "type": "BJJ", "ts": "2025-12-30T09:00:00Z"},
+    ):
+        assert _call(table, "POST", "/actions", body)[0] == 201
+
+    status, page = _call(table, "GET", "/actions", query={"year": "2026", "limit": "2"})
+    assert status == 200
+    assert [a["ts"] for a in page["actions"]] == ["2026-02-03T09:00:00Z", "2026-02-01T09:00:00Z"]
+    status, rest = _call(table, "GET", "/actions", query={"year": "2026", "limit": "2", "cursor": page["nextCursor"]})
+    assert [a["ts"] for a in rest["actions"]] == ["2026-01-05T09:00:00Z"]
+    assert rest["nextCursor"] is None
+
+    stats = _call(table, "GET", "/stats", query={"year": "2026"})[1]["stats"]
+    assert (stats["bjjCount"], stats["savedCentsTotal"]) == (2, 250)
+    series = _call(table, "GET", "/stats/series", query={"year": "2026"})[1]["series"]
+    assert [row["bjjCount"] for row in series[:3]] == [1, 1, 0]
+
+
+def test_sqlite_table_persists_and_uses_wal(tmp_path):
+    path = str(tmp_path / "t.sqlite3")
+    table = SqliteTable(path)
+    table.put_item(Item={"pk": "USER#me", "sk": "BOOK#1", "tags": {"a", "b"}, "n": 1.5})
+    assert table._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    table.close()
+
+    reopened = SqliteTable(path)
+    assert reopened.get_item(Key={"pk": "USER#me", "sk": "BOOK#1"})["Item"] == {
+        "pk": "USER#me",
+        "sk": "BOOK#1",
+        "tags": {"a", "b"},
+        "n": 1.5,
+    }
+    reopened.close()
+
+
+def test_books_with_binary_volume_info_round_trip(tmp_path, monkeypatch):
+    from app.routes import actions as actions_mod
+    from app.routes import books as books_mod
+
+    def lookup(isbn):
+        return {"title": "Clean Code", "authors": ["Robert C. Martin"], "googleVolumeInfo": {"title": "Clean Code"}}
+
+    monkeypatch.setattr(books_mod, "google_books_lookup", lookup)
+    monkeypatch.setattr(actions_mod, "google_books_lookup", lookup)
+    table = SqliteTable(str(tmp_path / "t.sqlite3"))
+
+    assert _call(table, "POST", "/books", {"isbn": "9780132350884"})[0] == 201
+    body = {"year": 2026, "type": "READ", "isbn": "9780132350884", "ts": "2026-01-05T09:00:00Z"}
+    assert _call(table, "POST", "/actions", body)[0] == 201
+
+    stored = table.get_item(Key={"pk": "USER#me", "sk": "BOOK#9780132350884"})["Item"]
+    assert isinstance(stored["googleVolumeInfoZ"], bytes)
+    status, books = _call(table, "GET", "/books")
+    assert status == 200
+    assert [b["title"] for b in books["books"]] == ["Clean Code"]
+    status, page = _call(table, "GET", "/actions", query={"year": "2026"})
+    assert status == 200
+    assert page["actions"][0]["bookTitle"] == "Clean Code"
+    table.close()
+
+
+def test_sqlite_transactions_roll_back(tmp_path):
+    table = SqliteTable(str(tmp_path / "t.sqlite3"))
+    ops = [
+        {"Put": {"Item": {"pk": "USER#me", "sk": "ACTION#1"}}},
+        {"ConditionCheck": {"Key": {"pk": "USER#me", "sk": "GOAL#1"}, "ConditionExpression": "attribute_exists(pk)"}},
+    ]
+    with pytest.raises(DynamoDBError):
+        table.transact_write_items(TransactItems=ops)
+    assert table.items() == []
+    table.close()
+
+
+def test_stats_rebuild_uses_the_sql_aggregate(tmp_path):
+    table = SqliteTable(str(tmp_path / "t.sqlite3"))
+    for i, (kind, extra) in enumerate([("BJJ", {}), ("READ", {}), ("SAVE", {"amountCents": 700}), ("SAVE", {})]):
+        table.put_item(Item={"pk": "USER#me", "sk": f"ACTION#2026#2026-01-0{i + 1}#x", "type": kind, **extra})
+    table.put_item(Item={"pk": "USER#me", "sk": "ACTION#2027#2027-01-01#x", "type": "BJJ"})
+    table.put_item(Item={"pk": "USER#me", "sk": "STATS#2026", "bjjCount": 3})
+
+    result = rebuild_stats(table, 2026, apply=True, now="2026-03-01T00:00:00Z")
+
+    assert result["computed"] == {
+        "bjjCount": 1,
+        "pilatesCount": 0,
+        "savedCentsTotal": 700,
+        "readBooksTotal": 1,
+        "readCount": 1,
+    }
+    assert result["applied"] is True
+    assert table.calls.get("query") is None
+    assert table.get_item(Key={"pk": "USER#me", "sk": "STATS#2026"})["Item"]["bjjCount"] == 1
+    table.close()
+
+
+def test_queries_are_primary_key_range_scans(tmp_path):
+    table = SqliteTable(str(tmp_path / "t.sqlite3"))
+    conn = table._conn
+    # No secondary indexes: writes only maintain the primary key.
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall() == []
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT type, COUNT(*) FROM items WHERE pk = ? AND sk >= ? AND sk < ? GROUP BY type",
+        ("USER#me", "ACTION#2026#", "ACTION#2026$"),
+    ).fetchall()
+    assert any("PRIMARY KEY (pk=? AND sk>? AND sk<?)" in row[-1] for row in plan)
+    table.close()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from app.ratelimit import TokenBucket
+from app.stats_rebuild import rebuild_stats, sk_segments
+
+from .conftest import FakeTable
+
+NOW = "2026-06-01T00:00:00+00:00"
+ACTIONS = {
+    "Items": [
+        {"type": "BJJ"},
+        {"type": "BJJ"},
+        {"type": "SAVE", "amountCents": 700},
+        {"type": "READ"},
+    ],
+    "ConsumedCapacity": {"CapacityUnits": 2.5},
+}
+
+
+class _ConditionalFailure(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+def test_sk_segments_cover_the_year_contiguously():
+    ranges = sk_segments(2026, 4)
+
+    assert ranges[0][0] == "ACTION#2026#"
+    assert ranges[-1][1] == "ACTION#2026#\uffff"
+    assert [hi for _, hi in ranges[:-1]] == [lo for lo, _ in ranges[1:]]
+    assert [lo for lo, _ in ranges[1:]] == ["ACTION#2026#2026-04", "ACTION#2026#2026-07", "ACTION#2026#2026-10"]
+    assert len(sk_segments(2026, 99)) == 12
+
+
+def test_dry_run_reports_diff_without_writing():
+    table = FakeTable(get_item_result={"Item": {"bjjCount": 5, "readCount": 1, "readBooksTotal": 1}}, query_pages=[ACTIONS])
+
+    result = rebuild_stats(table, 2026, segments=1, now=NOW)
+
+    assert result["computed"] == {
+        "bjjCount": 2,
+        "pilatesCount": 0,
+        "savedCentsTotal": 700,
+        "readBooksTotal": 1,
+        "readCount": 1,
+    }
+    assert result["diff"] == {"bjjCount": -3, "savedCentsTotal": 700}
+    assert result["scanned"] == 4
+    assert result["consumedRcu"] == 2.5
+    assert result["applied"] is False
+    assert table.update_calls == []
+    assert table.query_calls[0]["ConsistentRead"] is True
+
+
+def test_apply_writes_corrections_conditioned_on_the_row_read():
+    table = FakeTable(get_item_result={"Item": {"bjjCount": 5}}, query_pages=[ACTIONS])
+
+    result = rebuild_stats(table, 2026, apply=True, segments=1, now=NOW)
+
+    assert result["applied"] is True
+    call = table.update_calls[0]
+    assert call["Key"]["sk"] == "STATS#2026"
+    assert call["ExpressionAttributeValues"][":bjjCount"] == 2
+    assert call["ExpressionAttributeValues"][":old_bjjCount"] == 5
+    assert "#bjjCount = :old_bjjCount" in call["ConditionExpression"]
+    assert "attribute_not_exists(#pilatesCount)" in call["ConditionExpression"]
+
+
+def test_apply_reports_conflict_when_row_changed_meanwhile():
+    class RacingTable(FakeTable):
+        def update_item(self, **kwargs):
+            raise _ConditionalFailure()
+
+    table = RacingTable(get_item_result={"Item": {"bjjCount": 5}}, query_pages=[ACTIONS])
+
+    result = rebuild_stats(table, 2026, apply=True, segments=1, now=NOW)
+
+    assert result["conflict"] is True
+    assert result["applied"] is False
+
+
+def test_token_bucket_charges_actual_usage_and_waits_off_debt():
+    clock = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    bucket = TokenBucket(10, clock=lambda: clock[0], sleep=sleep)
+    bucket.acquire(10)
+    bucket.acquire(25)  # waits for a full bucket, then goes 15 tokens into debt
+    bucket.acquire(1)  # waits 1.5s for the debt to clear
+    assert sleeps == [1.0, 1.5]
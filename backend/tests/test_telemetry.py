@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import handler as lambda_handler
+from app import telemetry
+
+from .conftest import FakeTable, make_event
+
+
+def test_span_is_a_shared_noop_outside_a_request():
+    assert telemetry.span("ddb") is telemetry.span("google")
+    with telemetry.span("ddb"):
+        pass
+
+
+def _capture(monkeypatch, table):
+    records = []
+    telemetry.set_sink(records.append)
+    monkeypatch.setenv("TABLE_NAME", "tbl")
+    monkeypatch.setenv("ADMIN_TOKEN", "")
+    monkeypatch.setattr(lambda_handler, "get_table", lambda _: table)
+    monkeypatch.setattr(telemetry, "_cold_start", True)
+    return records
+
+
+def test_handler_emits_one_emf_line_per_request(monkeypatch):
+    records = _capture(monkeypatch, FakeTable())
+
+    lambda_handler.handler(make_event(method="GET", path="/stats", query={"year": "2026"}), None)
+    lambda_handler.handler(make_event(method="GET", path="/nope"), None)
+
+    first, second = records
+    assert first["route"] == "stats.get"
+    assert first["status"] == 200
+    assert first["coldStart"] is True and second["coldStart"] is False
+    assert second["route"] == "unmatched" and second["status"] == 404
+    assert {"latencyMs", "routeMs", "encodeMs"} <= set(first)
+    directive = first["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Dimensions"] == [["route"]]
+    assert {m["Name"] for m in directive["Metrics"]} >= {"latencyMs", "routeMs", "encodeMs"}
+
+
+def test_batch_sub_requests_add_to_the_batch_record(monkeypatch):
+    records = _capture(monkeypatch, FakeTable())
+
+    body = {"requests": [{"method": "GET", "path": "/stats?year=2026"}, {"method": "GET", "path": "/goals?year=2026"}]}
+    lambda_handler.handler(make_event(method="POST", path="/batch", body=body), None)
+
+    (record,) = records
+    assert record["route"] == "batch"
+    # The batch route itself plus one span per sub-request, timed in worker threads.
+    assert record["calls"]["route"] == 3
+
+
+def test_a_failed_book_join_is_counted_not_printed(monkeypatch, capsys):
+    class BrokenBatchGet(FakeTable):
+        def batch_get_item(self, **kwargs):
+            raise RuntimeError("throttled")
+
+    table = BrokenBatchGet(query_pages=[{"Items": [{"sk": "ACTION#2026#a", "type": "READ", "isbn": "9780132350884"}]}])
+    records = _capture(monkeypatch, table)
+
+    resp = lambda_handler.handler(make_event(method="GET", path="/actions", query={"year": "2026"}), None)
+
+    assert resp["statusCode"] == 200
+    (record,) = records
+    assert record["bookJoinErrors"] == 1
+    assert record["errors"] == {"bookJoin": "RuntimeError('throttled')"}
+    assert {"Name": "bookJoinErrors", "Unit": "Count"} in record["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+    assert capsys.readouterr().out == ""
+
+
+def test_telemetry_off_emits_nothing(monkeypatch):
+    records = _capture(monkeypatch, FakeTable())
+    monkeypatch.setenv("TELEMETRY", "off")
+
+    lambda_handler.handler(make_event(method="GET", path="/stats", query={"year": "2026"}), None)
+
+    assert records == []
@@ -62,6 +62,32 @@ async function api(path, { method = "GET", body } = {}) {
   return data;
 }
 
+// Last body + ETag per GET path, so unchanged data comes back as a bodiless 304.
+const batchCache = new Map();
+
+// Runs several GETs in one round trip via POST /batch; resolves to their bodies in order.
+async function apiBatch(paths) {
+  const data = await api("/batch", {
+    method: "POST",
+    body: {
+      requests: paths.map((path) => {
+        const cached = batchCache.get(path);
+        return cached ? { method: "GET", path, ifNoneMatch: cached.etag } : { method: "GET", path };
+      }),
+    },
+  });
+  return (data.responses || []).map((r, i) => {
+    const path = paths[i];
+    if (r.status === 304 && batchCache.has(path)) return batchCache.get(path).body;
+    if (r.status < 200 || r.status >= 300) {
+      const msg = r.body && r.body.error ? r.body.error : `HTTP ${r.status}`;
+      throw new Error(msg);
+    }
+    if (r.etag) batchCache.set(path, { etag: r.etag, body: r.body || {} });
+    return r.body || {};
+  });
+}
+
 function yearFromUrl() {
   const u = new URL(window.location.href);
   const v = u.searchParams.get("year");
@@ -121,6 +147,8 @@ function formatGoalTitle(goal) {
 }
 
 function getGoalProgressValue(goal, stats) {
+  // GET /goals computes progress server-side; the stats mapping is a fallback for older backends.
+  if (goal.progress && typeof goal.progress.value === "number") return goal.progress.value;
   const kind = String(goal.kind || "").toUpperCase();
   if (kind === "BJJ_SESSIONS") return Number(stats?.bjjCount ?? 0);
   if (kind === "PILATES_SESSIONS") return Number(stats?.pilatesCount ?? 0);
@@ -370,11 +398,11 @@ async function refreshAll() {
   setAuthError("");
 
   try {
-    const [statsRes, goalsRes, actionsRes, booksRes] = await Promise.all([
-      api(`/stats?year=${year}`),
-      api(`/goals?year=${year}`),
-      api(`/actions?year=${year}&limit=30`),
-      api(`/books?limit=100`),
+    const [statsRes, goalsRes, actionsRes, booksRes] = await apiBatch([
+      `/stats?year=${year}`,
+      `/goals?year=${year}`,
+      `/actions?year=${year}&limit=30`,
+      `/books?limit=100&fields=isbn,title,authors`,
     ]);
     renderStats(statsRes.stats || {});
     renderGoals(goalsRes.goals || [], statsRes.stats || {});